@@ -16,21 +16,75 @@ __author__ = "Imparcialista Team"
 __email__ = "contato@luarco.com.br"
 __description__ = "Biblioteca Python para análise de qualidade e saúde de código"
 
-from typing import Optional
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from .analyzers.base import BaseAnalyzer, Deadline
 from .analyzers.errors import ErrorsAnalyzer
+from .analyzers.registry import (
+    BUILTIN_ANALYZERS,
+    available_analyzers,
+    empty_report,
+    register_analyzer,
+    select_analyzers,
+)
+from .analyzers.sources import (
+    DEFAULT_SHARED_SOURCES_BYTES,
+    ArtifactCache,
+    SharedSources,
+)
 from .analyzers.templates import TemplatesAnalyzer
 from .analyzers.violations import ViolationsAnalyzer
+from .batch import analyze_many
 from .exceptions import (
     AnalyzerExecutionError,
     CodeHealthAnalyzerError,
     ConfigurationError,
 )
 from .reports.generator import ReportGenerator
+from .sampling import DEFAULT_SAMPLE_FRACTION, sample_quality_score
+from .schemas import SampledQualityScore
 from .utils.categorizer import Categorizer
 from .version import __version__
 
 
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    """Executa ``func`` e devolve ``(resultado, segundos de relógio)``."""
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def _metadata(report: Any) -> Dict[str, Any]:
+    return report.get("metadata", {}) if isinstance(report, dict) else {}
+
+
+def _is_complete(report: Any) -> bool:
+    return _metadata(report).get("completeness", 1.0) >= 1
+
+
+def _completeness(reports: List[Any], time_budget: float) -> Dict[str, Any]:
+    """Completude agregada: arquivos analisados sobre planejados."""
+    planned = 0
+    skipped: List[str] = []
+    for report in reports:
+        metadata = _metadata(report)
+        planned += metadata.get("planned_files", 0)
+        skipped.extend(metadata.get("skipped_files", []))
+    return {
+        "time_budget": time_budget,
+        "completeness": (
+            round((planned - len(skipped)) / planned, 4) if planned else 1.0
+        ),
+        "planned_files": planned,
+        # O mesmo arquivo pode ter sido omitido por mais de um analisador
+        "skipped_files": sorted(set(skipped)),
+    }
+
+
 # Classe principal da biblioteca
 class CodeAnalyzer:
     """Classe principal para análise de código.
@@ -38,68 +92,315 @@ class CodeAnalyzer:
     Args:
         project_path (str): Caminho para o diretório do projeto
         config (dict, optional): Configurações personalizadas
+        analyzers (list, optional): Analisadores a executar (padrão: todos
+            os registrados; ver ``codehealthanalyzer.analyzers.registry``)
+        skip (list, optional): Analisadores a omitir
     """
 
-    def __init__(self, project_path: str, config: Optional[dict] = None):
+    def __init__(
+        self,
+        project_path: str,
+        config: Optional[dict] = None,
+        analyzers: Optional[Sequence[str]] = None,
+        skip: Optional[Sequence[str]] = None,
+    ):
         self.project_path = project_path
         from .config import normalize_config
 
         self.config = normalize_config(config)
 
-        # Inicializa os analisadores
-        self.violations_analyzer = ViolationsAnalyzer(project_path, self.config)
-        self.templates_analyzer = TemplatesAnalyzer(project_path, self.config)
-        self.errors_analyzer = ErrorsAnalyzer(project_path, self.config)
+        # Inicializa apenas os analisadores selecionados
+        registry = available_analyzers()
+        self.analyzers: Dict[str, Any] = {
+            name: registry[name](project_path, self.config)
+            for name in select_analyzers(analyzers, skip)
+        }
+        # Atalhos dos embutidos (None quando não selecionados)
+        self.violations_analyzer = self.analyzers.get("violations")
+        self.templates_analyzer = self.analyzers.get("templates")
+        self.errors_analyzer = self.analyzers.get("errors")
 
         # Inicializa o gerador de relatórios
         self.report_generator = ReportGenerator(self.config)
 
+        # Resultados memorizados: nome -> (impressão digital, relatório)
+        self._results: Dict[str, Tuple[str, Any]] = {}
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Descarta os resultados memorizados (todos ou apenas ``name``).
+
+        Args:
+            name (str, optional): Nome do analisador (``"violations"``,
+                ``"templates"``, ``"errors"``...) ou ``"error_counts"``
+        """
+        if name is None:
+            self._results.clear()
+        else:
+            self._results.pop(name, None)
+
+    def _cached(self, name: str, analyzer: Any) -> Optional[Any]:
+        entry = self._results.get(name)
+        if entry is not None and entry[0] == analyzer.fingerprint():
+            return entry[1]
+        return None
+
+    def _memoized(self, name: str, analyzer: Any, compute: Callable[[], Any]) -> Any:
+        """Reaproveita o último resultado enquanto o inventário não mudar.
+
+        Analisadores sem inventário (impressão digital ``None``) não são
+        memorizados.
+        """
+        # A impressão digital é tirada antes da análise: arquivos alterados
+        # durante a execução (ex.: ``ruff_fix``) invalidam o resultado
+        fingerprint = getattr(analyzer, "fingerprint", lambda: None)()
+        if fingerprint is None:
+            return compute()
+        entry = self._results.get(name)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        result = compute()
+        # Resultados parciais (prazo esgotado) não são reaproveitados
+        if _is_complete(result):
+            self._results[name] = (fingerprint, result)
+        return result
+
+    def _require(self, name: str) -> Any:
+        analyzer = self.analyzers.get(name)
+        if analyzer is None:
+            raise ConfigurationError(f"Analisador '{name}' não foi selecionado")
+        return analyzer
+
     def analyze_violations(self):
         """Analisa violações de tamanho de arquivo e função."""
-        return self.violations_analyzer.analyze()
+        analyzer = self._require("violations")
+        return self._memoized("violations", analyzer, analyzer.analyze)
 
     def analyze_templates(self):
         """Analisa templates HTML com CSS/JS inline."""
-        return self.templates_analyzer.analyze()
+        analyzer = self._require("templates")
+        return self._memoized("templates", analyzer, analyzer.analyze)
 
-    def analyze_errors(self):
-        """Analisa erros do Ruff e outras ferramentas de linting."""
-        return self.errors_analyzer.analyze()
+    def analyze_errors(self, files=None):
+        """Analisa erros do Ruff e outras ferramentas de linting.
 
-    def generate_full_report(self, output_dir: Optional[str] = None):
-        """Gera relatório completo com todas as análises.
+        Args:
+            files (list, optional): Arquivos a analisar; por exemplo
+                ``self.violations_analyzer.python_files()``. Com lista
+                explícita o resultado não é memorizado.
+        """
+        analyzer = self._require("errors")
+        if files is not None:
+            return analyzer.analyze(files)
+        return self._memoized("errors", analyzer, analyzer.analyze)
+
+    def analyze(self, name: str):
+        """Executa o analisador ``name`` (embutido ou de terceiros)."""
+        if name in BUILTIN_ANALYZERS:
+            return getattr(self, f"analyze_{name}")()
+        analyzer = self._require(name)
+        return self._memoized(name, analyzer, analyzer.analyze)
+
+    def generate_full_report(
+        self,
+        output_dir: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        artifacts: Optional[ArtifactCache] = None,
+    ):
+        """Gera relatório completo com as análises selecionadas.
 
         Args:
             output_dir (str, optional): Diretório para salvar os relatórios
+            time_budget (float, optional): Prazo em segundos (padrão: config
+                ``time_budget``). Esgotado, os analisadores param de despachar
+                arquivos e o relatório sai parcial: ``completeness``,
+                ``skipped_files`` e score marcado como ``provisional``.
+            executor (Executor, optional): Pool em que os analisadores rodam
+                (padrão: um pool próprio). Não chame este método de dentro
+                de uma tarefa do mesmo pool.
+            artifacts (ArtifactCache, optional): Cache de AST
+                compartilhado com outras execuções; não é esvaziado ao fim.
 
         Returns:
-            dict: Relatório completo com todas as análises
+            dict: Relatório completo com todas as análises. Analisadores
+            embutidos não selecionados entram com relatório vazio; os de
+            terceiros ficam em ``extensions``.
+
+        Os resultados de cada analisador são memorizados na instância enquanto
+        o inventário de arquivos (caminhos, mtimes e tamanhos) não mudar; use
+        :meth:`invalidate` para forçar uma nova análise.
         """
-        violations = self.analyze_violations()
-        templates = self.analyze_templates()
-        errors = self.analyze_errors()
+        started = time.perf_counter()
+        if time_budget is None:
+            time_budget = self.config.get("time_budget")
+        deadline = Deadline(float(time_budget)) if time_budget is not None else None
+        # Leituras compartilhadas da execução: AST dos módulos Python
+        # e templates lidos por inteiro, decodificados uma vez só
+        owns_artifacts = artifacts is None
+        html_readers = [
+            analyzer
+            for analyzer in self.analyzers.values()
+            if isinstance(analyzer, BaseAnalyzer) and analyzer.READS_TEMPLATES
+        ]
+        sources = self._shared_html_sources(len(html_readers))
+        for analyzer in self.analyzers.values():
+            if isinstance(analyzer, BaseAnalyzer):
+                if artifacts is None:
+                    artifacts = analyzer.new_artifact_cache()
+                analyzer.artifacts = artifacts
+                analyzer.deadline = deadline
+        for analyzer in html_readers:
+            analyzer.sources = sources
+        try:
+            results = self._run_analyzers(executor)
+        finally:
+            for analyzer in self.analyzers.values():
+                if isinstance(analyzer, BaseAnalyzer):
+                    analyzer.artifacts = None
+                    analyzer.sources = None
+                    analyzer.deadline = None
+            if sources is not None:
+                sources.clear()
+            if artifacts is not None and owns_artifacts:
+                artifacts.clear()
+
+        timings = {name: round(elapsed, 4) for name, (_, elapsed) in results.items()}
+        timings["total"] = round(time.perf_counter() - started, 4)
+        reports = {
+            name: results[name][0] if name in results else empty_report(name)
+            for name in BUILTIN_ANALYZERS
+        }
 
         return self.report_generator.generate_full_report(
-            violations=violations,
-            templates=templates,
-            errors=errors,
+            violations=reports["violations"],
+            templates=reports["templates"],
+            errors=reports["errors"],
             output_dir=output_dir,
+            timings=timings,
+            analyzers=list(self.analyzers),
+            extensions={
+                name: result
+                for name, (result, _) in results.items()
+                if name not in BUILTIN_ANALYZERS
+            },
+            completeness=(
+                None
+                if deadline is None
+                else _completeness(
+                    [result for result, _ in results.values()], deadline.budget
+                )
+            ),
+        )
+
+    def _shared_html_sources(self, consumers: int) -> Optional[SharedSources]:
+        if consumers < 2:
+            return None
+        templates = self.templates_analyzer
+        if templates is None:
+            templates = TemplatesAnalyzer(self.project_path, self.config)
+        shared = []
+        for _, html_file in templates.template_files():
+            try:
+                if not templates.streams(html_file):
+                    shared.append(html_file)
+            except OSError:
+                continue
+        return SharedSources(
+            shared,
+            consumers=consumers,
+            max_bytes=int(
+                self.config.get("shared_sources_bytes", DEFAULT_SHARED_SOURCES_BYTES)
+            ),
         )
 
+    def _run_analyzers(
+        self, executor: Optional[Executor] = None
+    ) -> Dict[str, Tuple[Any, float]]:
+        """Executa os analisadores em paralelo; devolve resultado e tempo."""
+        if executor is None:
+            with ThreadPoolExecutor(
+                max_workers=len(self.analyzers), thread_name_prefix="cha-analyzer"
+            ) as own:
+                return self._run_analyzers(own)
+        # O Ruff roda em subprocesso: vem primeiro no registro para que fique
+        # trabalhando em segundo plano enquanto os analisadores Python usam a CPU
+        futures = {
+            name: executor.submit(_timed, partial(self.analyze, name))
+            for name in self.analyzers
+        }
+        return {name: future.result() for name, future in futures.items()}
+
     def get_quality_score(self):
         """Calcula o score de qualidade do código (0-100).
 
+        Analisadores embutidos não selecionados não penalizam o score.
+
         Returns:
             int: Score de qualidade entre 0 e 100
         """
-        violations = self.analyze_violations()
-        templates = self.analyze_templates()
-        errors = self.analyze_errors()
+        violations = (
+            self.analyze_violations()
+            if self.violations_analyzer is not None
+            else empty_report("violations")
+        )
+        templates = (
+            self.analyze_templates()
+            if self.templates_analyzer is not None
+            else empty_report("templates")
+        )
+        errors = empty_report("errors")
+        if self.errors_analyzer is not None:
+            # O score só usa o total de erros: reaproveita o relatório completo
+            # se ainda for válido, senão dispensa materializar diagnósticos
+            errors = self._cached("errors", self.errors_analyzer)
+            if errors is None:
+                errors = self._memoized(
+                    "error_counts",
+                    self.errors_analyzer,
+                    self.errors_analyzer.count_errors,
+                )
 
         return self.report_generator.calculate_quality_score(
             violations, templates, errors
         )
 
+    def estimate_quality_score(
+        self,
+        fraction: Optional[float] = None,
+        seed: Optional[int] = None,
+        confidence: float = 0.95,
+    ) -> SampledQualityScore:
+        """Estima o score de qualidade analisando uma amostra estratificada.
+
+        Os arquivos são estratificados por diretório de primeiro nível e
+        faixa de tamanho; os contadores do score são extrapolados a partir
+        da amostra. Útil para acompanhar tendências em repositórios enormes.
+
+        Args:
+            fraction: Fração de cada estrato a analisar (padrão: config
+                ``sample_fraction``, ou 10%).
+            seed: Semente do sorteio (padrão: config ``sample_seed``); a
+                semente usada volta no resultado para reproduzir a amostra.
+            confidence: Nível de confiança do intervalo.
+
+        Returns:
+            dict: Score estimado, intervalo de confiança e contadores
+            extrapolados
+        """
+        if fraction is None:
+            fraction = self.config.get("sample_fraction") or DEFAULT_SAMPLE_FRACTION
+        if seed is None:
+            seed = self.config.get("sample_seed")
+        return sample_quality_score(
+            Path(self.project_path),
+            self.violations_analyzer,
+            self.templates_analyzer,
+            self.errors_analyzer,
+            fraction=fraction,
+            seed=seed,
+            confidence=confidence,
+        )
+
 
 # Exporta as classes principais
 __all__ = [
@@ -109,6 +410,9 @@ __all__ = [
     "ErrorsAnalyzer",
     "ReportGenerator",
     "Categorizer",
+    "register_analyzer",
+    "available_analyzers",
+    "analyze_many",
     "CodeHealthAnalyzerError",
     "ConfigurationError",
     "AnalyzerExecutionError",
@@ -3,10 +3,122 @@
 from __future__ import annotations
 
 import fnmatch
+import hashlib
+import os
+import re
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
 
 from ..config import DEFAULT_EXCLUDE_DIRS, normalize_config
+from ..schemas import ReportMetadata
+from .sources import (
+    DEFAULT_ARTIFACT_CACHE_BYTES,
+    ArtifactCache,
+    PythonArtifact,
+    SharedSources,
+    TextSource,
+    read_text_source,
+)
+
+_GLOB_CHARS = ("*", "?", "[")
+
+
+class ExclusionSet:
+    """Conjunto imutável e pré-compilado de padrões de exclusão.
+
+    Padrões sem curingas casam por substring; padrões com ``*``, ``?`` ou
+    ``[`` seguem ``fnmatch`` contra o caminho completo. Cada grupo vira uma
+    única expressão regular, de modo que o custo por caminho não depende do
+    número de chamadas anteriores.
+
+    Use :meth:`build` para obter instâncias: combinações iguais de
+    configuração compartilham o mesmo objeto entre analisadores.
+    """
+
+    __slots__ = ("patterns", "_substring_re", "_glob_re")
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        unique: List[str] = []
+        for pattern in patterns:
+            if pattern and pattern not in unique:
+                unique.append(pattern)
+        self.patterns: Tuple[str, ...] = tuple(unique)
+        substrings = [p for p in unique if not _is_glob(p)]
+        globs = [p for p in unique if _is_glob(p)]
+        self._substring_re: Optional[Pattern[str]] = (
+            re.compile("|".join(re.escape(p) for p in substrings))
+            if substrings
+            else None
+        )
+        self._glob_re: Optional[Pattern[str]] = (
+            re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in globs))
+            if globs
+            else None
+        )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} é imutável")
+        object.__setattr__(self, name, value)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __repr__(self) -> str:
+        return f"ExclusionSet({list(self.patterns)!r})"
+
+    def matches(self, value: str) -> bool:
+        """Indica se ``value`` casa com algum padrão do conjunto."""
+        if self._substring_re is not None and self._substring_re.search(value):
+            return True
+        return self._glob_re is not None and self._glob_re.match(value) is not None
+
+    @classmethod
+    def build(
+        cls,
+        user_patterns: Sequence[str] = (),
+        defaults: Sequence[str] = DEFAULT_EXCLUDE_DIRS,
+    ) -> "ExclusionSet":
+        """Retorna o conjunto (em cache) para a combinação informada."""
+        return _build_exclusion_set(tuple(defaults), tuple(user_patterns))
+
+
+def _is_glob(pattern: str) -> bool:
+    return any(ch in pattern for ch in _GLOB_CHARS)
+
+
+@lru_cache(maxsize=64)
+def _build_exclusion_set(
+    defaults: Tuple[str, ...], user_patterns: Tuple[str, ...]
+) -> ExclusionSet:
+    return ExclusionSet((*defaults, *user_patterns))
+
+
+class Deadline:
+    """Instante limite (relógio monotônico) compartilhado por uma execução.
+
+    Args:
+        budget: Segundos disponíveis a partir de agora.
+    """
+
+    __slots__ = ("budget", "at")
+
+    def __init__(self, budget: float) -> None:
+        self.budget = max(0.0, float(budget))
+        self.at = time.monotonic() + self.budget
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativo)."""
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
 
 
 class BaseAnalyzer:
@@ -18,6 +130,8 @@ class BaseAnalyzer:
     """
 
     DEFAULT_SKIP_DIRS: Sequence[str] = tuple(DEFAULT_EXCLUDE_DIRS)
+    # Lê os templates HTML (via ``read_source``); leitores compartilham o buffer
+    READS_TEMPLATES: bool = False
 
     def __init__(self, project_path: str, config: dict | None = None) -> None:
         self.project_path = Path(project_path)
@@ -27,31 +141,97 @@ class BaseAnalyzer:
         if isinstance(user_excludes, (str, Path)):
             user_excludes = [str(user_excludes)]
         self.user_exclude_dirs: List[str] = [str(p) for p in user_excludes]
+        self.exclusions = ExclusionSet.build(
+            self.user_exclude_dirs,
+            defaults=() if self.no_default_excludes else self.DEFAULT_SKIP_DIRS,
+        )
+        # Leituras compartilhadas com outros analisadores (ver CodeAnalyzer)
+        self.sources: Optional[SharedSources] = None
+        # Código e AST de módulos Python durante uma execução
+        self.artifacts: Optional[ArtifactCache] = None
+        # Prazo da execução: esgotado, nenhum arquivo novo é despachado
+        self.deadline: Optional[Deadline] = None
+        self.planned_files = 0
+        self.skipped_files: List[str] = []
+
+    def start_run(self, planned_files: int = 0) -> None:
+        """Zera o controle de arquivos planejados/omitidos da execução."""
+        self.planned_files = planned_files
+        self.skipped_files = []
+
+    def out_of_time(self, path: Optional[Path] = None) -> bool:
+        """Indica se o prazo esgotou, registrando ``path`` como omitido."""
+        if self.deadline is None or not self.deadline.expired:
+            return False
+        if path is not None:
+            self.skipped_files.append(self.relpath(path))
+        return True
+
+    def completeness_metadata(self) -> ReportMetadata:
+        """Campos de completude do relatório (vazio quando não há prazo)."""
+        if self.deadline is None:
+            return {}
+        planned = self.planned_files
+        analyzed = max(0, planned - len(self.skipped_files))
+        return {
+            "completeness": round(analyzed / planned, 4) if planned else 1.0,
+            "planned_files": planned,
+            "skipped_files": list(self.skipped_files),
+        }
+
+    def new_artifact_cache(self) -> ArtifactCache:
+        """Cria um :class:`ArtifactCache` com o orçamento configurado."""
+        return ArtifactCache(
+            int(self.config.get("artifact_cache_bytes", DEFAULT_ARTIFACT_CACHE_BYTES))
+        )
+
+    def python_artifact(self, path: Path) -> PythonArtifact:
+        """Artefato de ``path`` pelo cache da execução, quando houver um."""
+        if self.artifacts is not None:
+            return self.artifacts.get(path)
+        return PythonArtifact.read(path)
+
+    def read_source(self, path: Path) -> TextSource:
+        """Lê ``path`` pelo cache compartilhado, quando houver um."""
+        if self.sources is not None:
+            return self.sources.get(path)
+        return read_text_source(path)
 
     def iter_files(self, patterns: Iterable[str]) -> Iterable[Path]:
         """Itera pelos arquivos que combinam com os padrões fornecidos."""
         for pattern in patterns:
             yield from self.project_path.rglob(pattern)
 
+    def inventory(self) -> Optional[List[Path]]:
+        """Arquivos dos quais o resultado de ``analyze`` depende.
+
+        ``None`` (padrão) indica inventário desconhecido: o resultado não
+        pode ser memorizado.
+        """
+        return None
+
+    def fingerprint(self) -> Optional[str]:
+        """Impressão digital barata do inventário (caminho, mtime e tamanho).
+
+        Não lê o conteúdo dos arquivos; arquivos ausentes entram apenas pelo
+        caminho, de modo que criá-los também altera o valor.
+        """
+        inventory = self.inventory()
+        if inventory is None:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted({str(p) for p in inventory}):
+            try:
+                stat = os.stat(path)
+                entry = f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n"
+            except OSError:
+                entry = f"{path}\0-\n"
+            digest.update(entry.encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
     def should_skip(self, path: Path) -> bool:
         """Indica se um caminho deve ser ignorado com base nas configurações."""
-        path_str = str(path)
-        patterns: Sequence[str] = ()
-        if not self.no_default_excludes:
-            patterns = self.DEFAULT_SKIP_DIRS
-
-        for candidate in (*patterns, *self.user_exclude_dirs):
-            if self._matches(candidate, path_str):
-                return True
-        return False
-
-    @staticmethod
-    def _matches(pattern: str, value: str) -> bool:
-        if not pattern:
-            return False
-        if any(ch in pattern for ch in ("*", "?", "[")):
-            return fnmatch.fnmatch(value, pattern)
-        return pattern in value
+        return self.exclusions.matches(str(path))
 
     def relpath(self, path: Path) -> str:
         """Retorna caminho relativo ao projeto, com fallback seguro."""
@@ -61,4 +241,4 @@ class BaseAnalyzer:
             return path.as_posix()
 
 
-__all__ = ["BaseAnalyzer"]
+__all__ = ["BaseAnalyzer", "Deadline", "ExclusionSet"]
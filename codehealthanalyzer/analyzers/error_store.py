@@ -0,0 +1,185 @@
+"""Armazenamento colunar dos diagnósticos de lint.
+
+Em vez de um dicionário por diagnóstico, o :class:`ErrorStore` guarda colunas
+paralelas (``array``) com índices para tabelas internadas de arquivos,
+códigos e mensagens. Prioridade e categoria são calculadas uma vez por
+código distinto e agregadas por arquivo percorrendo as colunas; os
+dicionários ``ErrorFileReport`` só são montados na serialização.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..schemas import ErrorDetail, ErrorFileReport, Priority
+
+PRIORITIES: Tuple[Priority, ...] = ("low", "medium", "high")
+DEFAULT_CATEGORY = "Outros"
+
+
+class _Interner:
+    """Tabela de strings únicas com índice inteiro estável."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: str) -> int:
+        position = self._index.get(value)
+        if position is None:
+            position = len(self.values)
+            self._index[value] = position
+            self.values.append(value)
+        return position
+
+
+class ErrorStore:
+    """Diagnósticos em colunas paralelas com tabelas internadas."""
+
+    def __init__(self) -> None:
+        self.files = _Interner()
+        self.codes = _Interner()
+        self.messages = _Interner()
+        # Nome da regra por código (relação 1:1 no Ruff)
+        self.code_rules: List[str] = []
+        self.file_col = array("I")
+        self.line_col = array("I")
+        self.column_col = array("I")
+        self.code_col = array("I")
+        self.message_col = array("I")
+
+    def __len__(self) -> int:
+        return len(self.code_col)
+
+    def append(
+        self,
+        filename: str,
+        line: int,
+        column: int,
+        code: str,
+        message: str,
+        rule: str = "",
+    ) -> None:
+        code_id = self.codes.add(code)
+        if code_id == len(self.code_rules):
+            self.code_rules.append(rule)
+        self.file_col.append(self.files.add(filename))
+        self.line_col.append(max(0, int(line)))
+        self.column_col.append(max(0, int(column)))
+        self.code_col.append(code_id)
+        self.message_col.append(self.messages.add(message))
+
+    @classmethod
+    def from_diagnostics(
+        cls,
+        diagnostics: Iterable[Dict],
+        skip_file: Optional[Callable[[str], bool]] = None,
+    ) -> "ErrorStore":
+        """Constrói o store a partir dos diagnósticos no formato do Ruff.
+
+        ``skip_file`` é avaliado uma única vez por nome de arquivo.
+        """
+        store = cls()
+        skipped: Dict[str, bool] = {}
+        # Referências locais: este laço roda uma vez por diagnóstico
+        add_file, add_code, add_message = (
+            store.files.add,
+            store.codes.add,
+            store.messages.add,
+        )
+        code_rules = store.code_rules
+        file_col, line_col, column_col = (
+            store.file_col.append,
+            store.line_col.append,
+            store.column_col.append,
+        )
+        code_col, message_col = store.code_col.append, store.message_col.append
+        for error in diagnostics:
+            filename = error.get("filename", "unknown")
+            skip = skipped.get(filename)
+            if skip is None:
+                skip = bool(skip_file and skip_file(filename))
+                skipped[filename] = skip
+            if skip:
+                continue
+            location = error.get("location") or {}
+            code_id = add_code(error.get("code") or "")
+            if code_id == len(code_rules):
+                code_rules.append(error.get("rule", ""))
+            file_col(add_file(filename))
+            line_col(max(0, int(location.get("row", 0))))
+            column_col(max(0, int(location.get("column", 0))))
+            code_col(code_id)
+            message_col(add_message(error.get("message", "")))
+        return store
+
+    # ------------------------------------------------------------------
+    # Agregações
+    # ------------------------------------------------------------------
+
+    def file_priorities(self, code_priorities: Sequence[str]) -> List[Priority]:
+        """Maior prioridade por arquivo, dada a prioridade de cada código."""
+        ranks = [PRIORITIES.index(p) if p in PRIORITIES else 0 for p in code_priorities]
+        best = [0] * len(self.files)
+        for file_id, code_id in zip(self.file_col, self.code_col):
+            rank = ranks[code_id]
+            if rank > best[file_id]:
+                best[file_id] = rank
+        return [PRIORITIES[rank] for rank in best]
+
+    def file_categories(self, code_categories: Sequence[str]) -> List[str]:
+        """Primeira categoria específica (diferente de "Outros") por arquivo."""
+        categories: List[Optional[str]] = [None] * len(self.files)
+        for file_id, code_id in zip(self.file_col, self.code_col):
+            if categories[file_id] is None:
+                category = code_categories[code_id]
+                if category != DEFAULT_CATEGORY:
+                    categories[file_id] = category
+        return [category or DEFAULT_CATEGORY for category in categories]
+
+    # ------------------------------------------------------------------
+    # Serialização
+    # ------------------------------------------------------------------
+
+    def to_file_reports(
+        self, priorities: Sequence[Priority], categories: Sequence[str]
+    ) -> List[ErrorFileReport]:
+        """Materializa os ``ErrorFileReport`` (na ordem de primeira aparição)."""
+        details: List[List[ErrorDetail]] = [[] for _ in self.files.values]
+        codes = self.codes.values
+        messages = self.messages.values
+        for file_id, line, column, code_id, message_id in zip(
+            self.file_col,
+            self.line_col,
+            self.column_col,
+            self.code_col,
+            self.message_col,
+        ):
+            details[file_id].append(
+                {
+                    "line": line,
+                    "column": column,
+                    "code": codes[code_id],
+                    "message": messages[message_id],
+                    "rule": self.code_rules[code_id],
+                }
+            )
+        return [
+            {
+                "file": filename,
+                "error_count": len(details[file_id]),
+                "errors": details[file_id],
+                "priority": priorities[file_id],
+                "category": categories[file_id],
+            }
+            for file_id, filename in enumerate(self.files.values)
+        ]
+
+
+__all__ = ["ErrorStore"]
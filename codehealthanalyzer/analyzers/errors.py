@@ -1,21 +1,182 @@
 """Analisador de erros de linting baseado em Ruff."""
 
+import asyncio
+import fnmatch
+import hashlib
 import json
 import logging
+import os
+import re
 import shutil
 import subprocess  # nosec B404
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, cast
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
 
-from ..config import DEFAULT_EXCLUDE_DIRS, normalize_config
 from ..exceptions import AnalyzerExecutionError
-from ..schemas import ErrorFileReport, ErrorsReport, ErrorStatistics
+from ..schemas import (
+    ErrorCountsReport,
+    ErrorFileReport,
+    ErrorsReport,
+    ErrorStatistics,
+    Priority,
+)
+from .base import BaseAnalyzer
+from .error_store import ErrorStore
+from .ruff_server import RuffServerBackend
 
 logger = logging.getLogger(__name__)
 
+RUFF_FILE_PATTERNS = ("*.py", "*.pyi")
+# Abaixo deste número de arquivos um único processo Ruff é mais rápido
+DEFAULT_SHARD_MIN_FILES = 2000
+MAX_AUTO_RUFF_JOBS = 8
+MAX_FILES_PER_RUFF_RUN = 1000
+DEFAULT_CACHE_DIR = ".cha_cache"
+RUFF_CACHE_FILE = "ruff.json"
+RUFF_CACHE_FORMAT = 1
+RUFF_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+# Com prazo, lotes menores: o Ruff interrompido perde só o lote corrente
+DEADLINE_BATCH_FILES = 200
+# Limite de uma linha json-lines lida pelo subprocesso assíncrono
+ASYNC_LINE_LIMIT = 16 * 1024 * 1024
 
-class ErrorsAnalyzer:
+# Linha de diagnóstico na saída concisa: "arq.py:3:5: F821 [*] Mensagem"
+# Curingas de padrões de exclusão (os demais casam por substring)
+_GLOB_CHARS = re.compile(r"[*?\[]")
+# Código dos erros de sintaxe nas versões recentes do Ruff
+SYNTAX_ERROR_CODE = "invalid-syntax"
+# Linha do bloco "Fixed N errors:" do --show-fixes: "    2 × F401 (unused-import)"
+_FIXED_LINE = re.compile(r"^\s+(?P<count>\d+) × (?P<code>\S+) \(.+\)$")
+
+
+@lru_cache(maxsize=8)
+def _ruff_version_cached(ruff_executable: str, mtime_ns: int) -> str:
+    try:
+        result = subprocess.run(  # nosec B603
+            [ruff_executable, "--version"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return "unknown"
+    return str(result.stdout).strip() or "unknown"
+
+
+def _ruff_version(ruff_executable: str) -> str:
+    """Versão do Ruff, consultada uma vez por executável (e por atualização)."""
+    try:
+        mtime_ns = os.stat(ruff_executable).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return _ruff_version_cached(ruff_executable, mtime_ns)
+
+
+def _config_files_digest(directory: Path) -> str:
+    """Hash dos arquivos de configuração do Ruff presentes em ``directory``."""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in RUFF_CONFIG_FILES:
+        try:
+            content = (directory / name).read_bytes()
+        except OSError:
+            continue
+        digest.update(name.encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+class _RuffDeadlineExceeded(AnalyzerExecutionError):
+    """O Ruff foi interrompido porque o prazo da execução esgotou."""
+
+
+class _RuffResultCache:
+    """Cache persistente, em JSON, dos diagnósticos do Ruff por arquivo.
+
+    ``salt`` invalida o cache inteiro (versão do Ruff, exclusões); a chave de
+    cada arquivo cobre seu conteúdo e as configurações do Ruff que o afetam.
+    """
+
+    def __init__(self, path: Path, root: Path, salt: str) -> None:
+        self.path = path
+        self.root = root
+        self.salt = salt
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self._config_digests: Dict[Path, str] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("format") == RUFF_CACHE_FORMAT
+            and data.get("salt") == self.salt
+            and isinstance(data.get("files"), dict)
+        ):
+            self.entries = data["files"]
+
+    def save(self) -> None:
+        # Remove entradas de arquivos que deixaram de existir
+        entries = {
+            rel: entry
+            for rel, entry in self.entries.items()
+            if (self.root / rel).exists()
+        }
+        payload = {"format": RUFF_CACHE_FORMAT, "salt": self.salt, "files": entries}
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Não foi possível gravar o cache do ruff: %s", exc)
+
+    def key(self, path: Path) -> Optional[str]:
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return f"{digest}:{self._config_digest(path.parent)}"
+
+    def _config_digest(self, directory: Path) -> str:
+        cached = self._config_digests.get(directory)
+        if cached is not None:
+            return cached
+        digest = hashlib.blake2b(digest_size=8)
+        if directory != self.root and self.root in directory.parents:
+            digest.update(self._config_digest(directory.parent).encode())
+        digest.update(_config_files_digest(directory).encode())
+        result = digest.hexdigest()
+        self._config_digests[directory] = result
+        return result
+
+    def get(self, rel: str, key: Optional[str]) -> Optional[List[Dict]]:
+        entry = self.entries.get(rel)
+        if key is None or not entry or entry.get("key") != key:
+            return None
+        self.hits += 1
+        return entry.get("errors", [])
+
+    def put(self, rel: str, key: str, errors: List[Dict]) -> None:
+        self.entries[rel] = {
+            "key": key,
+            "errors": [
+                {k: v for k, v in error.items() if k != "filename"} for error in errors
+            ],
+        }
+
+
+class ErrorsAnalyzer(BaseAnalyzer):
     """Analisador de erros de linting.
 
     Args:
@@ -24,48 +185,725 @@ class ErrorsAnalyzer:
     """
 
     def __init__(self, project_path: str, config: Optional[dict] = None):
-        self.project_path = Path(project_path)
-        self.config = normalize_config(config)
+        super().__init__(project_path, config)
         # Diretório alvo para varredura do Ruff; padrão para raiz do projeto
         self.target_dir = self.config.get("target_dir", ".")
-        # Exclusions
-        self.no_default_excludes = bool(self.config.get("no_default_excludes", False))
-        self.user_exclude_dirs = list(self.config.get("exclude_dirs", []))
+        # Correções aplicadas pelo Ruff na última execução, por código
+        self.fixed_counts: Dict[str, int] = {}
+        # Processos Ruff disparados na última execução
+        self.ruff_processes = 0
+        # Arquivos servidos pelo cache persistente (``ruff_cache``)
+        self.cache_hits = 0
+        # Backend usado na última execução e, no modo "server", o processo vivo
+        self.backend_used = "cli"
+        self._server: Optional[RuffServerBackend] = None
+        self._server_config: Optional[str] = None
+        self._server_failed = False
+
+    def __enter__(self) -> "ErrorsAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Encerra o ``ruff server`` persistente, se houver."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def _use_server(self) -> bool:
+        return (
+            self.config.get("ruff_backend", "cli") == "server"
+            and not self._server_failed
+            and not self.config.get("ruff_fix", False)
+        )
+
+    def _run_server(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[Dict]:
+        """Obtém os diagnósticos pelo ``ruff server`` persistente.
+
+        O servidor é reiniciado quando qualquer configuração do Ruff que ele
+        resolve muda (ver :meth:`_config_tree_digest`).
+        """
+        root = self.project_path.absolute()
+        config_key = "\0".join(
+            [ruff_executable, self._config_tree_digest(), *self._ruff_exclude_args()]
+        )
+        if self._server is not None and (
+            not self._server.alive or self._server_config != config_key
+        ):
+            self.close()
+        if self._server is None:
+            timeout = float(self.config.get("ruff_timeout") or 0) or None
+            server = RuffServerBackend(ruff_executable, root)
+            if timeout:
+                server.request_timeout = timeout
+            self._server = server
+            self._server_config = config_key
+            server.start()
+
+        paths = self.discover_files() if files is None else list(files)
+        absolute = [Path(p) if Path(p).is_absolute() else root / p for p in paths]
+        self.ruff_processes = 0
+        return self._server.diagnostics(absolute)
+
+    def _config_tree_digest(self) -> str:
+        """Hash de todas as configurações do Ruff que afetam o projeto.
+
+        Cobre os diretórios acima da raiz (o Ruff sobe a hierarquia até achar
+        uma configuração) e os ``pyproject.toml``/``ruff.toml`` aninhados nos
+        subdiretórios não excluídos.
+        """
+        root = self.project_path.absolute()
+        digest = hashlib.blake2b(digest_size=8)
+        for directory in reversed(root.parents):
+            digest.update(_config_files_digest(directory).encode())
+        for current, dirs, names in os.walk(root):
+            directory = Path(current)
+            dirs[:] = sorted(
+                name for name in dirs if not self.should_skip(directory / name)
+            )
+            if any(name in RUFF_CONFIG_FILES for name in names):
+                digest.update(str(directory.relative_to(root)).encode())
+                digest.update(_config_files_digest(directory).encode())
+        return digest.hexdigest()
+
+    def _try_server(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> Optional[List[Dict]]:
+        """Tenta o backend persistente; ``None`` indica usar o CLI."""
+        try:
+            errors = self._run_server(ruff_executable, files)
+        except (AnalyzerExecutionError, OSError) as exc:
+            logger.warning("ruff server indisponível, usando o CLI: %s", exc)
+            self.close()
+            self._server_failed = True
+            return None
+        self.backend_used = "server"
+        return errors
+
+    def _ruff_exclude_args(self) -> List[str]:
+        """Traduz as exclusões do CodeHealthAnalyzer em argumentos do Ruff.
+
+        Assim o Ruff nem chega a analisar diretórios excluídos; o filtro em
+        ``process_errors`` continua como rede de segurança.
+        """
+        args: List[str] = []
+        for pattern in self.exclusions.patterns:
+            args.extend(["--extend-exclude", pattern])
+        if args:
+            # Aplica as exclusões mesmo a caminhos passados explicitamente
+            args.append("--force-exclude")
+        return args
+
+    def _ruff_jobs(self) -> int:
+        """Número de processos Ruff simultâneos (``ruff_jobs``; 0 = automático)."""
+        configured = int(self.config.get("ruff_jobs", 0) or 0)
+        if configured > 0:
+            return configured
+        return max(1, min(os.cpu_count() or 1, MAX_AUTO_RUFF_JOBS))
+
+    def discover_files(self) -> List[Path]:
+        """Lista os arquivos Python de ``target_dir`` que não estão excluídos."""
+        root = self.project_path / self.target_dir
+        found = {
+            path
+            for pattern in RUFF_FILE_PATTERNS
+            for path in root.rglob(pattern)
+            if path.is_file() and not self.should_skip(path)
+        }
+        return sorted(found)
 
-    def run_ruff_check(self) -> List[Dict]:
-        """Executa ruff check e retorna os erros."""
+    def inventory(self) -> List[Path]:
+        # Mudanças na configuração do Ruff também alteram o resultado
+        configs = [
+            directory / name
+            for directory in (self.project_path, self.project_path / self.target_dir)
+            for name in RUFF_CONFIG_FILES
+        ]
+        return self.discover_files() + configs
+
+    def _ruff_target(self, path: Union[str, Path]) -> str:
+        candidate = Path(path)
+        if candidate.is_absolute():
+            try:
+                return candidate.relative_to(self.project_path.absolute()).as_posix()
+            except ValueError:
+                return str(candidate)
+        return candidate.as_posix()
+
+    def _has_at_least(self, limit: int) -> bool:
+        """Indica se ``target_dir`` tem ao menos ``limit`` arquivos Python.
+
+        A varredura para assim que o limite é atingido: projetos pequenos
+        não pagam uma listagem completa só para decidir não dividir o Ruff.
+        """
+        count = 0
+        for current, dirs, names in os.walk(self.project_path / self.target_dir):
+            directory = Path(current)
+            dirs[:] = [name for name in dirs if not self.should_skip(directory / name)]
+            for name in names:
+                if not any(fnmatch.fnmatch(name, p) for p in RUFF_FILE_PATTERNS):
+                    continue
+                if self.should_skip(directory / name):
+                    continue
+                count += 1
+                if count >= limit:
+                    return True
+        return False
+
+    def _ruff_listing(
+        self, ruff_executable: str, timeout: Optional[float] = None
+    ) -> List[Path]:
+        """Arquivos que ``ruff check <target_dir>`` analisaria.
+
+        Vem de ``ruff check --show-files``: respeita ``include``,
+        ``extend-include`` (ex.: notebooks) e as exclusões repassadas ao Ruff,
+        mas não o casamento por substring das exclusões do projeto.
+
+        Raises:
+            subprocess.TimeoutExpired: A listagem estourou ``timeout``.
+        """
+        result = subprocess.run(  # nosec B607, B603
+            [
+                ruff_executable,
+                "check",
+                "--show-files",
+                self.target_dir,
+                *self._ruff_exclude_args(),
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_path,
+            check=False,
+            timeout=timeout,
+        )
+        if result.returncode != 0:
+            raise AnalyzerExecutionError(
+                result.stderr.strip() or "Falha ao listar arquivos do ruff"
+            )
+        return [Path(line) for line in result.stdout.splitlines() if line.strip()]
+
+    def _ruff_files(
+        self, ruff_executable: str, timeout: Optional[float] = None
+    ) -> List[Path]:
+        """Lista de :meth:`_ruff_listing` já filtrada pelas exclusões.
+
+        Dividir essa lista em lotes dá o mesmo resultado que um único
+        processo sobre o diretório. Se a listagem estourar ``timeout``, cai
+        para :meth:`discover_files`.
+        """
+        try:
+            files = self._ruff_listing(ruff_executable, timeout)
+        except subprocess.TimeoutExpired:
+            return self.discover_files()
+        return [path for path in files if not self.should_skip(path)]
+
+    def _plan_batches(
+        self, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[List[str]]:
+        """Divide os alvos do Ruff em lotes para execução concorrente.
+
+        Abaixo de ``ruff_shard_min_files`` arquivos (ou com ``ruff_jobs: 1``)
+        tudo roda em um único processo; sem lista explícita, o Ruff varre
+        ``target_dir`` diretamente, como antes.
+        """
+        jobs = self._ruff_jobs()
+        min_files = max(
+            1, int(self.config.get("ruff_shard_min_files", DEFAULT_SHARD_MIN_FILES))
+        )
+        if files is None:
+            if jobs == 1 or not self._has_at_least(min_files):
+                return [[self.target_dir]]
+            files = self._ruff_files(self._ruff_executable())
+
+        targets = [self._ruff_target(path) for path in files]
+        if not targets:
+            return []
+        size = len(targets)
+        if jobs > 1 and size >= min_files:
+            size = -(-size // jobs)
+        # Limita o tamanho da linha de comando de cada processo
+        size = min(size, MAX_FILES_PER_RUFF_RUN)
+        return [targets[i : i + size] for i in range(0, len(targets), size)]
+
+    def _ruff_executable(self) -> str:
         ruff_executable = shutil.which("ruff")
         if not ruff_executable:
             raise AnalyzerExecutionError(
                 "Ruff não encontrado. Instale com: pip install ruff"
             )
+        return ruff_executable
+
+    def _use_cache(self) -> bool:
+        return bool(self.config.get("ruff_cache", False)) and not self.config.get(
+            "ruff_fix", False
+        )
+
+    def run_ruff_check(
+        self, files: Optional[Sequence[Union[str, Path]]] = None
+    ) -> List[Dict]:
+        """Executa ruff check e retorna os erros.
+
+        Com ``ruff_fix`` ativo, cada lote passa antes por ``--fix-only``; os
+        diagnósticos restantes vêm da mesma saída ``json-lines`` do modo
+        normal e as contagens de correções ficam em ``self.fixed_counts``.
+
+        Args:
+            files: Lista explícita de arquivos (por exemplo, o inventário de
+                ``ViolationsAnalyzer.python_files()``). Listas grandes são
+                divididas em lotes executados por processos Ruff concorrentes.
+        """
+        ruff_executable = self._ruff_executable()
+        self.fixed_counts = {}
+        self.cache_hits = 0
+        self.backend_used = "cli"
+        if self._use_server() and not self.out_of_time():
+            errors = self._try_server(ruff_executable, files)
+            if errors is not None:
+                return errors
+        if not self._use_cache():
+            return self._run_batches(ruff_executable, files)
+        cache, cached, stale = self._cache_lookup(ruff_executable, files)
+        fresh = self._run_batches(ruff_executable, [p for p, _ in stale.values()])
+        # Arquivos omitidos pelo prazo não foram analisados: fora do cache
+        for rel in self.skipped_files:
+            stale.pop(rel, None)
+        self._cache_store(cache, stale, fresh)
+        return cached + fresh
+
+    async def run_ruff_check_async(
+        self,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """Versão assíncrona de :meth:`run_ruff_check`.
+
+        Usa ``asyncio.create_subprocess_exec`` e não bloqueia o event loop.
+        Se a tarefa for cancelada ou ``timeout`` (padrão: ``ruff_timeout``)
+        estourar, os processos do Ruff são encerrados.
+
+        Raises:
+            AnalyzerExecutionError: Ruff ausente, falha ou tempo esgotado.
+        """
+        if timeout is None:
+            timeout = float(self.config.get("ruff_timeout") or 0) or None
+        ruff_executable = self._ruff_executable()
+        self.fixed_counts = {}
+        self.cache_hits = 0
+        self.backend_used = "cli"
+        loop = asyncio.get_running_loop()
+        if self._use_server():
+            # O protocolo com o servidor é síncrono: roda fora do event loop
+            errors = await loop.run_in_executor(
+                None, self._try_server, ruff_executable, files
+            )
+            if errors is not None:
+                return errors
         try:
-            if self.config.get("ruff_fix", False):
-                subprocess.run(  # nosec B607, B603
-                    [ruff_executable, "check", self.target_dir, "--fix"],
-                    capture_output=True,
-                    text=True,
-                    cwd=self.project_path,
-                    check=False,
+            if not self._use_cache():
+                return await asyncio.wait_for(
+                    self._run_batches_async(ruff_executable, files), timeout
+                )
+            # Hash dos arquivos e leitura do cache rodam fora do event loop
+            cache, cached, stale = await loop.run_in_executor(
+                None, self._cache_lookup, ruff_executable, files
+            )
+            fresh = await asyncio.wait_for(
+                self._run_batches_async(
+                    ruff_executable, [p for p, _ in stale.values()]
+                ),
+                timeout,
+            )
+            await loop.run_in_executor(None, self._cache_store, cache, stale, fresh)
+            return cached + fresh
+        except asyncio.TimeoutError as e:
+            raise AnalyzerExecutionError(
+                f"Ruff excedeu o tempo limite de {timeout:g}s"
+            ) from e
+
+    def _run_batches(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[Dict]:
+        """Executa o Ruff (em um ou mais processos) e junta os resultados."""
+        if self.deadline is not None:
+            return self._run_batches_until_deadline(ruff_executable, files)
+        batches = self._plan_batches(files)
+        self.ruff_processes = len(batches)
+        if len(batches) <= 1:
+            errors, fixed = (
+                self._invoke_ruff(ruff_executable, batches[0]) if batches else ([], {})
+            )
+            self.fixed_counts = fixed
+            return errors
+
+        jobs, threads = self._batch_concurrency(batches)
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(
+                pool.map(
+                    lambda batch: self._invoke_ruff(ruff_executable, batch, threads),
+                    batches,
+                )
+            )
+        return self._merge_batches(results)
+
+    def _run_batches_until_deadline(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[Dict]:
+        """Executa o Ruff em lotes pequenos enquanto houver prazo.
+
+        Esgotado o prazo, nenhum lote novo é disparado e o processo em curso
+        é interrompido (exceto no modo ``ruff_fix``, que nunca é cortado no
+        meio); os arquivos desses lotes vão para ``skipped_files``.
+        """
+        deadline = self.deadline
+        if files is None:
+            timeout = deadline.remaining() if deadline is not None else None
+            paths: List[Union[str, Path]] = list(
+                self._ruff_files(ruff_executable, timeout)
+            )
+        else:
+            paths = list(files)
+        targets = [self._ruff_target(path) for path in paths]
+        if not targets:
+            self.ruff_processes = 0
+            return []
+        jobs = self._ruff_jobs()
+        size = max(1, min(DEADLINE_BATCH_FILES, -(-len(targets) // jobs)))
+        batches = [targets[i : i + size] for i in range(0, len(targets), size)]
+        jobs, threads = self._batch_concurrency(batches)
+        fix = bool(self.config.get("ruff_fix", False))
+
+        def run(batch: List[str]) -> Optional[Tuple[List[Dict], Dict[str, int]]]:
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                return self._invoke_ruff(
+                    ruff_executable,
+                    batch,
+                    threads if len(batches) > 1 else None,
+                    timeout=None if fix else remaining,
                 )
+            except _RuffDeadlineExceeded:
+                return None
 
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run, batches))
+        done = []
+        for batch, result in zip(batches, results):
+            if result is None:
+                self.skipped_files.extend(batch)
+            else:
+                done.append(result)
+        self.ruff_processes = len(done)
+        return self._merge_batches(done)
+
+    async def _run_batches_async(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[Dict]:
+        # O planejamento percorre a árvore e lista os arquivos com o Ruff
+        batches = await asyncio.get_running_loop().run_in_executor(
+            None, self._plan_batches, files
+        )
+        self.ruff_processes = len(batches)
+        if len(batches) <= 1:
+            errors, fixed = (
+                await self._invoke_ruff_async(ruff_executable, batches[0])
+                if batches
+                else ([], {})
+            )
+            self.fixed_counts = fixed
+            return errors
+
+        jobs, threads = self._batch_concurrency(batches)
+        semaphore = asyncio.Semaphore(jobs)
+
+        async def run(batch: List[str]) -> Tuple[List[Dict], Dict[str, int]]:
+            async with semaphore:
+                return await self._invoke_ruff_async(ruff_executable, batch, threads)
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return self._merge_batches(results)
+
+    def _batch_concurrency(self, batches: List[List[str]]) -> Tuple[int, int]:
+        """Processos simultâneos e threads do Ruff por processo."""
+        jobs = min(self._ruff_jobs(), len(batches))
+        # Evita que cada processo dispare uma thread por núcleo
+        return jobs, max(1, (os.cpu_count() or 1) // jobs)
+
+    def _merge_batches(
+        self, results: Sequence[Tuple[List[Dict], Dict[str, int]]]
+    ) -> List[Dict]:
+        merged: List[Dict] = []
+        for batch_errors, batch_fixed in results:
+            merged.extend(batch_errors)
+            for code, count in batch_fixed.items():
+                self.fixed_counts[code] = self.fixed_counts.get(code, 0) + count
+        return merged
+
+    def _cache_path(self) -> Path:
+        cache_dir = Path(self.config.get("cache_dir") or DEFAULT_CACHE_DIR)
+        if not cache_dir.is_absolute():
+            cache_dir = self.project_path / cache_dir
+        return cache_dir / RUFF_CACHE_FILE
+
+    def _cache_lookup(
+        self, ruff_executable: str, files: Optional[Sequence[Union[str, Path]]]
+    ) -> Tuple["_RuffResultCache", List[Dict], Dict[str, Tuple[Path, Optional[str]]]]:
+        """Separa os arquivos servidos pelo cache dos que precisam do Ruff.
+
+        A chave combina o hash do conteúdo, a versão do Ruff, as exclusões
+        repassadas a ele e os arquivos de configuração (``pyproject.toml``,
+        ``ruff.toml``, ``.ruff.toml``) do diretório do arquivo até a raiz.
+        """
+        root = self.project_path.absolute()
+        salt = "\0".join([_ruff_version(ruff_executable), *self._ruff_exclude_args()])
+        cache = _RuffResultCache(self._cache_path(), root, salt)
+        cache.load()
+
+        paths = self.discover_files() if files is None else list(files)
+        errors: List[Dict] = []
+        stale: Dict[str, Tuple[Path, Optional[str]]] = {}
+        for path in paths:
+            absolute = Path(path)
+            if not absolute.is_absolute():
+                absolute = root / absolute
+            rel = self._ruff_target(absolute)
+            key = cache.key(absolute)
+            cached = cache.get(rel, key)
+            if cached is None:
+                stale[rel] = (absolute, key)
+                continue
+            errors.extend({**item, "filename": str(absolute)} for item in cached)
+        self.cache_hits = cache.hits
+        return cache, errors, stale
+
+    def _cache_store(
+        self,
+        cache: "_RuffResultCache",
+        stale: Dict[str, Tuple[Path, Optional[str]]],
+        fresh: List[Dict],
+    ) -> None:
+        """Grava no cache os diagnósticos recém-obtidos do Ruff."""
+        grouped: Dict[str, List[Dict]] = {rel: [] for rel in stale}
+        for error in fresh:
+            rel = self._ruff_target(error.get("filename", ""))
+            if rel in grouped:
+                grouped[rel].append(error)
+        for rel, (_, key) in stale.items():
+            if key is not None:
+                cache.put(rel, key, grouped[rel])
+        cache.save()
+
+    def _ruff_command(self, ruff_executable: str, targets: List[str]) -> List[str]:
+        cmd = [ruff_executable, "check", *targets, "--output-format", "json-lines"]
+        return cmd + self._ruff_exclude_args()
+
+    def _fix_command(self, ruff_executable: str, targets: List[str]) -> List[str]:
+        # O formato JSON do Ruff não informa o que foi corrigido: as correções
+        # são aplicadas antes, e contadas pelo resumo do --show-fixes
+        cmd = [ruff_executable, "check", *targets, "--fix-only", "--show-fixes"]
+        return cmd + self._ruff_exclude_args()
+
+    @staticmethod
+    def _ruff_env(threads: Optional[int]) -> Optional[Dict[str, str]]:
+        if threads is None:
+            return None
+        return {**os.environ, "RAYON_NUM_THREADS": str(threads)}
+
+    def _invoke_ruff(
+        self,
+        ruff_executable: str,
+        targets: List[str],
+        threads: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """Executa um processo Ruff sobre ``targets``.
+
+        ``timeout`` (apenas fora do modo fix) interrompe o Ruff e levanta
+        ``_RuffDeadlineExceeded``.
+        """
+        env = self._ruff_env(threads)
+        fixed: Dict[str, int] = {}
+        if self.config.get("ruff_fix", False):
             result = subprocess.run(  # nosec B607, B603
-                [ruff_executable, "check", self.target_dir, "--output-format", "json"],
+                self._fix_command(ruff_executable, targets),
                 capture_output=True,
                 text=True,
                 cwd=self.project_path,
                 check=False,
+                env=env,
             )
-
             if result.returncode not in (0, 1):
                 raise AnalyzerExecutionError(
                     result.stderr.strip() or "Falha ao executar ruff"
                 )
-            if result.stdout:
-                return json.loads(result.stdout)
-            return []
-        except json.JSONDecodeError as e:
-            raise AnalyzerExecutionError(f"Erro ao decodificar JSON: {e}") from e
+            fixed = self._parse_fixed_counts(result.stdout)
+        cmd = self._ruff_command(ruff_executable, targets)
+        return self._stream_ruff_diagnostics(cmd, env, timeout), fixed
+
+    async def _invoke_ruff_async(
+        self, ruff_executable: str, targets: List[str], threads: Optional[int] = None
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """Equivalente assíncrono de ``_invoke_ruff``; mata o Ruff se cancelado."""
+        fixed: Dict[str, int] = {}
+        if self.config.get("ruff_fix", False):
+            fixed = await self._apply_fixes_async(ruff_executable, targets, threads)
+        errors: List[Dict] = []
+        with tempfile.TemporaryFile() as stderr_file:
+            process = await asyncio.create_subprocess_exec(
+                *self._ruff_command(ruff_executable, targets),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr_file,
+                cwd=self.project_path,
+                env=self._ruff_env(threads),
+                limit=ASYNC_LINE_LIMIT,
+            )
+            try:
+                assert process.stdout is not None  # nosec B101
+                async for line in process.stdout:
+                    diagnostic = self._project_diagnostic(
+                        line.decode("utf-8", "replace")
+                    )
+                    if diagnostic is not None:
+                        errors.append(diagnostic)
+                returncode = await process.wait()
+            except json.JSONDecodeError as e:
+                raise AnalyzerExecutionError(f"Erro ao decodificar JSON: {e}") from e
+            finally:
+                # Cancelamento, timeout ou erro: não deixa o Ruff órfão
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            if returncode not in (0, 1):
+                stderr_file.seek(0)
+                message = stderr_file.read().decode("utf-8", "replace").strip()
+                raise AnalyzerExecutionError(message or "Falha ao executar ruff")
+        return errors, fixed
+
+    async def _apply_fixes_async(
+        self, ruff_executable: str, targets: List[str], threads: Optional[int]
+    ) -> Dict[str, int]:
+        """Passo ``--fix-only`` assíncrono; devolve as contagens por código."""
+        process = await asyncio.create_subprocess_exec(
+            *self._fix_command(ruff_executable, targets),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.project_path,
+            env=self._ruff_env(threads),
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        if process.returncode not in (0, 1):
+            message = stderr.decode("utf-8", "replace").strip()
+            raise AnalyzerExecutionError(message or "Falha ao executar ruff")
+        return self._parse_fixed_counts(stdout.decode("utf-8", "replace"))
+
+    def _stream_ruff_diagnostics(
+        self,
+        cmd: List[str],
+        env: Optional[Dict[str, str]],
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """Lê a saída ``json-lines`` do Ruff diagnóstico a diagnóstico.
+
+        A saída nunca é acumulada inteira em memória: cada linha é convertida
+        logo ao chegar na forma enxuta usada por ``process_errors``. Com
+        ``timeout``, o processo é morto ao estourar o tempo.
+        """
+        errors: List[Dict] = []
+        timer: Optional[threading.Timer] = None
+        expired = threading.Event()
+        # stderr vai para um arquivo temporário para não travar o pipe de stdout
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(  # nosec B607, B603
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                cwd=self.project_path,
+                env=env,
+            ) as process:
+                # stdout=PIPE garante o fluxo; o assert só estreita o Optional
+                assert process.stdout is not None  # nosec B101
+                if timeout is not None:
+
+                    def expire() -> None:
+                        expired.set()
+                        process.kill()
+
+                    timer = threading.Timer(timeout, expire)
+                    timer.daemon = True
+                    timer.start()
+                try:
+                    for line in process.stdout:
+                        diagnostic = self._project_diagnostic(line)
+                        if diagnostic is not None:
+                            errors.append(diagnostic)
+                except json.JSONDecodeError as e:
+                    process.kill()
+                    if expired.is_set():
+                        # Linha truncada pela interrupção
+                        raise _RuffDeadlineExceeded("prazo esgotado") from e
+                    raise AnalyzerExecutionError(
+                        f"Erro ao decodificar JSON: {e}"
+                    ) from e
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+                returncode = process.wait()
+            if expired.is_set() and returncode not in (0, 1):
+                raise _RuffDeadlineExceeded("prazo esgotado")
+            if returncode not in (0, 1):
+                stderr_file.seek(0)
+                message = stderr_file.read().decode("utf-8", "replace").strip()
+                raise AnalyzerExecutionError(message or "Falha ao executar ruff")
+        return errors
+
+    @staticmethod
+    def _project_diagnostic(line: str) -> Optional[Dict]:
+        """Reduz uma linha ``json-lines`` do Ruff aos campos usados no relatório."""
+        line = line.strip()
+        if not line:
+            return None
+        raw = json.loads(line)
+        location = raw.get("location") or {}
+        diagnostic = {
+            "filename": raw.get("filename", "unknown"),
+            "location": {
+                "row": location.get("row", 0),
+                "column": location.get("column", 0),
+            },
+            # Versões antigas do Ruff emitem erros de sintaxe sem código
+            "code": raw.get("code") or SYNTAX_ERROR_CODE,
+            "message": raw.get("message", ""),
+            # Versões recentes do Ruff chamam o nome da regra de "name"
+            "rule": raw.get("name") or raw.get("rule", ""),
+        }
+        if raw.get("fix"):
+            # Só para count_errors; ignorado pelo ErrorStore
+            diagnostic["fixable"] = True
+        return diagnostic
+
+    @staticmethod
+    def _parse_fixed_counts(output: str) -> Dict[str, int]:
+        """Contagens por código do bloco "Fixed N errors:" do ``--show-fixes``."""
+        fixed: Dict[str, int] = {}
+        for line in (output or "").splitlines():
+            match = _FIXED_LINE.match(line)
+            if match:
+                code = match.group("code")
+                fixed[code] = fixed.get(code, 0) + int(match.group("count"))
+        return fixed
 
     def categorize_error(self, error: Dict) -> str:
         """Categoriza o erro baseado no código."""
@@ -104,101 +942,256 @@ class ErrorsAnalyzer:
         # Outros erros (baixa prioridade)
         return "low"
 
+    def build_store(self, raw_errors: Iterable[Dict]) -> ErrorStore:
+        """Carrega os diagnósticos no armazenamento colunar, já sem excluídos."""
+        return ErrorStore.from_diagnostics(raw_errors, self.exclusions.matches)
+
+    def _aggregate(self, store: ErrorStore) -> Tuple[List[Priority], List[str]]:
+        """Prioridade e categoria de cada arquivo do ``store``.
+
+        ``determine_priority`` e ``categorize_error`` rodam uma vez por código
+        distinto; o resultado é agregado sobre as colunas.
+        """
+        codes = store.codes.values
+        code_priorities = [self.determine_priority({"code": code}) for code in codes]
+        code_categories = [self.categorize_error({"code": code}) for code in codes]
+        return (
+            store.file_priorities(code_priorities),
+            store.file_categories(code_categories),
+        )
+
     def process_errors(self, raw_errors: List[Dict]) -> List[Dict]:
         """Processa e agrupa erros por arquivo."""
-        files_data = {}
-        default_patterns = DEFAULT_EXCLUDE_DIRS
-        skip_patterns = [] if self.no_default_excludes else default_patterns
-        skip_patterns.extend(self.user_exclude_dirs)
+        store = self.build_store(raw_errors)
+        priorities, categories = self._aggregate(store)
+        return cast(List[Dict], store.to_file_reports(priorities, categories))
+
+    def count_errors(
+        self, files: Optional[Sequence[Union[str, Path]]] = None
+    ) -> ErrorCountsReport:
+        """Conta os diagnósticos do Ruff sem agrupá-los por arquivo.
 
-        for error in raw_errors:
+        Usa ``ruff check --statistics`` quando as exclusões do projeto têm
+        equivalente exato em globs do Ruff (ver
+        :meth:`_statistics_exclude_args`); caso contrário, conta os
+        diagnósticos ``json-lines`` que passam pelo mesmo filtro de
+        :meth:`analyze`. Em ambos os casos o Ruff roda uma única vez. Suficiente para o score de qualidade, que só depende
+        de ``metadata.total_errors``.
+
+        Args:
+            files: Lista explícita de arquivos a analisar.
+
+        Returns:
+            dict: Totais e contagens por código (``counts``)
+        """
+        counts: Dict[str, int] = {}
+        fixable = 0
+        self.ruff_processes = 0
+        try:
+            ruff_executable = self._ruff_executable()
+            exclude_args = self._statistics_exclude_args()
+            if exclude_args is not None:
+                results = self._count_with_statistics(
+                    ruff_executable, files, exclude_args
+                )
+            else:
+                results = self._count_streamed(files)
+        except AnalyzerExecutionError as exc:
+            logger.warning("Falha ao executar ruff: %s", exc)
+            results = []
+        for entry in results:
+            code = entry.get("code") or entry.get("name") or ""
+            counts[code] = counts.get(code, 0) + int(entry.get("count", 0))
+            fixable += int(entry.get("fixable_count", 0) or 0)
+
+        return cast(
+            ErrorCountsReport,
+            {
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "total_errors": sum(counts.values()),
+                    "fixable_errors": fixable,
+                    "counts_only": True,
+                    "ruff_processes": self.ruff_processes,
+                },
+                "counts": dict(sorted(counts.items())),
+            },
+        )
+
+    def _statistics_exclude_args(self) -> Optional[List[str]]:
+        """Exclusões do projeto como globs do Ruff de mesmo efeito, se houver.
+
+        As estatísticas do Ruff não passam pelo pós-filtro das exclusões, e
+        ``--extend-exclude build`` não reproduz o casamento por substring
+        (``build`` exclui ``build_utils.py`` no projeto). Um padrão sem ``/``
+        vira ``*padrão*``, que o Ruff testa contra o nome de cada arquivo e
+        diretório; ``*sufixo`` literal já tem o mesmo efeito nos dois. Outros
+        padrões, ou um padrão contido no caminho da raiz, devolvem ``None``.
+        """
+        root = str(self.project_path.absolute())
+        args: List[str] = []
+        for pattern in self.exclusions.patterns:
+            if "/" in pattern or os.sep in pattern:
+                return None
+            if _GLOB_CHARS.search(pattern):
+                if not pattern.startswith("*") or _GLOB_CHARS.search(pattern[1:]):
+                    return None
+                glob = pattern
+            elif pattern in root:
+                return None
+            else:
+                glob = f"*{pattern}*"
+            args.extend(["--extend-exclude", glob])
+        if args:
+            args.append("--force-exclude")
+        return args
+
+    def _count_with_statistics(
+        self,
+        ruff_executable: str,
+        files: Optional[Sequence[Union[str, Path]]],
+        exclude_args: List[str],
+    ) -> List[Dict]:
+        batches = self._plan_batches(files)
+        self.ruff_processes = len(batches)
+        jobs, threads = (
+            self._batch_concurrency(batches) if len(batches) > 1 else (1, None)
+        )
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(
+                lambda batch: self._invoke_ruff_statistics(
+                    ruff_executable, batch, threads, exclude_args
+                ),
+                batches,
+            )
+            return [entry for batch in results for entry in batch]
+
+    def _count_streamed(
+        self, files: Optional[Sequence[Union[str, Path]]]
+    ) -> List[Dict]:
+        """Contagens no formato de ``--statistics`` a partir dos diagnósticos."""
+        totals: Dict[str, Dict] = {}
+        skipped: Dict[str, bool] = {}
+        for error in self.run_ruff_check(files):
             filename = error.get("filename", "unknown")
-            # Ignora arquivos/pastas não relevantes
-            if any(pat in filename for pat in skip_patterns):
+            skip = skipped.get(filename)
+            if skip is None:
+                skip = skipped[filename] = self.exclusions.matches(filename)
+            if skip:
                 continue
+            code = error.get("code") or error.get("rule") or ""
+            entry = totals.setdefault(
+                code, {"code": code, "count": 0, "fixable_count": 0}
+            )
+            entry["count"] += 1
+            entry["fixable_count"] += int(bool(error.get("fixable")))
+        return list(totals.values())
 
-            if filename not in files_data:
-                files_data[filename] = {
-                    "file": filename,
-                    "error_count": 0,
-                    "errors": [],
-                    "priority": "low",
-                    "category": "Outros",
-                }
-
-            # Processa erro individual
-            processed_error = {
-                "line": error.get("location", {}).get("row", 0),
-                "column": error.get("location", {}).get("column", 0),
-                "code": error.get("code", ""),
-                "message": error.get("message", ""),
-                "rule": error.get("rule", ""),
-            }
-
-            files_data[filename]["errors"].append(processed_error)
-            files_data[filename]["error_count"] += 1
-
-            # Atualiza prioridade e categoria do arquivo
-            error_priority = self.determine_priority(error)
-            if error_priority == "high":
-                files_data[filename]["priority"] = "high"
-            elif (
-                error_priority == "medium" and files_data[filename]["priority"] == "low"
-            ):
-                files_data[filename]["priority"] = "medium"
-
-            # Atualiza categoria (usa a mais específica)
-            error_category = self.categorize_error(error)
-            if files_data[filename]["category"] == "Outros":
-                files_data[filename]["category"] = error_category
-
-        return list(files_data.values())
-
-    def analyze(self) -> ErrorsReport:
+    def _invoke_ruff_statistics(
+        self,
+        ruff_executable: str,
+        targets: List[str],
+        threads: Optional[int],
+        exclude_args: List[str],
+    ) -> List[Dict]:
+        cmd = [ruff_executable, "check", *targets, "--statistics"]
+        cmd += ["--output-format", "json"]
+        if self.config.get("ruff_fix", False):
+            cmd.append("--fix")
+        result = subprocess.run(  # nosec B607, B603
+            cmd + exclude_args,
+            capture_output=True,
+            text=True,
+            cwd=self.project_path,
+            check=False,
+            env=self._ruff_env(threads),
+        )
+        if result.returncode not in (0, 1):
+            raise AnalyzerExecutionError(
+                result.stderr.strip() or "Falha ao executar ruff"
+            )
+        try:
+            return json.loads(result.stdout) if result.stdout.strip() else []
+        except json.JSONDecodeError as e:
+            raise AnalyzerExecutionError(f"Erro ao decodificar JSON: {e}") from e
+
+    def analyze(
+        self, files: Optional[Sequence[Union[str, Path]]] = None
+    ) -> ErrorsReport:
         """Executa a análise completa de erros.
 
+        Args:
+            files: Lista explícita de arquivos a analisar; veja
+                :meth:`run_ruff_check`.
+
         Returns:
             dict: Relatório completo com erros encontrados
         """
+        self.start_run()
+        if self.deadline is not None:
+            self.planned_files = len(self.discover_files() if files is None else files)
         try:
-            raw_errors = self.run_ruff_check()
+            raw_errors = self.run_ruff_check(files)
         except AnalyzerExecutionError as exc:
             logger.warning("Falha ao executar ruff: %s", exc)
             raw_errors = []
-        processed_errors = self.process_errors(raw_errors)
+        return self._build_report(raw_errors)
 
-        # Calcula estatísticas
-        total_errors = sum(file_data["error_count"] for file_data in processed_errors)
+    async def analyze_async(
+        self,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        timeout: Optional[float] = None,
+    ) -> ErrorsReport:
+        """Versão assíncrona de :meth:`analyze` para o dashboard e integrações.
 
+        Args:
+            files: Lista explícita de arquivos a analisar.
+            timeout: Tempo máximo (segundos) para o Ruff; padrão
+                ``ruff_timeout``.
+        """
+        self.start_run()
+        try:
+            raw_errors = await self.run_ruff_check_async(files, timeout)
+        except AnalyzerExecutionError as exc:
+            logger.warning("Falha ao executar ruff: %s", exc)
+            raw_errors = []
+        return self._build_report(raw_errors)
+
+    def _build_report(self, raw_errors: List[Dict]) -> ErrorsReport:
+        """Monta o relatório a partir dos diagnósticos brutos do Ruff."""
+        store = self.build_store(raw_errors)
+        priorities, categories = self._aggregate(store)
+
+        # Estatísticas por arquivo, direto das agregações
+        total_errors = len(store)
         stats = {
-            "high_priority": len(
-                [f for f in processed_errors if f["priority"] == "high"]
-            ),
-            "medium_priority": len(
-                [f for f in processed_errors if f["priority"] == "medium"]
-            ),
-            "low_priority": len(
-                [f for f in processed_errors if f["priority"] == "low"]
-            ),
-            "syntax_errors": len(
-                [f for f in processed_errors if f["category"] == "Erros de Sintaxe"]
-            ),
-            "style_errors": len(
-                [f for f in processed_errors if f["category"] == "Erros de Estilo"]
-            ),
-            "critical_errors": len(
-                [f for f in processed_errors if f["priority"] == "high"]
-            ),
+            "high_priority": priorities.count("high"),
+            "medium_priority": priorities.count("medium"),
+            "low_priority": priorities.count("low"),
+            "syntax_errors": categories.count("Erros de Sintaxe"),
+            "style_errors": categories.count("Erros de Estilo"),
+            "critical_errors": priorities.count("high"),
         }
+        processed_errors = store.to_file_reports(priorities, categories)
+
+        metadata: Dict = {
+            "generated_at": datetime.now().isoformat(),
+            "total_errors": total_errors,
+            "total_files": len(processed_errors),
+            "ruff_processes": self.ruff_processes,
+            "ruff_backend": self.backend_used,
+        }
+        metadata.update(self.completeness_metadata())
+        if self.config.get("ruff_cache", False):
+            metadata["ruff_cache_hits"] = self.cache_hits
+        if self.config.get("ruff_fix", False):
+            metadata["fixed_errors"] = sum(self.fixed_counts.values())
+            metadata["fixed_by_code"] = dict(sorted(self.fixed_counts.items()))
 
         return cast(
             ErrorsReport,
             {
-                "metadata": {
-                    "generated_at": datetime.now().isoformat(),
-                    "total_errors": total_errors,
-                    "total_files": len(processed_errors),
-                },
+                "metadata": metadata,
                 "errors": cast(List[ErrorFileReport], processed_errors),
                 "statistics": cast(ErrorStatistics, stats),
             },
@@ -225,7 +1218,13 @@ class ErrorsAnalyzer:
             f.write("# 🔍 Relatório de Erros Ruff\n\n")
             f.write(f"**Gerado em:** {report['metadata']['generated_at']}\n\n")
             f.write(f"**Total de erros:** {report['metadata']['total_errors']}\n")
-            f.write(f"**Arquivos com erros:** {report['metadata']['total_files']}\n\n")
+            f.write(f"**Arquivos com erros:** {report['metadata']['total_files']}\n")
+            if "fixed_errors" in report["metadata"]:
+                f.write(
+                    "**Corrigidos automaticamente:** "
+                    f"{report['metadata']['fixed_errors']}\n"
+                )
+            f.write("\n")
 
             if not report["errors"]:
                 f.write("✅ **Nenhum erro encontrado!** Seu código está limpo.\n")
@@ -0,0 +1,210 @@
+"""Registro dos analisadores disponíveis para o :class:`CodeAnalyzer`.
+
+Além dos analisadores embutidos (``violations``, ``templates`` e ``errors``),
+pacotes de terceiros podem publicar analisadores pelo grupo de entry points
+``codehealthanalyzer.analyzers``::
+
+    [project.entry-points."codehealthanalyzer.analyzers"]
+    security = "meu_pacote.analyzers:SecurityAnalyzer"
+
+ou registrá-los em tempo de execução com :func:`register_analyzer`. Um
+analisador é uma classe com a assinatura de :class:`BaseAnalyzer`
+(``project_path, config``) e um método ``analyze()`` que devolve um dict.
+Subclasses de ``BaseAnalyzer`` recebem as leituras compartilhadas da
+execução (``sources`` e ``artifacts``).
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from ..exceptions import ConfigurationError
+from ..schemas import ErrorsReport, TemplatesReport, ViolationsReport
+from .base import BaseAnalyzer
+from .errors import ErrorsAnalyzer
+from .templates import TemplatesAnalyzer
+from .violations import ViolationsAnalyzer
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "codehealthanalyzer.analyzers"
+
+# Ordem de execução: o Ruff (subprocesso) primeiro, para rodar em segundo plano
+BUILTIN_ANALYZERS: Dict[str, Type[BaseAnalyzer]] = {
+    "errors": ErrorsAnalyzer,
+    "violations": ViolationsAnalyzer,
+    "templates": TemplatesAnalyzer,
+}
+
+_registered: Dict[str, Type[Any]] = {}
+
+
+def register_analyzer(name: str, analyzer_cls: Type[Any]) -> None:
+    """Registra um analisador de terceiros sob ``name``.
+
+    Raises:
+        ConfigurationError: Se ``name`` for de um analisador embutido ou a
+            classe não tiver um método ``analyze``.
+    """
+    if name in BUILTIN_ANALYZERS:
+        raise ConfigurationError(f"'{name}' é um analisador embutido")
+    if not callable(getattr(analyzer_cls, "analyze", None)):
+        raise ConfigurationError(f"Analisador '{name}' não define analyze()")
+    _registered[name] = analyzer_cls
+
+
+def unregister_analyzer(name: str) -> None:
+    """Remove um analisador registrado com :func:`register_analyzer`."""
+    _registered.pop(name, None)
+
+
+@lru_cache(maxsize=1)
+def _entry_point_analyzers() -> Dict[str, Type[Any]]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return {}
+    found = entry_points()
+    if hasattr(found, "select"):
+        candidates = list(found.select(group=ENTRY_POINT_GROUP))
+    else:  # Python < 3.10: dict por grupo
+        candidates = list(found.get(ENTRY_POINT_GROUP, []))
+
+    loaded: Dict[str, Type[Any]] = {}
+    for entry_point in candidates:
+        if entry_point.name in BUILTIN_ANALYZERS:
+            logger.warning("Entry point %s ignorado: nome reservado", entry_point.value)
+            continue
+        try:
+            analyzer_cls = entry_point.load()
+        except Exception as exc:  # plugin quebrado não derruba a análise
+            logger.warning("Falha ao carregar analisador %s: %s", entry_point.name, exc)
+            continue
+        if not callable(getattr(analyzer_cls, "analyze", None)):
+            logger.warning("Analisador %s não define analyze()", entry_point.name)
+            continue
+        loaded[entry_point.name] = analyzer_cls
+    return loaded
+
+
+def available_analyzers() -> Dict[str, Type[Any]]:
+    """Analisadores conhecidos, na ordem de execução (embutidos primeiro)."""
+    return {**BUILTIN_ANALYZERS, **_entry_point_analyzers(), **_registered}
+
+
+def _names(values: Optional[Iterable[str]]) -> List[str]:
+    """Normaliza nomes, aceitando itens separados por vírgula."""
+    names: List[str] = []
+    for value in values or ():
+        for name in str(value).split(","):
+            name = name.strip().lower()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def select_analyzers(
+    only: Optional[Iterable[str]] = None, skip: Optional[Iterable[str]] = None
+) -> List[str]:
+    """Resolve a seleção de analisadores, na ordem de execução.
+
+    Args:
+        only: Analisadores a executar (padrão: todos os disponíveis).
+        skip: Analisadores a omitir.
+
+    Raises:
+        ConfigurationError: Para nomes desconhecidos ou seleção vazia.
+    """
+    available = available_analyzers()
+    only_names, skip_names = _names(only), _names(skip)
+    unknown = [name for name in only_names + skip_names if name not in available]
+    if unknown:
+        raise ConfigurationError(
+            f"Analisador(es) desconhecido(s): {', '.join(unknown)}. "
+            f"Disponíveis: {', '.join(available)}"
+        )
+    selected = [
+        name
+        for name in available
+        if (not only_names or name in only_names) and name not in skip_names
+    ]
+    if not selected:
+        raise ConfigurationError("Nenhum analisador selecionado")
+    return selected
+
+
+def empty_report(name: str) -> Any:
+    """Relatório vazio de um analisador embutido que não foi executado."""
+    if name == "violations":
+        violations: ViolationsReport = {
+            "metadata": {
+                "generated_at": "",
+                "directory": "",
+                "total_files": 0,
+                "violation_files": 0,
+                "warning_files": 0,
+            },
+            "violations": [],
+            "warnings": [],
+            "statistics": {
+                "total_files": 0,
+                "violation_files": 0,
+                "warning_files": 0,
+                "high_priority": 0,
+                "medium_priority": 0,
+                "python_files": 0,
+                "html_files": 0,
+            },
+        }
+        return violations
+    if name == "templates":
+        templates: TemplatesReport = {
+            "metadata": {
+                "generated_at": "",
+                "templates_paths": [],
+                "total_templates": 0,
+            },
+            "templates": [],
+            "statistics": {
+                "total_templates": 0,
+                "total_css_chars": 0,
+                "total_js_chars": 0,
+                "high_priority": 0,
+                "medium_priority": 0,
+                "templates_with_css": 0,
+                "templates_with_js": 0,
+                "total_css_gzip_bytes": 0,
+                "total_js_gzip_bytes": 0,
+                "render_blocking_scripts": 0,
+            },
+            "duplicates": [],
+        }
+        return templates
+    if name == "errors":
+        errors: ErrorsReport = {
+            "metadata": {"generated_at": "", "total_errors": 0, "total_files": 0},
+            "errors": [],
+            "statistics": {
+                "high_priority": 0,
+                "medium_priority": 0,
+                "low_priority": 0,
+                "syntax_errors": 0,
+                "style_errors": 0,
+                "critical_errors": 0,
+            },
+        }
+        return errors
+    return {}
+
+
+__all__ = [
+    "BUILTIN_ANALYZERS",
+    "ENTRY_POINT_GROUP",
+    "available_analyzers",
+    "empty_report",
+    "register_analyzer",
+    "select_analyzers",
+    "unregister_analyzer",
+]
@@ -0,0 +1,301 @@
+"""Backend persistente do Ruff via ``ruff server`` (LSP sobre stdio).
+
+Mantém um único processo do Ruff vivo entre análises: os arquivos são
+abertos no servidor uma vez e, nas execuções seguintes, só o conteúdo dos
+arquivos alterados é reenviado e relintado. Usado pelo ``ErrorsAnalyzer``
+quando ``ruff_backend`` é ``"server"``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import queue
+import subprocess  # nosec B404
+import threading
+import weakref
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..exceptions import AnalyzerExecutionError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+SHUTDOWN_TIMEOUT = 2.0
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def _read_messages(stream: IO[bytes], inbox: "queue.Queue[Optional[Dict]]") -> None:
+    """Lê mensagens LSP (``Content-Length`` + JSON) e as coloca em ``inbox``."""
+    try:
+        while True:
+            length = None
+            while True:
+                line = stream.readline()
+                if not line:
+                    return
+                if line in (b"\r\n", b"\n"):
+                    break
+                name, _, value = line.decode("ascii", "replace").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            if length is None:
+                continue
+            inbox.put(json.loads(stream.read(length)))
+    except (OSError, ValueError):
+        return
+    finally:
+        # Sinaliza o fim do stream para quem estiver esperando
+        inbox.put(None)
+
+
+class RuffServerBackend:
+    """Cliente mínimo de ``ruff server`` para diagnósticos incrementais.
+
+    Args:
+        ruff_executable: Caminho do executável do Ruff.
+        root: Raiz do projeto (workspace do servidor).
+        request_timeout: Tempo máximo de espera por cada resposta.
+    """
+
+    def __init__(
+        self,
+        ruff_executable: str,
+        root: Path,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> None:
+        self.ruff_executable = ruff_executable
+        self.root = root
+        self.request_timeout = request_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self._inbox: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._next_id = 0
+        self._lock = threading.RLock()
+        # uri -> (versão, hash do conteúdo, diagnósticos)
+        self._documents: Dict[str, Tuple[int, str, List[Dict]]] = {}
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """Inicia o servidor e faz o handshake ``initialize``."""
+        self.process = subprocess.Popen(  # nosec B603
+            [self.ruff_executable, "server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.root,
+        )
+        weakref.finalize(self, _terminate, self.process)
+        threading.Thread(
+            target=_read_messages,
+            args=(self.process.stdout, self._inbox),
+            name="ruff-server-reader",
+            daemon=True,
+        ).start()
+        root_uri = self.root.absolute().as_uri()
+        self._request(
+            "initialize",
+            {
+                "processId": None,
+                "rootUri": root_uri,
+                "workspaceFolders": [{"uri": root_uri, "name": self.root.name}],
+                "capabilities": {
+                    # Colunas em code points, como na saída do CLI
+                    "general": {"positionEncodings": ["utf-32"]},
+                    "textDocument": {"diagnostic": {"dynamicRegistration": False}},
+                },
+            },
+        )
+        self._notify("initialized", {})
+
+    def close(self) -> None:
+        """Encerra o servidor (``shutdown`` + ``exit``), matando-o se preciso."""
+        with self._lock:
+            process = self.process
+            if process is None:
+                return
+            try:
+                if process.poll() is None:
+                    self._request("shutdown", None, timeout=SHUTDOWN_TIMEOUT)
+                    self._notify("exit", None)
+                    process.wait(timeout=SHUTDOWN_TIMEOUT)
+            except (AnalyzerExecutionError, OSError, subprocess.TimeoutExpired):
+                pass
+            finally:
+                self.process = None
+                self._documents.clear()
+                _terminate(process)
+
+    # ------------------------------------------------------------------
+    # Diagnósticos
+    # ------------------------------------------------------------------
+
+    def diagnostics(self, paths: Sequence[Path]) -> List[Dict]:
+        """Diagnósticos dos arquivos, relintando só o que mudou desde a última vez."""
+        with self._lock:
+            if not self.alive:
+                raise AnalyzerExecutionError("ruff server não está em execução")
+            wanted: Dict[str, Path] = {}
+            pending: Dict[int, Tuple[str, int, str]] = {}
+            for path in paths:
+                uri = path.absolute().as_uri()
+                wanted[uri] = path
+                try:
+                    content = path.read_bytes()
+                except OSError:
+                    continue
+                digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                previous = self._documents.get(uri)
+                if previous is not None and previous[1] == digest:
+                    continue
+                text = content.decode("utf-8", "replace")
+                if previous is None:
+                    version = 1
+                    self._notify(
+                        "textDocument/didOpen",
+                        {
+                            "textDocument": {
+                                "uri": uri,
+                                "languageId": "python",
+                                "version": version,
+                                "text": text,
+                            }
+                        },
+                    )
+                else:
+                    version = previous[0] + 1
+                    self._notify(
+                        "textDocument/didChange",
+                        {
+                            "textDocument": {"uri": uri, "version": version},
+                            "contentChanges": [{"text": text}],
+                        },
+                    )
+                request_id = self._send_request(
+                    "textDocument/diagnostic", {"textDocument": {"uri": uri}}
+                )
+                pending[request_id] = (uri, version, digest)
+
+            for uri in [u for u in self._documents if u not in wanted]:
+                self._notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+                del self._documents[uri]
+
+            for request_id, result in self._collect(pending):
+                uri, version, digest = pending[request_id]
+                items = (result or {}).get("items", [])
+                self._documents[uri] = (
+                    version,
+                    digest,
+                    [self._project(wanted[uri], item) for item in items],
+                )
+
+            errors: List[Dict] = []
+            for uri in wanted:
+                if uri in self._documents:
+                    errors.extend(self._documents[uri][2])
+            # Mesma ordem estável do CLI, independente da ordem das respostas
+            errors.sort(
+                key=lambda error: (
+                    error["filename"],
+                    error["location"]["row"],
+                    error["location"]["column"],
+                )
+            )
+            return errors
+
+    @staticmethod
+    def _project(path: Path, item: Dict[str, Any]) -> Dict:
+        """Converte um diagnóstico LSP na forma enxuta usada pelo analisador."""
+        start = (item.get("range") or {}).get("start") or {}
+        href = (item.get("codeDescription") or {}).get("href", "")
+        return {
+            "filename": str(path.absolute()),
+            "location": {
+                "row": int(start.get("line", 0)) + 1,
+                "column": int(start.get("character", 0)) + 1,
+            },
+            "code": str(item.get("code") or ""),
+            # O servidor acrescenta a dica de correção após uma linha em branco
+            "message": str(item.get("message", "")).split("\n", 1)[0],
+            "rule": href.rstrip("/").rsplit("/", 1)[-1] if href else "",
+        }
+
+    # ------------------------------------------------------------------
+    # Protocolo
+    # ------------------------------------------------------------------
+
+    def _write(self, message: Dict) -> None:
+        if self.process is None or self.process.stdin is None:
+            raise AnalyzerExecutionError("ruff server não está em execução")
+        body = json.dumps(message).encode("utf-8")
+        try:
+            self.process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            self.process.stdin.flush()
+        except OSError as exc:
+            raise AnalyzerExecutionError(f"ruff server encerrou: {exc}") from exc
+
+    def _notify(self, method: str, params: Any) -> None:
+        self._write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _send_request(self, method: str, params: Any) -> int:
+        self._next_id += 1
+        self._write(
+            {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        )
+        return self._next_id
+
+    def _request(
+        self, method: str, params: Any, timeout: Optional[float] = None
+    ) -> Any:
+        request_id = self._send_request(method, params)
+        for _, result in self._collect({request_id: None}, timeout):
+            return result
+        return None
+
+    def _collect(
+        self, pending: Dict[int, Any], timeout: Optional[float] = None
+    ) -> List[Tuple[int, Any]]:
+        """Aguarda as respostas de ``pending`` (em qualquer ordem)."""
+        waiting = set(pending)
+        results: List[Tuple[int, Any]] = []
+        while waiting:
+            try:
+                message = self._inbox.get(timeout=timeout or self.request_timeout)
+            except queue.Empty as exc:
+                raise AnalyzerExecutionError(
+                    "ruff server não respondeu a tempo"
+                ) from exc
+            if message is None:
+                raise AnalyzerExecutionError("ruff server encerrou inesperadamente")
+            if "method" in message:
+                if "id" in message:
+                    # Requisição do servidor (ex.: registro de capacidades)
+                    self._write({"jsonrpc": "2.0", "id": message["id"], "result": None})
+                continue
+            request_id = message.get("id")
+            if request_id not in waiting:
+                continue
+            waiting.discard(request_id)
+            if "error" in message:
+                error = message["error"] or {}
+                raise AnalyzerExecutionError(
+                    f"ruff server: {error.get('message', 'erro desconhecido')}"
+                )
+            results.append((request_id, message.get("result")))
+        return results
+
+
+__all__ = ["RuffServerBackend"]
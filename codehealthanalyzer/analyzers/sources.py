@@ -0,0 +1,336 @@
+"""Leitura compartilhada de arquivos-fonte entre analisadores.
+
+Durante uma análise completa o mesmo template HTML interessa a mais de um
+analisador (contagem de linhas e varredura de assets inline). O
+:class:`SharedSources` garante que cada arquivo seja lido e decodificado uma
+única vez e entregue o mesmo buffer a todos os consumidores.
+
+Todos os consumidores decodificam da mesma forma: UTF-8 estrito, BOM
+removido do texto (e contabilizado em ``bom_bytes`` para que offsets em bytes
+continuem batendo com o disco) e quebras de linha preservadas.
+
+Para fontes Python, o :class:`ArtifactCache` guarda por execução o código,
+a AST de cada arquivo, com orçamento de memória e descarte LRU.
+"""
+
+from __future__ import annotations
+
+import ast
+import codecs
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union, cast
+
+from ..schemas import ArtifactCacheStats
+
+# Separadores de linha reconhecidos pelo modo "universal newlines" do open()
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass(frozen=True)
+class TextSource:
+    """Conteúdo decodificado de um arquivo.
+
+    Attributes:
+        path: Caminho lido.
+        text: Texto sem BOM, com as quebras de linha originais.
+        bom_bytes: Bytes de BOM removidos do início do arquivo (0 ou 3).
+    """
+
+    path: Path
+    text: str
+    bom_bytes: int = 0
+
+    def nonblank_lines(self) -> int:
+        """Número de linhas com algum conteúdo além de espaços."""
+        return sum(1 for line in _LINE_BREAK.split(self.text) if line.strip())
+
+
+def read_text_source(path: Union[str, Path]) -> TextSource:
+    """Lê e decodifica ``path`` (UTF-8 estrito, BOM opcional).
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido.
+        UnicodeDecodeError: Se o conteúdo não for UTF-8 válido.
+    """
+    raw = Path(path).read_bytes()
+    bom = len(codecs.BOM_UTF8) if raw.startswith(codecs.BOM_UTF8) else 0
+    return TextSource(Path(path), raw[bom:].decode("utf-8"), bom)
+
+
+def source_key(path: Union[str, Path]) -> str:
+    """Chave canônica de um arquivo (caminho real, absoluto)."""
+    return os.path.realpath(path)
+
+
+# Orçamento padrão dos buffers retidos pelo SharedSources (caracteres)
+DEFAULT_SHARED_SOURCES_BYTES = 16 * 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ("ready", "source", "error", "remaining", "weight")
+
+    def __init__(self, remaining: int) -> None:
+        self.ready = threading.Event()
+        self.source: Optional[TextSource] = None
+        self.error: Optional[BaseException] = None
+        self.remaining = remaining
+        self.weight = 0
+
+
+class SharedSources:
+    """Leituras de arquivo compartilhadas por vários consumidores.
+
+    Só os arquivos registrados em ``paths`` são retidos; cada um é lido na
+    primeira solicitação e descartado após ser entregue a ``consumers``
+    solicitantes. Demais arquivos são lidos diretamente, sem retenção.
+    Seguro para uso a partir de várias threads.
+
+    O total retido fica limitado a ``max_bytes``: quando um consumidor fica
+    para trás, os buffers lidos há mais tempo são descartados (LRU) e relidos
+    do disco quando ele chegar neles.
+
+    Args:
+        paths: Arquivos que mais de um consumidor vai ler.
+        consumers: Quantas vezes cada arquivo registrado será solicitado.
+        max_bytes: Orçamento (caracteres de texto) dos buffers retidos.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Union[str, Path]],
+        consumers: int = 2,
+        max_bytes: int = DEFAULT_SHARED_SOURCES_BYTES,
+    ) -> None:
+        self.consumers = max(1, consumers)
+        self.max_bytes = max(0, int(max_bytes))
+        self._shared = {source_key(path) for path in paths}
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Solicitações ainda esperadas de arquivos descartados pelo orçamento
+        self._evicted: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.retained_bytes = 0
+        self.peak_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def shares(self, path: Union[str, Path]) -> bool:
+        """Indica se ``path`` está entre os arquivos compartilhados."""
+        return source_key(path) in self._shared
+
+    def get(self, path: Union[str, Path]) -> TextSource:
+        """Retorna o conteúdo de ``path``, compartilhando a leitura do disco.
+
+        Erros de leitura/decodificação também são compartilhados: todos os
+        consumidores recebem a mesma exceção. Buffers descartados pelo
+        orçamento são relidos do disco.
+        """
+        key = source_key(path)
+        if key not in self._shared:
+            with self._lock:
+                self.reads += 1
+            return read_text_source(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if entry is None:
+                remaining = self._evicted.pop(key, self.consumers)
+                entry = self._entries[key] = _Entry(remaining)
+                self.reads += 1
+            else:
+                self.hits += 1
+            entry.remaining -= 1
+            if entry.remaining <= 0:
+                self._release(key)
+
+        if owner:
+            try:
+                entry.source = read_text_source(path)
+            except (OSError, UnicodeDecodeError) as exc:
+                entry.error = exc
+            finally:
+                self._retain(key, entry)
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        return cast(TextSource, entry.source)
+
+    def _retain(self, key: str, entry: _Entry) -> None:
+        """Contabiliza o buffer recém-lido e descarta os mais antigos se preciso."""
+        with self._lock:
+            if self._entries.get(key) is not entry or entry.source is None:
+                return
+            entry.weight = len(entry.source.text)
+            self.retained_bytes += entry.weight
+            while self.retained_bytes > self.max_bytes:
+                # Leituras em curso ainda não pesam no orçamento
+                oldest = next((k for k, e in self._entries.items() if e.weight), key)
+                self._evicted[oldest] = self._entries[oldest].remaining
+                self._release(oldest)
+                self.evictions += 1
+            self.peak_bytes = max(self.peak_bytes, self.retained_bytes)
+
+    def _release(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.retained_bytes -= entry.weight
+
+    def clear(self) -> None:
+        """Descarta os buffers ainda retidos."""
+        with self._lock:
+            self._entries.clear()
+            self._evicted.clear()
+            self.retained_bytes = 0
+
+
+# Orçamento padrão do ArtifactCache (bytes estimados)
+DEFAULT_ARTIFACT_CACHE_BYTES = 64 * 1024 * 1024
+# Estimativa de memória por caractere de código-fonte (medida com
+# tracemalloc em módulos típicos): a AST ocupa ~32x o fonte
+AST_BYTES_PER_SOURCE_BYTE = 32
+
+
+class PythonArtifact:
+    """Código-fonte de um módulo Python e sua AST, calculada sob demanda.
+
+    ``source`` é lido como em ``open(path, encoding="utf-8-sig")``: BOM
+    removido e quebras de linha normalizadas para ``\\n``.
+    """
+
+    __slots__ = ("path", "source", "_tree")
+
+    def __init__(self, path: Path, source: str) -> None:
+        self.path = path
+        self.source = source
+        self._tree: Optional[ast.AST] = None
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> "PythonArtifact":
+        with open(path, "r", encoding="utf-8-sig") as fh:
+            return cls(Path(path), fh.read())
+
+    @property
+    def lines(self) -> List[str]:
+        return self.source.split("\n")
+
+    @property
+    def tree(self) -> ast.AST:
+        """AST do módulo (``SyntaxError`` se o código for inválido)."""
+        if self._tree is None:
+            self._tree = ast.parse(self.source, filename=str(self.path))
+        return self._tree
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Memória estimada do fonte e da AST, se já calculada."""
+        size = len(self.source)
+        weight = size
+        if self._tree is not None:
+            weight += size * AST_BYTES_PER_SOURCE_BYTE
+        return weight
+
+
+class ArtifactCache:
+    """Cache LRU de :class:`PythonArtifact` válido durante uma execução.
+
+    O peso de cada entrada é reavaliado a cada acesso (a AST é
+    calculada sob demanda); as entradas menos usadas recentemente são
+    descartadas quando o total excede ``max_bytes``. A entrada mais recente
+    é sempre mantida, mesmo que sozinha ultrapasse o orçamento.
+
+    Args:
+        max_bytes: Orçamento de memória estimada.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_ARTIFACT_CACHE_BYTES) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, PythonArtifact]" = OrderedDict()
+        self._weights: Dict[str, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, Path)) and source_key(path) in self._entries
+
+    def get(self, path: Union[str, Path]) -> PythonArtifact:
+        """Retorna o artefato de ``path``, lendo o arquivo em caso de miss.
+
+        Raises:
+            OSError: Se o arquivo não puder ser lido.
+            UnicodeDecodeError: Se o conteúdo não for UTF-8 válido.
+        """
+        key = source_key(path)
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return artifact
+            self.misses += 1
+        artifact = PythonArtifact.read(path)
+        with self._lock:
+            self._entries[key] = artifact
+            self._entries.move_to_end(key)
+            self._weights.setdefault(key, 0)
+        self.touch(path)
+        return artifact
+
+    def touch(self, path: Union[str, Path]) -> None:
+        """Reavalia o peso de ``path`` (após calcular a AST) e aplica o LRU."""
+        key = source_key(path)
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is None:
+                return
+            weight = artifact.estimated_bytes
+            self._total += weight - self._weights.get(key, 0)
+            self._weights[key] = weight
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                oldest, _ = self._entries.popitem(last=False)
+                self._total -= self._weights.pop(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weights.clear()
+            self._total = 0
+
+    def stats(self) -> ArtifactCacheStats:
+        """Contadores de acerto, falta e descarte, mais a ocupação atual."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "estimated_bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+__all__ = [
+    "ArtifactCache",
+    "PythonArtifact",
+    "SharedSources",
+    "TextSource",
+    "read_text_source",
+    "source_key",
+]
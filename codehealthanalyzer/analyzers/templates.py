@@ -4,16 +4,22 @@ Este módulo contém a classe TemplatesAnalyzer que identifica CSS inline e Java
 que podem ser extraídos para arquivos externos.
 """
 
+import bisect
+import hashlib
 import json
 import logging
 import re
+import zlib
+from codecs import BOM_UTF8
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
 
 from ..config import DEFAULT_TEMPLATE_DIRS
 from ..schemas import (
+    DuplicateInlineAsset,
     InlineAsset,
+    ReportMetadata,
     TemplateFileReport,
     TemplatesReport,
     TemplateStatistics,
@@ -22,6 +28,252 @@ from .base import BaseAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Tamanho (em bytes) do hash curto usado no modo compacto
+SNIPPET_HASH_SIZE = 8
+
+# Arquivos acima deste tamanho são varridos em blocos (modo streaming)
+DEFAULT_STREAM_THRESHOLD = 5 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+ASSET_KINDS = ("css_inline", "css_style_tags", "js_inline", "js_script_tags")
+# Trechos considerados no índice de duplicatas (style=, <style> e <script>)
+DUPLICATE_KINDS = ("css_inline", "css_style_tags", "js_script_tags")
+DEFAULT_DUPLICATE_MIN_FILES = 2
+# Limite de ocorrências listadas por duplicata no relatório
+MAX_DUPLICATE_LOCATIONS = 20
+
+# Bytes de CSS/JS comprimidos por template; o restante é extrapolado
+DEFAULT_GZIP_SAMPLE_BYTES = 64 * 1024
+GZIP_LEVEL = 6
+
+_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+_HEAD_OPEN_PATTERN = re.compile(r"<head[\s>]", re.IGNORECASE)
+_HEAD_CLOSE_PATTERN = re.compile(r"</head\s*>", re.IGNORECASE)
+# Scripts que não bloqueiam a renderização (ou nem são executados)
+_NON_BLOCKING_SCRIPT = re.compile(
+    r"\b(?:async|defer)\b"
+    r"|type\s*=\s*[\"']?(?:module|application/(?:ld\+)?json|text/(?:template|html|x-template))",
+    re.IGNORECASE,
+)
+
+# Construções que não podem ser cortadas entre dois blocos
+_BLOCK_DELIMITERS = (
+    ("<!--", "-->"),
+    ("<style", "</style>"),
+    ("<script", "</script>"),
+)
+
+
+def snippet_hash(content: str) -> str:
+    """Retorna o hash curto usado para identificar um trecho inline."""
+    return hashlib.blake2b(
+        content.encode("utf-8"), digest_size=SNIPPET_HASH_SIZE
+    ).hexdigest()
+
+
+def normalize_snippet(content: str) -> str:
+    """Normaliza um trecho inline colapsando espaços em branco."""
+    return " ".join(content.split())
+
+
+def _blank_comments(content: str) -> str:
+    """Apaga comentários HTML preservando posições e quebras de linha."""
+    return _COMMENT_PATTERN.sub(lambda m: re.sub(r"[^\n]", " ", m.group(0)), content)
+
+
+def _safe_cut(blanked: str) -> int:
+    """Retorna até onde um bloco pode ser analisado sem cortar uma tag.
+
+    Tudo após o último ``>`` e qualquer comentário, ``<style>`` ou ``<script>``
+    ainda não fechado ficam para o próximo bloco (carry-over).
+    """
+    cut = blanked.rfind(">") + 1
+    lowered = blanked.lower()
+    for opener, closer in _BLOCK_DELIMITERS:
+        start = lowered.rfind(opener)
+        if start != -1 and lowered.find(closer, start) == -1:
+            cut = min(cut, start)
+    return cut
+
+
+class _SourceIndex:
+    """Converte posições de caractere em número de linha e offset em bytes."""
+
+    def __init__(self, text: str, first_line: int = 1, byte_base: int = 0) -> None:
+        self.text = text
+        self.first_line = first_line
+        self.byte_base = byte_base
+        self._newlines = [m.start() for m in re.finditer("\n", text)]
+        self._ascii = text.isascii()
+        self._cursor = 0
+        self._cursor_bytes = 0
+
+    def line(self, pos: int) -> int:
+        return self.first_line + bisect.bisect_left(self._newlines, pos)
+
+    def byte_offset(self, pos: int) -> int:
+        if self._ascii:
+            return self.byte_base + pos
+        if pos < self._cursor:
+            self._cursor = 0
+            self._cursor_bytes = 0
+        self._cursor_bytes += len(self.text[self._cursor : pos].encode("utf-8"))
+        self._cursor = pos
+        return self.byte_base + self._cursor_bytes
+
+
+class _WireEstimator:
+    """Estima o tamanho gzip de um fluxo de trechos com custo limitado.
+
+    Apenas os primeiros ``budget`` bytes são comprimidos; para o restante a
+    taxa de compressão da amostra é extrapolada.
+    """
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.raw_bytes = 0
+        self._sampled = 0
+        self._compressed = 0
+        self._compressor: Any = None
+
+    def feed(self, data: bytes) -> None:
+        self.raw_bytes += len(data)
+        room = self.budget - self._sampled
+        if room <= 0:
+            return
+        if self._compressor is None:
+            # wbits=31 produz o formato gzip (cabeçalho + CRC)
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        part = data[:room]
+        self._sampled += len(part)
+        self._compressed += len(self._compressor.compress(part))
+
+    def estimate(self) -> int:
+        if self._compressor is not None:
+            self._compressed += len(self._compressor.flush())
+            self._compressor = None
+        if not self._sampled:
+            return 0
+        if self._sampled == self.raw_bytes:
+            return self._compressed
+        return round(self._compressed * self.raw_bytes / self._sampled)
+
+
+class _InlineCollector:
+    """Monta os InlineAsset de um template e registra suas impressões digitais.
+
+    As impressões digitais (hash do corpo normalizado e tamanho em bytes)
+    alimentam o índice de trechos duplicados entre templates; os bytes de
+    CSS/JS alimentam a estimativa de peso na rede (gzip).
+    """
+
+    def __init__(
+        self, compact: bool, gzip_budget: int = DEFAULT_GZIP_SAMPLE_BYTES
+    ) -> None:
+        self.compact = compact
+        self.assets: Dict[str, List[InlineAsset]] = {kind: [] for kind in ASSET_KINDS}
+        self.fingerprints: List[Tuple[str, str, int, int]] = []
+        self.css_wire = _WireEstimator(gzip_budget)
+        self.js_wire = _WireEstimator(gzip_budget)
+        # Estado do <head> entre blocos: "before", "inside" ou "after"
+        self.head_state = "before"
+
+    def head_bounds(self, content: str) -> Tuple[int, int]:
+        """Retorna o intervalo [início, fim) do <head> dentro do trecho."""
+        if self.head_state == "after":
+            return (0, 0)
+        start = 0
+        if self.head_state == "before":
+            opened = _HEAD_OPEN_PATTERN.search(content)
+            if opened is None:
+                return (0, 0)
+            start = opened.start()
+            self.head_state = "inside"
+        closed = _HEAD_CLOSE_PATTERN.search(content, start)
+        if closed is None:
+            return (start, len(content))
+        self.head_state = "after"
+        return (start, closed.start())
+
+    def add(
+        self,
+        kind: str,
+        index: _SourceIndex,
+        match_pos: int,
+        pos: int,
+        text: str,
+        **extra: Any,
+    ) -> None:
+        """Registra um trecho inline.
+
+        ``match_pos`` é o início da tag/atributo (define a linha) e ``pos`` o
+        início do corpo (define o offset em bytes no modo compacto).
+        """
+        asset: Dict[str, Any] = {"line": index.line(match_pos)}
+        if self.compact:
+            asset["offset"] = index.byte_offset(pos)
+            asset["length"] = len(text)
+            # ``text`` vem do conteúdo sem comentários; o hash usa o trecho
+            # original, o mesmo que ``load_snippet`` relê do disco
+            asset["hash"] = snippet_hash(index.text[pos : pos + len(text)])
+        else:
+            asset["content"] = text
+            asset["length"] = len(text)
+        asset.update(extra)
+        self.assets[kind].append(cast(InlineAsset, asset))
+
+        data = text.encode("utf-8")
+        if kind.startswith("css"):
+            self.css_wire.feed(data)
+        else:
+            self.js_wire.feed(data)
+
+        if kind in DUPLICATE_KINDS:
+            digest = snippet_hash(normalize_snippet(text))
+            self.fingerprints.append((kind, digest, len(data), asset["line"]))
+
+
+class _DuplicateIndex:
+    """Índice hash -> ocorrências de trechos inline entre templates.
+
+    Construído em uma única passada sobre as impressões digitais de cada
+    template, sem comparação par a par.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add(self, path: str, fingerprints: List[Tuple[str, str, int, int]]) -> None:
+        for kind, digest, size, line in fingerprints:
+            entry = self._entries.get((kind, digest))
+            if entry is None:
+                entry = {
+                    "kind": kind,
+                    "hash": digest,
+                    "bytes": size,
+                    "occurrences": 0,
+                    "total_bytes": 0,
+                    "files": set(),
+                    "locations": [],
+                }
+                self._entries[(kind, digest)] = entry
+            entry["occurrences"] += 1
+            entry["total_bytes"] += size
+            entry["files"].add(path)
+            if len(entry["locations"]) < MAX_DUPLICATE_LOCATIONS:
+                entry["locations"].append({"path": path, "line": line})
+
+    def report(self, min_files: int) -> List[DuplicateInlineAsset]:
+        """Lista os trechos presentes em ``min_files`` arquivos ou mais."""
+        duplicates = [
+            {**entry, "files": len(entry["files"])}
+            for entry in self._entries.values()
+            if len(entry["files"]) >= min_files
+        ]
+        # Maior custo total em bytes primeiro: maior ganho ao extrair
+        duplicates.sort(key=lambda d: (d["total_bytes"], d["files"]), reverse=True)
+        return cast(List[DuplicateInlineAsset], duplicates)
+
 
 class TemplatesAnalyzer(BaseAnalyzer):
     """Analisador de templates HTML.
@@ -31,6 +283,18 @@ class TemplatesAnalyzer(BaseAnalyzer):
         config (dict, optional): Configurações personalizadas
     """
 
+    READS_TEMPLATES = True
+
+    # Padrões para eventos JavaScript inline
+    EVENT_PATTERNS = (
+        r'onclick\s*=\s*["\']([^"\'>]+)["\']',
+        r'onchange\s*=\s*["\']([^"\'>]+)["\']',
+        r'onsubmit\s*=\s*["\']([^"\'>]+)["\']',
+        r'onload\s*=\s*["\']([^"\'>]+)["\']',
+        r'onmouseover\s*=\s*["\']([^"\'>]+)["\']',
+        r'onmouseout\s*=\s*["\']([^"\'>]+)["\']',
+    )
+
     def __init__(self, project_path: str, config: Optional[dict] = None):
         super().__init__(project_path, config)
         self.config = self.config or {}
@@ -46,9 +310,62 @@ class TemplatesAnalyzer(BaseAnalyzer):
         if not paths:
             paths = [self.project_path / Path(item) for item in DEFAULT_TEMPLATE_DIRS]
         self.templates_paths = [p for p in paths]
+        # Modo compacto: assets sem corpo, apenas posição, tamanho e hash
+        self.compact = bool(self.config.get("templates_compact", False))
+        # Templates gigantes (HTML gerado) são varridos em blocos de tamanho fixo
+        self.stream_threshold = int(
+            self.config.get("templates_stream_threshold", DEFAULT_STREAM_THRESHOLD)
+        )
+        self.chunk_size = max(
+            1, int(self.config.get("templates_chunk_size", DEFAULT_CHUNK_SIZE))
+        )
+        # Orçamento de compressão por template para estimar bytes gzip
+        self.gzip_sample_bytes = max(
+            0,
+            int(
+                self.config.get(
+                    "templates_gzip_sample_bytes", DEFAULT_GZIP_SAMPLE_BYTES
+                )
+            ),
+        )
+        # Número mínimo de arquivos para um trecho inline contar como duplicado
+        self.duplicate_min_files = max(
+            2,
+            int(
+                self.config.get(
+                    "templates_duplicate_min_files", DEFAULT_DUPLICATE_MIN_FILES
+                )
+            ),
+        )
 
         self.results: List[TemplateFileReport] = []
 
+    def effective_roots(self) -> List[Path]:
+        """Retorna os diretórios de templates canônicos e sem sobreposição.
+
+        Diretórios inexistentes, duplicados ou aninhados dentro de outro
+        diretório configurado são descartados, garantindo que cada template
+        seja analisado uma única vez.
+        """
+        resolved: List[Path] = []
+        for path in self.templates_paths:
+            if not path.is_dir():
+                continue
+            try:
+                canonical = path.resolve()
+            except OSError:
+                canonical = path.absolute()
+            if canonical not in resolved:
+                resolved.append(canonical)
+
+        roots: List[Path] = []
+        # Ordena dos mais rasos para os mais profundos (ordem estável)
+        for candidate in sorted(resolved, key=lambda p: len(p.parts)):
+            if any(root in candidate.parents for root in roots):
+                continue
+            roots.append(candidate)
+        return [p for p in resolved if p in roots]
+
     def _get_relative_path(
         self, file_path: Path, base_dir: Optional[Path] = None
     ) -> str:
@@ -80,19 +397,29 @@ class TemplatesAnalyzer(BaseAnalyzer):
         self, file_path: Path, base_dir: Optional[Path] = None
     ) -> TemplateFileReport:
         """Analisa um arquivo HTML em busca de CSS inline e JavaScript."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        return self._analyze_template(file_path, base_dir)[0]
 
-            # Remove comentários para análise mais limpa
-            content_clean = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
+    def _analyze_template(
+        self, file_path: Path, base_dir: Optional[Path] = None
+    ) -> Tuple[TemplateFileReport, _InlineCollector]:
+        collector = _InlineCollector(self.compact, self.gzip_sample_bytes)
+        try:
+            if self.streams(file_path):
+                self._scan_stream(file_path, collector)
+            else:
+                # Quebras de linha preservadas e BOM contabilizado: os offsets
+                # batem com o disco
+                source = self.read_source(file_path)
+                self._scan_region(
+                    source.text,
+                    _SourceIndex(source.text, byte_base=source.bom_bytes),
+                    collector,
+                )
 
             analysis: Dict[str, Any] = {
                 "file": self._get_relative_path(file_path, base_dir),
-                "css_inline": self._extract_css_inline(content_clean),
-                "css_style_tags": self._extract_style_tags(content_clean),
-                "js_inline": self._extract_js_inline(content_clean),
-                "js_script_tags": self._extract_script_tags(content_clean),
+                "path": self.relpath(file_path),
+                **collector.assets,
                 "total_css_chars": 0,
                 "total_js_chars": 0,
                 "recommendations": [],
@@ -102,17 +429,31 @@ class TemplatesAnalyzer(BaseAnalyzer):
 
             # Calcula totais
             analysis["total_css_chars"] = sum(
-                len(css["content"]) for css in analysis["css_inline"]
+                css["length"] for css in analysis["css_inline"]
             )
             analysis["total_css_chars"] += sum(
-                len(css["content"]) for css in analysis["css_style_tags"]
+                css["length"] for css in analysis["css_style_tags"]
             )
 
             analysis["total_js_chars"] = sum(
-                len(js["content"]) for js in analysis["js_inline"]
+                js["length"] for js in analysis["js_inline"]
             )
             analysis["total_js_chars"] += sum(
-                len(js["content"]) for js in analysis["js_script_tags"]
+                js["length"] for js in analysis["js_script_tags"]
+            )
+
+            # Peso estimado na rede (bytes brutos e comprimidos com gzip)
+            analysis["css_bytes"] = collector.css_wire.raw_bytes
+            analysis["js_bytes"] = collector.js_wire.raw_bytes
+            analysis["css_gzip_bytes"] = collector.css_wire.estimate()
+            analysis["js_gzip_bytes"] = collector.js_wire.estimate()
+            analysis["wire_bytes"] = (
+                analysis["css_gzip_bytes"] + analysis["js_gzip_bytes"]
+            )
+            analysis["render_blocking_scripts"] = sum(
+                1
+                for script in analysis["js_script_tags"]
+                if script.get("render_blocking")
             )
 
             # Gera recomendações
@@ -122,32 +463,93 @@ class TemplatesAnalyzer(BaseAnalyzer):
             total_chars = analysis["total_css_chars"] + analysis["total_js_chars"]
             if total_chars > 20000:
                 analysis["priority"] = "high"
-            elif total_chars > 10000:
+            elif total_chars > 10000 or analysis["render_blocking_scripts"]:
                 analysis["priority"] = "medium"
 
             # Adiciona campos para compatibilidade com o viewer
             analysis["css"] = analysis["total_css_chars"]
             analysis["js"] = analysis["total_js_chars"]
 
-            return cast(TemplateFileReport, analysis)
+            return cast(TemplateFileReport, analysis), collector
 
         except Exception as e:
             logger.warning("Erro ao analisar %s: %s", file_path, e)
             relative_file = self._get_relative_path(file_path, base_dir)
-            return {
+            empty: TemplateFileReport = {
                 "file": relative_file,
+                "path": self.relpath(file_path),
                 "css_inline": [],
                 "css_style_tags": [],
                 "js_inline": [],
                 "js_script_tags": [],
                 "total_css_chars": 0,
                 "total_js_chars": 0,
+                "css_bytes": 0,
+                "js_bytes": 0,
+                "css_gzip_bytes": 0,
+                "js_gzip_bytes": 0,
+                "wire_bytes": 0,
+                "render_blocking_scripts": 0,
                 "css": 0,
                 "js": 0,
                 "recommendations": [],
                 "priority": "low",
                 "category": "Template",
             }
+            return empty, _InlineCollector(self.compact, self.gzip_sample_bytes)
+
+    def streams(self, file_path: Path) -> bool:
+        """Indica se o template é varrido em blocos, sem ser lido inteiro."""
+        return file_path.stat().st_size > self.stream_threshold
+
+    def _scan_region(
+        self, content: str, index: _SourceIndex, collector: _InlineCollector
+    ) -> None:
+        """Extrai os assets inline de um trecho de HTML."""
+        # Apaga comentários mantendo linhas e offsets originais
+        content_clean = _blank_comments(content)
+        self._extract_css_inline(content_clean, index, collector)
+        self._extract_style_tags(content_clean, index, collector)
+        self._extract_js_inline(content_clean, index, collector)
+        self._extract_script_tags(content_clean, index, collector)
+
+    def _scan_stream(self, file_path: Path, collector: _InlineCollector) -> None:
+        """Varre um template gigante em blocos de ``chunk_size`` caracteres.
+
+        Tags que atravessam a fronteira entre blocos são carregadas para o
+        bloco seguinte, de modo que contagens, linhas e offsets coincidem com
+        a varredura do arquivo inteiro. A memória fica limitada ao tamanho do
+        bloco somado ao maior trecho inline ainda aberto.
+        """
+        line_base = 1
+        carry = ""
+        with open(file_path, "rb") as raw:
+            # Mesma decodificação de read_text_source: BOM fora do texto
+            byte_base = len(BOM_UTF8) if raw.read(len(BOM_UTF8)) == BOM_UTF8 else 0
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as fh:
+            while True:
+                # Se o carry-over cresceu, lê mais de uma vez para não reprocessar
+                chunk = fh.read(max(self.chunk_size, len(carry)))
+                buffer = carry + chunk
+                if not buffer:
+                    break
+                cut = len(buffer) if not chunk else _safe_cut(_blank_comments(buffer))
+                region = buffer[:cut]
+                carry = buffer[cut:]
+                if region:
+                    self._scan_region(
+                        region, _SourceIndex(region, line_base, byte_base), collector
+                    )
+                    line_base += region.count("\n")
+                    byte_base += len(region.encode("utf-8"))
+                if not chunk:
+                    break
+
+        # Mantém a mesma ordem da varredura completa (por evento, depois posição)
+        order = {name: idx for idx, name in enumerate(self._event_names())}
+        collector.assets["js_inline"].sort(
+            key=lambda item: order.get(item.get("event", ""), 0)
+        )
 
     def _categorize_template(self, file_path: Path) -> str:
         """Categoriza o template baseado no seu nome e caminho."""
@@ -171,92 +573,116 @@ class TemplatesAnalyzer(BaseAnalyzer):
         else:
             return "Template"
 
-    def _extract_css_inline(self, content: str) -> List[InlineAsset]:
+    def _extract_css_inline(
+        self, content: str, index: _SourceIndex, collector: _InlineCollector
+    ) -> None:
         """Extrai CSS inline dos atributos style."""
-        css_inline = []
         style_pattern = r'style\s*=\s*["\']([^"\'>]+)["\']'
 
         for match in re.finditer(style_pattern, content, re.IGNORECASE):
             css_content = match.group(1)
             if css_content.strip():
-                line_num = content[: match.start()].count("\n") + 1
-                css_inline.append(
-                    {
-                        "line": line_num,
-                        "content": css_content,
-                        "length": len(css_content),
-                    }
+                collector.add(
+                    "css_inline", index, match.start(), match.start(1), css_content
                 )
 
-        return cast(List[InlineAsset], css_inline)
-
-    def _extract_style_tags(self, content: str) -> List[InlineAsset]:
+    def _extract_style_tags(
+        self, content: str, index: _SourceIndex, collector: _InlineCollector
+    ) -> None:
         """Extrai conteúdo de tags <style>."""
-        style_tags = []
         style_pattern = r"<style[^>]*>([\s\S]*?)</style>"
 
         for match in re.finditer(style_pattern, content, re.IGNORECASE):
-            css_content = match.group(1).strip()
+            raw = match.group(1)
+            css_content = raw.strip()
             if css_content:
-                line_num = content[: match.start()].count("\n") + 1
-                style_tags.append(
-                    {
-                        "line": line_num,
-                        "content": css_content,
-                        "length": len(css_content),
-                    }
+                start = match.start(1) + len(raw) - len(raw.lstrip())
+                collector.add(
+                    "css_style_tags", index, match.start(), start, css_content
                 )
 
-        return cast(List[InlineAsset], style_tags)
-
-    def _extract_js_inline(self, content: str) -> List[InlineAsset]:
+    def _extract_js_inline(
+        self, content: str, index: _SourceIndex, collector: _InlineCollector
+    ) -> None:
         """Extrai JavaScript inline dos atributos de eventos."""
-        js_inline = []
-
-        # Padrões para eventos JavaScript inline
-        event_patterns = [
-            r'onclick\s*=\s*["\']([^"\'>]+)["\']',
-            r'onchange\s*=\s*["\']([^"\'>]+)["\']',
-            r'onsubmit\s*=\s*["\']([^"\'>]+)["\']',
-            r'onload\s*=\s*["\']([^"\'>]+)["\']',
-            r'onmouseover\s*=\s*["\']([^"\'>]+)["\']',
-            r'onmouseout\s*=\s*["\']([^"\'>]+)["\']',
-        ]
-
-        for pattern in event_patterns:
+        for pattern in self.EVENT_PATTERNS:
             for match in re.finditer(pattern, content, re.IGNORECASE):
                 js_content = match.group(1)
                 if js_content.strip():
-                    line_num = content[: match.start()].count("\n") + 1
-                    js_inline.append(
-                        {
-                            "line": line_num,
-                            "content": js_content,
-                            "length": len(js_content),
-                            "event": pattern.split("\\")[0],
-                        }
+                    collector.add(
+                        "js_inline",
+                        index,
+                        match.start(),
+                        match.start(1),
+                        js_content,
+                        event=self._event_name(pattern),
                     )
 
-        return cast(List[InlineAsset], js_inline)
+    @staticmethod
+    def _event_name(pattern: str) -> str:
+        return pattern.split("\\")[0]
+
+    @classmethod
+    def _event_names(cls) -> List[str]:
+        return [cls._event_name(pattern) for pattern in cls.EVENT_PATTERNS]
 
-    def _extract_script_tags(self, content: str) -> List[InlineAsset]:
-        """Extrai conteúdo de tags <script>."""
-        script_tags = []
-        script_pattern = r"<script(?![^>]*src\s*=)[^>]*>([\s\S]*?)</script>"
+    def _extract_script_tags(
+        self, content: str, index: _SourceIndex, collector: _InlineCollector
+    ) -> None:
+        """Extrai conteúdo de tags <script>.
+
+        Scripts dentro do ``<head>`` sem ``async``/``defer`` são marcados com
+        ``render_blocking``.
+        """
+        script_pattern = r"<script(?![^>]*src\s*=)([^>]*)>([\s\S]*?)</script>"
+        head_start, head_end = collector.head_bounds(content)
 
         for match in re.finditer(script_pattern, content, re.IGNORECASE):
-            js_content = match.group(1).strip()
+            raw = match.group(2)
+            js_content = raw.strip()
             if js_content:
-                line_num = content[: match.start()].count("\n") + 1
-                script_tags.append(
-                    {
-                        "line": line_num,
-                        "content": js_content,
-                        "length": len(js_content),
-                    }
+                start = match.start(2) + len(raw) - len(raw.lstrip())
+                blocking = head_start <= match.start() < head_end and not (
+                    _NON_BLOCKING_SCRIPT.search(match.group(1))
+                )
+                collector.add(
+                    "js_script_tags",
+                    index,
+                    match.start(),
+                    start,
+                    js_content,
+                    render_blocking=blocking,
                 )
 
-        return cast(List[InlineAsset], script_tags)
+    def load_snippet(self, path: Union[str, Path], asset: InlineAsset) -> Optional[str]:
+        """Carrega do disco o corpo de um asset gerado no modo compacto.
+
+        Args:
+            path: Caminho do template (``path`` do relatório, relativo ao projeto)
+            asset: Asset compacto contendo ``offset``, ``length`` e ``hash``
+
+        Returns:
+            str ou None: Conteúdo do trecho, ou None se o arquivo mudou
+        """
+        if "content" in asset:
+            return asset["content"]
+        file_path = Path(path)
+        if not file_path.is_absolute():
+            file_path = self.project_path / file_path
+        length = asset.get("length", 0)
+        try:
+            with open(file_path, "rb") as fh:
+                fh.seek(asset.get("offset", 0))
+                # Um caractere UTF-8 ocupa no máximo 4 bytes
+                raw = fh.read(length * 4)
+        except OSError as exc:
+            logger.warning("Falha ao ler trecho de %s: %s", file_path, exc)
+            return None
+        text = raw.decode("utf-8", errors="ignore")[:length]
+        if snippet_hash(text) != asset.get("hash"):
+            logger.warning("Trecho desatualizado em %s (arquivo alterado)", file_path)
+            return None
+        return text
 
     def _generate_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
         """Gera recomendações baseadas na análise."""
@@ -296,12 +722,51 @@ class TemplatesAnalyzer(BaseAnalyzer):
                 "⚡ Muitos eventos JavaScript inline - Considere usar event listeners"
             )
 
+        # Recomendações de peso na rede
+        blocking = analysis.get("render_blocking_scripts", 0)
+        if blocking:
+            recommendations.append(
+                f"⏱️ {blocking} <script> inline no <head> bloqueando a renderização - Mover para o fim do <body> ou usar arquivo externo com defer"
+            )
+        wire = analysis.get("wire_bytes", 0)
+        if wire > 4096:
+            recommendations.append(
+                f"📦 ~{wire} bytes (gzip) de CSS/JS inline por página - Arquivos externos seriam cacheados"
+            )
+
         return recommendations
 
     def _should_skip_file(self, file_path: Path) -> bool:
         """Compatibilidade retroativa; delega para BaseAnalyzer."""
         return self.should_skip(file_path)
 
+    def template_files(
+        self, roots: Optional[List[Path]] = None
+    ) -> List[Tuple[Path, Path]]:
+        """Pares ``(diretório raiz, template)`` a analisar, sem repetições."""
+        files: List[Tuple[Path, Path]] = []
+        seen: Set[Path] = set()
+        for base in self.effective_roots() if roots is None else roots:
+            for html_file in base.rglob("*.html"):
+                if self._should_skip_file(html_file):
+                    continue
+                # Links simbólicos podem apontar para o mesmo arquivo
+                try:
+                    key = html_file.resolve()
+                except OSError:
+                    key = html_file
+                if key in seen:
+                    continue
+                seen.add(key)
+                files.append((base, html_file))
+        return files
+
+    def inventory(self) -> List[Path]:
+        # Os diretórios entram para detectar a criação de um deles
+        return list(self.templates_paths) + [
+            html_file for _, html_file in self.template_files()
+        ]
+
     def analyze(self) -> TemplatesReport:
         """Executa a análise completa de templates.
 
@@ -310,23 +775,31 @@ class TemplatesAnalyzer(BaseAnalyzer):
         """
         results = []
 
-        existing_paths = [p for p in self.templates_paths if p.exists()]
+        existing_paths = self.effective_roots()
         if not existing_paths:
             # Nenhum diretório encontrado – retorna relatório vazio silenciosamente
+            self.start_run()
             return self._empty_report()
 
-        # Processa todos os arquivos HTML em todos os diretórios existentes
-        for base in existing_paths:
-            for html_file in base.rglob("*.html"):
-                if self._should_skip_file(html_file):
-                    continue
-                analysis = self.analyze_file(html_file, base)
-                if analysis["total_css_chars"] > 0 or analysis["total_js_chars"] > 0:
-                    results.append(analysis)
+        # Processa todos os arquivos HTML em todos os diretórios efetivos
+        duplicates = _DuplicateIndex()
+        files = self.template_files(existing_paths)
+        self.start_run(len(files))
+        for base, html_file in files:
+            if self.out_of_time(html_file):
+                continue
+            analysis, collector = self._analyze_template(html_file, base)
+            duplicates.add(analysis["path"], collector.fingerprints)
+            if analysis["total_css_chars"] > 0 or analysis["total_js_chars"] > 0:
+                results.append(analysis)
 
-        # Ordena por total de caracteres (CSS + JS)
+        # Ordena pelo peso estimado na rede e depois pelo total de caracteres
         results.sort(
-            key=lambda x: x["total_css_chars"] + x["total_js_chars"], reverse=True
+            key=lambda x: (
+                x.get("wire_bytes", 0),
+                x["total_css_chars"] + x["total_js_chars"],
+            ),
+            reverse=True,
         )
 
         # Gera estatísticas
@@ -338,6 +811,11 @@ class TemplatesAnalyzer(BaseAnalyzer):
             "medium_priority": len([r for r in results if r["priority"] == "medium"]),
             "templates_with_css": len([r for r in results if r["total_css_chars"] > 0]),
             "templates_with_js": len([r for r in results if r["total_js_chars"] > 0]),
+            "total_css_gzip_bytes": sum(r.get("css_gzip_bytes", 0) for r in results),
+            "total_js_gzip_bytes": sum(r.get("js_gzip_bytes", 0) for r in results),
+            "render_blocking_scripts": sum(
+                r.get("render_blocking_scripts", 0) for r in results
+            ),
         }
 
         return cast(
@@ -347,20 +825,26 @@ class TemplatesAnalyzer(BaseAnalyzer):
                     "generated_at": datetime.now().isoformat(),
                     "templates_paths": [str(p) for p in existing_paths],
                     "total_templates": stats["total_templates"],
+                    "compact": self.compact,
+                    **self.completeness_metadata(),
                 },
                 "templates": results,
                 "statistics": cast(TemplateStatistics, stats),
+                "duplicates": duplicates.report(self.duplicate_min_files),
             },
         )
 
     def _empty_report(self) -> TemplatesReport:
         """Retorna um relatório vazio."""
+        metadata: ReportMetadata = {
+            "generated_at": datetime.now().isoformat(),
+            "templates_paths": [],
+            "total_templates": 0,
+            "compact": self.compact,
+        }
+        metadata.update(self.completeness_metadata())
         return {
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "templates_paths": [],
-                "total_templates": 0,
-            },
+            "metadata": metadata,
             "templates": [],
             "statistics": {
                 "total_templates": 0,
@@ -370,7 +854,11 @@ class TemplatesAnalyzer(BaseAnalyzer):
                 "medium_priority": 0,
                 "templates_with_css": 0,
                 "templates_with_js": 0,
+                "total_css_gzip_bytes": 0,
+                "total_js_gzip_bytes": 0,
+                "render_blocking_scripts": 0,
             },
+            "duplicates": [],
         }
 
     def save_report(self, report: Dict, output_file: str):
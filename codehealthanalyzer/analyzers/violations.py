@@ -12,6 +12,7 @@ from typing import Any, Dict, Iterable, List, Tuple, cast
 
 from ..schemas import ViolationFileReport, ViolationsReport, ViolationStatistics
 from .base import BaseAnalyzer
+from .sources import PythonArtifact
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,7 @@ class ViolationsAnalyzer(BaseAnalyzer):
 
     PYTHON_PATTERNS: Tuple[str, ...] = ("*.py",)
     TEMPLATE_PATTERNS: Tuple[str, ...] = ("*.html",)
+    READS_TEMPLATES = True
 
     def __init__(self, project_path: str, config: dict | None = None) -> None:
         super().__init__(project_path, config)
@@ -117,21 +119,16 @@ class ViolationsAnalyzer(BaseAnalyzer):
             lines.update(range(start, end + 1))
         return lines
 
-    def _effective_python_lines(self, file_path: Path, tree: ast.AST) -> int:
-        doc_lines = self._python_docstring_lines(tree)
+    def _effective_python_lines(self, artifact: PythonArtifact) -> int:
+        doc_lines = self._python_docstring_lines(artifact.tree)
         count = 0
-        try:
-            with open(file_path, "r", encoding="utf-8-sig") as fh:
-                for idx, raw in enumerate(fh, 1):
-                    stripped = raw.strip()
-                    if not stripped or stripped.startswith("#"):
-                        continue
-                    if idx in doc_lines:
-                        continue
-                    count += 1
-        except OSError as exc:
-            logger.warning("Falha ao ler %s: %s", file_path, exc)
-            return 0
+        for idx, raw in enumerate(artifact.lines, 1):
+            stripped = raw.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if idx in doc_lines:
+                continue
+            count += 1
         return count
 
     def _gather_functions(self, tree: ast.AST) -> List[_FunctionInfo]:
@@ -150,9 +147,12 @@ class ViolationsAnalyzer(BaseAnalyzer):
 
     def _count_html_lines(self, file_path: Path) -> int:
         try:
+            if self.sources is not None and self.sources.shares(file_path):
+                return self.sources.get(file_path).nonblank_lines()
+            # Fora do cache, lê linha a linha com a mesma decodificação
             with open(file_path, "r", encoding="utf-8-sig") as fh:
                 return sum(1 for line in fh if line.strip())
-        except OSError as exc:
+        except (OSError, UnicodeDecodeError) as exc:
             logger.warning("Falha ao ler template %s: %s", file_path, exc)
             return 0
 
@@ -192,16 +192,18 @@ class ViolationsAnalyzer(BaseAnalyzer):
         if file_path.suffix == ".py":
             result["type"] = "Python"
             try:
-                with open(file_path, "r", encoding="utf-8-sig") as fh:
-                    source = fh.read()
-                tree = ast.parse(source, filename=str(file_path))
-            except (OSError, SyntaxError) as exc:
+                artifact = self.python_artifact(file_path)
+                tree = artifact.tree
+            except (OSError, UnicodeDecodeError, SyntaxError) as exc:
                 logger.warning("Falha ao analisar %s: %s", file_path, exc)
                 result["violations"].append(f"Falha ao analisar AST: {exc}")
                 result["priority"] = "medium"
                 return cast(ViolationFileReport, result)
+            if self.artifacts is not None:
+                # A AST recém-calculada passa a contar no orçamento do cache
+                self.artifacts.touch(file_path)
 
-            module_lines = self._effective_python_lines(file_path, tree)
+            module_lines = self._effective_python_lines(artifact)
             result["lines"] = module_lines
 
             for info in self._gather_functions(tree):
@@ -227,28 +229,60 @@ class ViolationsAnalyzer(BaseAnalyzer):
     # Execução geral
     # -------------------------------------------------------------------------
 
+    def python_files(self) -> List[Path]:
+        """Inventário de arquivos Python analisados (sem os excluídos).
+
+        Pode ser repassado a ``ErrorsAnalyzer.analyze(files=...)`` para que o
+        Ruff examine exatamente os mesmos arquivos.
+        """
+        return [
+            py_file
+            for py_file in self.iter_files(self.PYTHON_PATTERNS)
+            if not self.should_skip(py_file)
+        ]
+
+    def html_files(self) -> List[Path]:
+        """Inventário de templates HTML analisados (sem os excluídos)."""
+        return [
+            html_file
+            for html_file in self.iter_files(self.TEMPLATE_PATTERNS)
+            if not self.should_skip(html_file)
+        ]
+
+    def inventory(self) -> List[Path]:
+        return self.python_files() + self.html_files()
+
     def analyze(self) -> ViolationsReport:
-        """Executa a análise completa de violações."""
+        """Executa a análise completa de violações.
+
+        Sem um ``artifacts`` compartilhado, usa um :class:`ArtifactCache`
+        próprio, descartado ao fim da execução.
+        """
+        artifacts = self.artifacts
+        owns_cache = artifacts is None
+        if artifacts is None:
+            artifacts = self.artifacts = self.new_artifact_cache()
+        try:
+            report = self._analyze()
+        finally:
+            if owns_cache:
+                self.artifacts = None
+        report["metadata"]["artifact_cache"] = artifacts.stats()
+        if owns_cache:
+            artifacts.clear()
+        return report
+
+    def _analyze(self) -> ViolationsReport:
         all_results: List[ViolationFileReport] = []
         violations: List[ViolationFileReport] = []
         warnings: List[ViolationFileReport] = []
 
-        for py_file in self.iter_files(self.PYTHON_PATTERNS):
-            if self.should_skip(py_file):
-                continue
-            result = self.check_file(py_file)
-            all_results.append(result)
-
-            if result["violations"]:
-                if result["priority"] == "high":
-                    violations.append(result)
-                else:
-                    warnings.append(result)
-
-        for html_file in self.iter_files(self.TEMPLATE_PATTERNS):
-            if self.should_skip(html_file):
+        files = self.python_files() + self.html_files()
+        self.start_run(len(files))
+        for file_path in files:
+            if self.out_of_time(file_path):
                 continue
-            result = self.check_file(html_file)
+            result = self.check_file(file_path)
             all_results.append(result)
 
             if result["violations"]:
@@ -280,6 +314,7 @@ class ViolationsAnalyzer(BaseAnalyzer):
                     "total_files": stats["total_files"],
                     "violation_files": stats["violation_files"],
                     "warning_files": stats["warning_files"],
+                    **self.completeness_metadata(),
                 },
                 "violations": violations,
                 "warnings": warnings,
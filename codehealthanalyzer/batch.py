@@ -0,0 +1,293 @@
+"""Análise de vários projetos em um único processo.
+
+Em vez de um ``cha analyze`` por repositório (cada um pagando a
+inicialização do interpretador, os imports e a criação de pools), o
+:func:`analyze_many` analisa todos os projetos com um único pool de workers:
+as tarefas de todos os analisadores de todos os projetos entram na mesma
+fila, então enquanto o Ruff de um projeto roda em subprocesso os workers
+seguem com os analisadores Python dos demais. O cache de AST
+(:class:`ArtifactCache`) também é único, com um só orçamento de memória.
+
+O manifesto é um arquivo JSON ou uma lista de caminhos, um por linha::
+
+    {"config": {"ruff_jobs": 1},
+     "projects": ["svc-a", {"path": "svc-b", "name": "b", "config": {...}}]}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .analyzers.errors import MAX_AUTO_RUFF_JOBS
+from .analyzers.sources import DEFAULT_ARTIFACT_CACHE_BYTES, ArtifactCache
+from .config import normalize_config
+from .exceptions import CodeHealthAnalyzerError, ConfigurationError
+from .schemas import BatchIndex, BatchProjectEntry, FullReport
+from .utils.helpers import FileHelper
+from .version import __version__
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+
+
+@dataclass(frozen=True)
+class BatchProject:
+    """Projeto de um lote.
+
+    Attributes:
+        path: Raiz do projeto.
+        name: Nome no índice e subdiretório do relatório.
+        config: Configuração própria, aplicada sobre a do lote.
+    """
+
+    path: Path
+    name: str = ""
+    config: Dict[str, Any] = field(default_factory=dict)
+
+
+def _project_entry(value: Any, base: Path) -> BatchProject:
+    if isinstance(value, BatchProject):
+        return value
+    if isinstance(value, (str, Path)):
+        value = {"path": value}
+    if not isinstance(value, dict) or not value.get("path"):
+        raise ConfigurationError(f"Projeto inválido no manifesto: {value!r}")
+    config = value.get("config") or {}
+    if not isinstance(config, dict):
+        raise ConfigurationError(
+            f"'config' do projeto {value['path']} deve ser um objeto"
+        )
+    path = Path(value["path"]).expanduser()
+    return BatchProject(
+        path if path.is_absolute() else base / path,
+        str(value.get("name") or ""),
+        config,
+    )
+
+
+def load_manifest(
+    manifest: Union[str, Path],
+) -> Tuple[List[BatchProject], Dict[str, Any]]:
+    """Lê o manifesto de um lote.
+
+    Caminhos relativos são resolvidos a partir do diretório do manifesto.
+
+    Returns:
+        Os projetos e a configuração comum do lote.
+
+    Raises:
+        ConfigurationError: Se o manifesto não puder ser lido ou for inválido.
+    """
+    manifest = Path(manifest)
+    try:
+        text = manifest.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        raise ConfigurationError(f"Não foi possível ler o manifesto: {exc}") from exc
+    base = manifest.parent
+    if manifest.suffix.lower() == ".json":
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ConfigurationError(f"Manifesto JSON inválido: {exc}") from exc
+        if isinstance(data, list):
+            data = {"projects": data}
+        if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+            raise ConfigurationError("O manifesto deve ter uma lista 'projects'")
+        config = data.get("config") or {}
+        if not isinstance(config, dict):
+            raise ConfigurationError("'config' do manifesto deve ser um objeto")
+        return [_project_entry(item, base) for item in data["projects"]], config
+    entries = [line.split("#", 1)[0].strip() for line in text.splitlines()]
+    return [_project_entry(entry, base) for entry in entries if entry], {}
+
+
+def _unique_names(projects: Sequence[BatchProject]) -> List[str]:
+    """Nomes de diretório únicos (``svc``, ``svc-2``...) para os relatórios."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for project in projects:
+        name = project.name or project.path.resolve().name or "project"
+        name = re.sub(r"[^\w.-]+", "_", name).strip(".") or "project"
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        names.append(name if count == 1 else f"{name}-{count}")
+    return names
+
+
+def _ruff_jobs_per_project(common: Dict[str, Any], concurrent: int) -> int:
+    """Parte de cada projeto no orçamento de processos Ruff do lote.
+
+    ``ruff_jobs`` (ou o automático, como no ``ErrorsAnalyzer``) vale para o
+    lote inteiro: com ``concurrent`` projetos em andamento, cada um roda no
+    máximo ``ruff_jobs // concurrent`` processos.
+    """
+    budget = int(common.get("ruff_jobs", 0) or 0)
+    if budget <= 0:
+        budget = min(os.cpu_count() or 1, MAX_AUTO_RUFF_JOBS)
+    return max(1, budget // max(1, concurrent))
+
+
+def _analyze_project(
+    project: BatchProject,
+    name: str,
+    config: Dict[str, Any],
+    output_dir: Optional[Path],
+    executor: Executor,
+    artifacts: ArtifactCache,
+    analyzers: Optional[Sequence[str]],
+    skip: Optional[Sequence[str]],
+    time_budget: Optional[float],
+    save_reports: bool,
+    on_report: Optional[Callable[[BatchProjectEntry, FullReport], None]],
+) -> BatchProjectEntry:
+    from . import CodeAnalyzer
+
+    started = time.perf_counter()
+    entry: BatchProjectEntry = {"name": name, "path": str(project.path)}
+    report_dir = output_dir / name if output_dir is not None else None
+    try:
+        if not project.path.is_dir():
+            raise ConfigurationError(f"Diretório não encontrado: {project.path}")
+        analyzer = CodeAnalyzer(
+            str(project.path), {**config, **project.config}, analyzers, skip
+        )
+        report = analyzer.generate_full_report(
+            output_dir=str(report_dir) if report_dir and save_reports else None,
+            time_budget=time_budget,
+            executor=executor,
+            artifacts=artifacts,
+        )
+    except (CodeHealthAnalyzerError, OSError) as exc:
+        logger.warning("Falha ao analisar %s: %s", project.path, exc)
+        entry["status"] = "error"
+        entry["error"] = str(exc)
+    except Exception as exc:  # um projeto com falha não interrompe o lote
+        logger.exception("Falha inesperada ao analisar %s", project.path)
+        entry["status"] = "error"
+        entry["error"] = str(exc)
+    else:
+        entry["status"] = "ok"
+        entry["summary"] = report["summary"]
+        if report_dir is not None:
+            entry["report_dir"] = name
+        if on_report is not None:
+            on_report(entry, report)
+    entry["elapsed"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def analyze_many(
+    projects: Iterable[Union[str, Path, BatchProject]],
+    output_dir: Optional[Union[str, Path]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    jobs: Optional[int] = None,
+    analyzers: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    time_budget: Optional[float] = None,
+    save_reports: bool = True,
+    on_report: Optional[Callable[[BatchProjectEntry, FullReport], None]] = None,
+) -> BatchIndex:
+    """Analisa vários projetos compartilhando workers e caches.
+
+    Args:
+        projects: Raízes dos projetos (ou :class:`BatchProject`).
+        output_dir: Diretório de saída: um subdiretório por projeto com o
+            ``full_report.json`` e o índice agregado em ``index.json``.
+        config: Configuração comum, sobreposta pela de cada projeto.
+        jobs: Workers do pool compartilhado (padrão: número de CPUs).
+        analyzers: Analisadores a executar (padrão: todos).
+        skip: Analisadores a omitir.
+        time_budget: Prazo em segundos por projeto.
+        save_reports: Grava o ``full_report.json`` de cada projeto em
+            ``output_dir/<nome>``.
+        on_report: Chamado com a entrada do índice e o relatório de cada
+            projeto assim que ele termina; os relatórios não são retidos.
+
+    Returns:
+        dict: Índice agregado, com o resumo de cada projeto na ordem dada.
+        Falhas de um projeto entram no índice com ``status: "error"`` sem
+        interromper os demais.
+    """
+    started = time.perf_counter()
+    batch = [_project_entry(project, Path.cwd()) for project in projects]
+    names = _unique_names(batch)
+    common = normalize_config(config)
+    workers = max(1, jobs or os.cpu_count() or 1)
+    # Até workers + 1 projetos simultâneos dividem o orçamento do Ruff
+    common["ruff_jobs"] = _ruff_jobs_per_project(common, min(len(batch), workers + 1))
+    out = Path(output_dir) if output_dir is not None else None
+    artifacts = ArtifactCache(
+        int(common.get("artifact_cache_bytes", DEFAULT_ARTIFACT_CACHE_BYTES))
+    )
+
+    # Projetos em andamento só esperam seus analisadores; com alguns a mais
+    # que o número de workers a fila do pool compartilhado nunca esvazia
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="cha-batch"
+    ) as executor, ThreadPoolExecutor(
+        max_workers=workers + 1, thread_name_prefix="cha-project"
+    ) as projects_pool:
+        futures = [
+            projects_pool.submit(
+                _analyze_project,
+                project,
+                name,
+                common,
+                out,
+                executor,
+                artifacts,
+                analyzers,
+                skip,
+                time_budget,
+                save_reports,
+                on_report,
+            )
+            for project, name in zip(batch, names)
+        ]
+        entries = [future.result() for future in futures]
+    artifacts.clear()
+
+    scores = [
+        entry["summary"].get("quality_score", 0)
+        for entry in entries
+        if entry["status"] == "ok"
+    ]
+    index: BatchIndex = {
+        "generated_at": datetime.now().isoformat(),
+        "version": __version__,
+        "jobs": workers,
+        "elapsed": round(time.perf_counter() - started, 4),
+        "total_projects": len(entries),
+        "failed_projects": len(entries) - len(scores),
+        "average_quality_score": (
+            round(sum(scores) / len(scores), 2) if scores else None
+        ),
+        "projects": entries,
+    }
+    if out is not None:
+        out.mkdir(parents=True, exist_ok=True)
+        FileHelper.write_json(dict(index), out / INDEX_FILE)
+    return index
+
+
+__all__ = ["BatchProject", "INDEX_FILE", "analyze_many", "load_manifest"]
@@ -16,15 +16,33 @@ import click
 
 from .. import CodeAnalyzer, __version__
 from ..analyzers.errors import ErrorsAnalyzer
+from ..analyzers.registry import empty_report
 from ..analyzers.templates import TemplatesAnalyzer
 from ..analyzers.violations import ViolationsAnalyzer
+from ..batch import INDEX_FILE, analyze_many, load_manifest
 from ..config import normalize_config
-from ..exceptions import ConfigurationError
+from ..daemon import (
+    AnalysisDaemon,
+    DaemonClient,
+    default_socket_path,
+    project_request,
+    request_if_running,
+)
+from ..exceptions import AnalyzerExecutionError, ConfigurationError
 from ..reports.formatter import ReportFormatter
 from ..reports.generator import ReportGenerator
-from ..schemas import ErrorsReport, FullReport, TemplatesReport, ViolationsReport
+from ..schemas import (
+    BatchProjectEntry,
+    ErrorsReport,
+    FullReport,
+    SampledQualityScore,
+    TemplatesReport,
+    ViolationsReport,
+    WatchDelta,
+)
 from ..utils.helpers import ColorHelper
 from ..utils.validators import PathValidator
+from ..watch import DEFAULT_INTERVAL, WatchEngine
 
 _LOG_FORMAT = "%(levelname)s:%(name)s:%(message)s"
 
@@ -53,73 +71,16 @@ def _load_config(
     return normalize_config(config_data)
 
 
-def _empty_violations_report() -> ViolationsReport:
-    return {
-        "metadata": {
-            "generated_at": "",
-            "directory": "",
-            "total_files": 0,
-            "violation_files": 0,
-            "warning_files": 0,
-        },
-        "violations": [],
-        "warnings": [],
-        "statistics": {
-            "total_files": 0,
-            "violation_files": 0,
-            "warning_files": 0,
-            "high_priority": 0,
-            "medium_priority": 0,
-            "python_files": 0,
-            "html_files": 0,
-        },
-    }
-
-
-def _empty_templates_report() -> TemplatesReport:
-    return {
-        "metadata": {"generated_at": "", "templates_paths": [], "total_templates": 0},
-        "templates": [],
-        "statistics": {
-            "total_templates": 0,
-            "total_css_chars": 0,
-            "total_js_chars": 0,
-            "high_priority": 0,
-            "medium_priority": 0,
-            "templates_with_css": 0,
-            "templates_with_js": 0,
-        },
-    }
-
-
-def _empty_errors_report() -> ErrorsReport:
-    return {
-        "metadata": {"generated_at": "", "total_errors": 0, "total_files": 0},
-        "errors": [],
-        "statistics": {
-            "high_priority": 0,
-            "medium_priority": 0,
-            "low_priority": 0,
-            "syntax_errors": 0,
-            "style_errors": 0,
-            "critical_errors": 0,
-        },
-    }
-
-
 def _wrap_single_report(kind: str, report: Any) -> FullReport:
     generator = ReportGenerator()
-    violations = (
-        cast(ViolationsReport, report)
-        if kind == "violations"
-        else _empty_violations_report()
+    violations = cast(
+        ViolationsReport,
+        report if kind == "violations" else empty_report("violations"),
     )
-    templates = (
-        cast(TemplatesReport, report)
-        if kind == "templates"
-        else _empty_templates_report()
+    templates = cast(
+        TemplatesReport, report if kind == "templates" else empty_report("templates")
     )
-    errors = cast(ErrorsReport, report) if kind == "errors" else _empty_errors_report()
+    errors = cast(ErrorsReport, report if kind == "errors" else empty_report("errors"))
     return generator.generate_full_report(violations, templates, errors)
 
 
@@ -234,6 +195,8 @@ def _standardize_templates(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
                 "category": item.get("category", ""),
                 "total_css_chars": item.get("total_css_chars", item.get("css", 0)),
                 "total_js_chars": item.get("total_js_chars", item.get("js", 0)),
+                "wire_bytes": item.get("wire_bytes", 0),
+                "render_blocking_scripts": item.get("render_blocking_scripts", 0),
                 "css_inline_count": len(item.get("css_inline", []) or []),
                 "css_style_tags_count": len(item.get("css_style_tags", []) or []),
                 "js_inline_count": len(item.get("js_inline", []) or []),
@@ -285,6 +248,7 @@ def _build_standard_report(report: FullReport) -> dict[str, Any]:
             "metadata": templates.get("metadata", {}),
             "statistics": templates.get("statistics", {}),
             "templates": _standardize_templates(template_items),
+            "duplicates": (templates.get("duplicates", []) or [])[:10],
         },
         "errors": {
             "metadata": errors.get("metadata", {}),
@@ -342,6 +306,24 @@ def cli():
     is_flag=True,
     help="Não aplicar exclusões padrão (tests, scripts, reports, venv, etc.)",
 )
+@click.option(
+    "--only",
+    multiple=True,
+    help="Executa apenas estes analisadores (ex.: --only violations,errors)",
+)
+@click.option(
+    "--skip",
+    multiple=True,
+    help="Omite estes analisadores (ex.: --skip templates)",
+)
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0),
+    help="Prazo em segundos; esgotado, o relatório sai parcial (score provisório)",
+)
+@click.option(
+    "--no-daemon", is_flag=True, help="Analisa localmente mesmo com o daemon no ar"
+)
 @click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
 def analyze(
     project_path: str,
@@ -351,6 +333,10 @@ def analyze(
     detail: str,
     config: Optional[str],
     no_default_excludes: bool,
+    only: tuple[str, ...],
+    skip: tuple[str, ...],
+    time_budget: Optional[float],
+    no_daemon: bool,
     verbose: bool,
 ):
     """Executa análise completa do projeto.
@@ -383,13 +369,28 @@ def analyze(
     # Executa análise
     try:
         config_data = _load_config(config, no_default_excludes, verbose)
-        analyzer = CodeAnalyzer(project_path, config_data)
+        report = (
+            None
+            if no_daemon
+            else request_if_running(
+                "analyze",
+                time_budget=time_budget,
+                **project_request(project_path, config_data, only, skip),
+            )
+        )
+        if report is not None:
+            if verbose:
+                click.echo("Resultado obtido do daemon")
+        else:
+            analyzer = CodeAnalyzer(
+                project_path, config_data, analyzers=only or None, skip=skip
+            )
 
-        if verbose:
-            click.echo("Executando análise...")
+            if verbose:
+                click.echo(f"Executando análise ({', '.join(analyzer.analyzers)})...")
 
-        # Gera relatório em memória (salvamento tratado abaixo)
-        report = analyzer.generate_full_report()
+            # Gera relatório em memória (salvamento tratado abaixo)
+            report = analyzer.generate_full_report(time_budget=time_budget)
 
         # Exibe resumo
         summary = report.get("summary", {})
@@ -408,6 +409,13 @@ def analyze(
             score_text = ColorHelper.error(f"Score de Qualidade: {quality_score}/100")
 
         click.echo(score_text)
+        if summary.get("provisional"):
+            click.echo(
+                ColorHelper.warning(
+                    "Score provisório: prazo esgotado com "
+                    f"{summary.get('completeness', 0):.0%} dos arquivos analisados"
+                )
+            )
         click.echo(f"Arquivos analisados: {summary.get('total_files', 0)}")
         click.echo(f"Arquivos com violações: {summary.get('violation_files', 0)}")
         click.echo(f"Templates: {summary.get('total_templates', 0)}")
@@ -451,6 +459,117 @@ def analyze(
             click.echo(traceback.format_exc())
 
 
+@cli.command("analyze-many")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    help="Diretório de saída: um subdiretório por projeto e index.json (padrão: ./reports)",
+)
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["json", "html", "markdown", "csv", "all"]),
+    default="json",
+    help="Formato do relatório de cada projeto (além do JSON padrão)",
+)
+@click.option(
+    "--detail",
+    type=click.Choice(["summary", "standard", "full"]),
+    default="standard",
+    show_default=True,
+    help="Nível de detalhe dos relatórios de cada projeto",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Workers do pool compartilhado (padrão: número de CPUs)",
+)
+@click.option(
+    "--config", "-c", type=click.Path(exists=True), help="Arquivo de configuração JSON"
+)
+@click.option(
+    "--no-default-excludes",
+    is_flag=True,
+    help="Não aplicar exclusões padrão (tests, scripts, reports, venv, etc.)",
+)
+@click.option("--only", multiple=True, help="Executa apenas estes analisadores")
+@click.option("--skip", multiple=True, help="Omite estes analisadores")
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0),
+    help="Prazo em segundos por projeto",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
+def analyze_many_command(
+    manifest: str,
+    output: Optional[str],
+    format: str,
+    detail: str,
+    jobs: Optional[int],
+    config: Optional[str],
+    no_default_excludes: bool,
+    only: tuple[str, ...],
+    skip: tuple[str, ...],
+    time_budget: Optional[float],
+    verbose: bool,
+):
+    """Analisa vários projetos em um único processo.
+
+    MANIFEST: Arquivo JSON (``{"projects": [...], "config": {...}}``) ou
+    lista de caminhos, um por linha.
+    """
+    _configure_logging(verbose)
+    output_path = Path(output or "reports")
+
+    def write_project(entry: BatchProjectEntry, report: FullReport) -> None:
+        project_dir = output_path / entry["report_dir"]
+        project_dir.mkdir(parents=True, exist_ok=True)
+        _write_analyze_json_files(report, project_dir, detail)
+        _write_report_files(
+            report, project_dir, "analysis_report", format, no_json=True, detail=detail
+        )
+
+    try:
+        projects, config_data = load_manifest(manifest)
+        # O arquivo de --config prevalece sobre a configuração do manifesto
+        if config:
+            with open(config, "r", encoding="utf-8") as f:
+                config_data = {**config_data, **json.load(f)}
+        if no_default_excludes:
+            config_data["no_default_excludes"] = True
+        index = analyze_many(
+            projects,
+            output_dir=output_path,
+            config=config_data,
+            jobs=jobs,
+            analyzers=only or None,
+            skip=skip,
+            time_budget=time_budget,
+            save_reports=False,
+            on_report=write_project,
+        )
+    except ConfigurationError as e:
+        click.echo(ColorHelper.error(f"Configuração inválida: {e}"))
+        return
+
+    for entry in index["projects"]:
+        if entry["status"] == "ok":
+            score = entry["summary"].get("quality_score", 0)
+            click.echo(f"{entry['name']}: {score}/100")
+        else:
+            click.echo(ColorHelper.error(f"{entry['name']}: {entry.get('error', '')}"))
+    average = index["average_quality_score"]
+    click.echo(
+        f"\n{index['total_projects']} projetos em {index['elapsed']:.1f}s; "
+        f"falhas: {index['failed_projects']}; score médio: "
+        f"{'-' if average is None else average}"
+    )
+    click.echo(ColorHelper.info(f"Índice: {output_path / INDEX_FILE}"))
+
+
 @cli.command()
 @click.argument(
     "project_path",
@@ -477,6 +596,9 @@ def analyze(
     is_flag=True,
     help="Não aplicar exclusões padrão (tests, scripts, reports, venv, etc.)",
 )
+@click.option(
+    "--no-daemon", is_flag=True, help="Analisa localmente mesmo com o daemon no ar"
+)
 @click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
 def violations(
     project_path: str,
@@ -485,6 +607,7 @@ def violations(
     no_json: bool,
     config: Optional[str],
     no_default_excludes: bool,
+    no_daemon: bool,
     verbose: bool,
 ):
     """Analisa apenas violações de tamanho.
@@ -495,8 +618,16 @@ def violations(
 
     try:
         config_data = _load_config(config, no_default_excludes, verbose)
-        analyzer = ViolationsAnalyzer(project_path, config_data)
-        report = analyzer.analyze()
+        report = (
+            None
+            if no_daemon
+            else request_if_running(
+                "violations", **project_request(project_path, config_data)
+            )
+        )
+        if report is None:
+            analyzer = ViolationsAnalyzer(project_path, config_data)
+            report = analyzer.analyze()
         output_path = Path(output or "reports")
         _write_report_files(
             _wrap_single_report("violations", report),
@@ -538,6 +669,11 @@ def violations(
     is_flag=True,
     help="Não aplicar exclusões padrão (tests, scripts, reports, venv, etc.)",
 )
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Não incluir o corpo dos trechos inline (apenas linha, offset e hash)",
+)
 @click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
 def templates(
     project_path: str,
@@ -546,6 +682,7 @@ def templates(
     no_json: bool,
     config: Optional[str],
     no_default_excludes: bool,
+    compact: bool,
     verbose: bool,
 ):
     """Analisa apenas templates HTML com CSS/JS inline.
@@ -556,6 +693,8 @@ def templates(
 
     try:
         config_data = _load_config(config, no_default_excludes, verbose)
+        if compact:
+            config_data["templates_compact"] = True
         analyzer = TemplatesAnalyzer(project_path, config_data)
         report = analyzer.analyze()
         output_path = Path(output or "reports")
@@ -641,14 +780,62 @@ def errors(
     default=".",
     required=False,
 )
-def score(project_path: str):
+@click.option(
+    "--sample",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="Estima o score analisando esta fração dos arquivos (amostra estratificada)",
+)
+@click.option("--seed", type=int, help="Semente da amostra (reprodutibilidade)")
+@click.option(
+    "--confidence",
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.95,
+    show_default=True,
+    help="Nível de confiança do intervalo da estimativa",
+)
+@click.option(
+    "--no-daemon", is_flag=True, help="Analisa localmente mesmo com o daemon no ar"
+)
+def score(
+    project_path: str,
+    sample: Optional[float],
+    seed: Optional[int],
+    confidence: float,
+    no_daemon: bool,
+):
     """Mostra apenas o score de qualidade do projeto.
 
     PROJECT_PATH: Caminho para o diretório do projeto
     """
     try:
-        analyzer = CodeAnalyzer(project_path)
-        quality_score = analyzer.get_quality_score()
+        remote = (
+            None
+            if no_daemon
+            else request_if_running(
+                "score",
+                sample=sample,
+                seed=seed,
+                confidence=confidence,
+                **project_request(project_path),
+            )
+        )
+        estimate: Optional[SampledQualityScore] = None
+        quality_score: int
+        if sample is not None:
+            estimate = (
+                remote
+                if remote is not None
+                else CodeAnalyzer(project_path).estimate_quality_score(
+                    sample, seed, confidence
+                )
+            )
+            quality_score = estimate["quality_score"]
+        else:
+            quality_score = (
+                remote
+                if remote is not None
+                else CodeAnalyzer(project_path).get_quality_score()
+            )
 
         if quality_score >= 80:
             score_text = ColorHelper.success(
@@ -664,6 +851,13 @@ def score(project_path: str):
             )
 
         click.echo(score_text)
+        if estimate is not None:
+            low, high = estimate["interval"]
+            click.echo(
+                f"Estimativa: IC {estimate['confidence']:.0%} [{low}, {high}] com "
+                f"{estimate['sampled_files']} de {estimate['population_files']} "
+                f"arquivos (semente {estimate['seed']})"
+            )
 
     except Exception as e:
         click.echo(ColorHelper.error(f"Erro: {e}"))
@@ -901,6 +1095,154 @@ def lint(project_path: str):
         click.echo(ColorHelper.error("Falhas detectadas nas checagens."))
 
 
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Caminho do socket Unix (padrão: $CHA_DAEMON_SOCKET ou o do usuário)",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Encerra após tantos segundos sem requisições",
+)
+@click.option("--status", is_flag=True, help="Mostra se o daemon está no ar")
+@click.option("--stop", is_flag=True, help="Encerra o daemon em execução")
+@click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
+def daemon(
+    socket_path: Optional[str],
+    idle_timeout: Optional[float],
+    status: bool,
+    stop: bool,
+    verbose: bool,
+):
+    """Mantém um processo de análise residente, com caches aquecidos.
+
+    Enquanto ele estiver no ar, ``cha analyze``, ``cha score`` e
+    ``cha violations`` são atendidos pelo daemon (use ``--no-daemon`` ou
+    ``CHA_NO_DAEMON=1`` para analisar localmente).
+    """
+    _configure_logging(verbose)
+    path = Path(socket_path) if socket_path else default_socket_path()
+    client = DaemonClient(path)
+    if status or stop:
+        if not client.running():
+            click.echo(f"Nenhum daemon em {path}")
+            return
+        if stop:
+            client.request("shutdown")
+            click.echo(ColorHelper.success(f"Daemon em {path} encerrado"))
+        else:
+            info = client.request("ping")
+            click.echo(
+                f"Daemon no ar em {path} (PID {info['pid']}, "
+                f"{info['projects']} projeto(s) em memória)"
+            )
+        return
+
+    server = AnalysisDaemon(path, idle_timeout=idle_timeout)
+    try:
+        server.bind()
+    except (AnalyzerExecutionError, OSError) as e:
+        click.echo(ColorHelper.error(f"Erro: {e}"))
+        return
+    click.echo(ColorHelper.info(f"Daemon atendendo em {path} (Ctrl+C encerra)"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def _format_delta(delta: WatchDelta) -> str:
+    """Linha do ``cha watch`` para um delta de reanálise."""
+    score, previous = delta["quality_score"], delta["previous_score"]
+    files = delta["changed"] + [f"-{path}" for path in delta["removed"]]
+    shown = ", ".join(files[:5]) + (f" (+{len(files) - 5})" if len(files) > 5 else "")
+    line = (
+        f"[{delta['timestamp'][11:19]}] Score {score}/100 ({score - previous:+d}) "
+        f"| {', '.join(delta['analyzers'])}: {shown or 'reanálise completa'}"
+    )
+    if score < previous:
+        return ColorHelper.error(line)
+    if score > previous:
+        return ColorHelper.success(line)
+    return line
+
+
+@cli.command()
+@click.argument(
+    "project_path",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    default=".",
+    required=False,
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_INTERVAL,
+    show_default=True,
+    help="Intervalo entre verificações, em segundos",
+)
+@click.option(
+    "--polling", is_flag=True, help="Usa varredura periódica mesmo com inotify"
+)
+@click.option(
+    "--config", "-c", type=click.Path(exists=True), help="Arquivo de configuração JSON"
+)
+@click.option(
+    "--no-default-excludes",
+    is_flag=True,
+    help="Não aplicar exclusões padrão (tests, scripts, reports, venv, etc.)",
+)
+@click.option("--only", multiple=True, help="Executa apenas estes analisadores")
+@click.option("--skip", multiple=True, help="Omite estes analisadores")
+@click.option("--verbose", "-v", is_flag=True, help="Saída detalhada")
+def watch(
+    project_path: str,
+    interval: float,
+    polling: bool,
+    config: Optional[str],
+    no_default_excludes: bool,
+    only: tuple[str, ...],
+    skip: tuple[str, ...],
+    verbose: bool,
+):
+    """Observa o projeto e reanalisa só os arquivos alterados.
+
+    Mostra uma linha por rodada com mudanças: o novo score e os arquivos
+    reanalisados. Ctrl+C encerra.
+
+    PROJECT_PATH: Caminho para o diretório do projeto
+    """
+    _configure_logging(verbose)
+    try:
+        config_data = _load_config(config, no_default_excludes, verbose)
+        analyzer = CodeAnalyzer(
+            project_path, config_data, analyzers=only or None, skip=skip
+        )
+        engine = WatchEngine(
+            analyzer, interval=interval, use_inotify=False if polling else None
+        )
+        engine.start()
+    except (ConfigurationError, AnalyzerExecutionError) as e:
+        click.echo(ColorHelper.error(f"Erro: {e}"))
+        return
+    click.echo(
+        ColorHelper.info(
+            f"Observando {project_path} via {engine.backend}: score inicial "
+            f"{engine.quality_score}/100 (Ctrl+C encerra)"
+        )
+    )
+    try:
+        for delta in engine.watch():
+            click.echo(_format_delta(delta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+
+
 def main():
     """Ponto de entrada principal da CLI."""
     cli()
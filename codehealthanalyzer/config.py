@@ -7,7 +7,8 @@ from typing import Any
 
 from .exceptions import ConfigurationError
 
-DEFAULT_EXCLUDE_DIRS = [
+# Tupla para que nenhum analisador consiga estender o padrão global por engano.
+DEFAULT_EXCLUDE_DIRS = (
     ".git",
     "__pycache__",
     ".pytest_cache",
@@ -24,7 +25,9 @@ DEFAULT_EXCLUDE_DIRS = [
     "reports",
     "scripts",
     "tests",
-]
+)
+
+RUFF_BACKENDS = ("cli", "server")
 
 DEFAULT_TEMPLATE_DIRS = [
     "templates",
@@ -60,4 +63,37 @@ def normalize_config(config: dict[str, Any] | None = None) -> dict[str, Any]:
         normalized.get("no_default_excludes", False)
     )
     normalized["ruff_fix"] = bool(normalized.get("ruff_fix", False))
+    normalized["ruff_cache"] = bool(normalized.get("ruff_cache", False))
+    ruff_backend = str(normalized.get("ruff_backend") or "cli").lower()
+    if ruff_backend not in RUFF_BACKENDS:
+        raise ConfigurationError(
+            f"'ruff_backend' deve ser um de: {', '.join(RUFF_BACKENDS)}"
+        )
+    normalized["ruff_backend"] = ruff_backend
+    normalized["templates_compact"] = bool(normalized.get("templates_compact", False))
+
+    time_budget = normalized.get("time_budget")
+    if time_budget is not None:
+        try:
+            time_budget = float(time_budget)
+        except (TypeError, ValueError):
+            time_budget = -1.0
+        if time_budget < 0:
+            raise ConfigurationError("'time_budget' deve ser um número não negativo")
+        normalized["time_budget"] = time_budget
+
+    fraction = normalized.get("sample_fraction")
+    if fraction is not None:
+        try:
+            fraction = float(fraction)
+        except (TypeError, ValueError):
+            fraction = 0.0
+        if not 0 < fraction <= 1:
+            raise ConfigurationError("'sample_fraction' deve estar em (0, 1]")
+        normalized["sample_fraction"] = fraction
+
+    seed = normalized.get("sample_seed")
+    if seed is not None:
+        if isinstance(seed, bool) or not isinstance(seed, int):
+            raise ConfigurationError("'sample_seed' deve ser um inteiro")
     return normalized
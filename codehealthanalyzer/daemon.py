@@ -0,0 +1,451 @@
+"""Daemon de análise residente, acessado por socket Unix.
+
+``cha daemon`` mantém vivo um processo com um :class:`CodeAnalyzer` por
+projeto consultado: inventários, resultados memorizados por impressão
+digital e, com ``ruff_backend: "server"``, o ``ruff server`` já aquecido.
+Os comandos ``cha analyze``, ``cha score`` e ``cha violations`` consultam o
+daemon quando ele está no ar e caem na análise local caso contrário; para
+uma árvore inalterada a resposta sai da memória, sem partida a frio.
+
+Protocolo: uma requisição JSON por conexão, terminada em ``\\n``, com
+``command`` e os parâmetros do comando. A resposta é
+``{"ok": true, "result": ...}`` ou ``{"ok": false, "type": ..., "error": ...}``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .config import normalize_config
+from .exceptions import (
+    AnalyzerExecutionError,
+    CodeHealthAnalyzerError,
+    ConfigurationError,
+)
+from .version import __version__
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "CHA_DAEMON_SOCKET"
+DISABLE_ENV = "CHA_NO_DAEMON"
+# Projetos mantidos aquecidos; o menos usado recentemente é descartado
+MAX_PROJECTS = 16
+CONNECT_TIMEOUT = 0.5
+
+_EXCEPTIONS = {
+    "ConfigurationError": ConfigurationError,
+    "AnalyzerExecutionError": AnalyzerExecutionError,
+    "CodeHealthAnalyzerError": CodeHealthAnalyzerError,
+}
+
+
+def _uid() -> int:
+    return getattr(os, "getuid", lambda: 0)()
+
+
+def default_socket_path() -> Path:
+    """Socket do usuário atual (``CHA_DAEMON_SOCKET`` tem precedência).
+
+    Sem ``XDG_RUNTIME_DIR``, o socket fica em um diretório privado (0700)
+    dentro do diretório temporário, criado e verificado por :meth:`bind`.
+    """
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return Path(configured)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / f"codehealthanalyzer-{_uid()}.sock"
+    return _fallback_dir() / "daemon.sock"
+
+
+def _fallback_dir() -> Path:
+    return Path(tempfile.gettempdir()) / f"codehealthanalyzer-{_uid()}"
+
+
+def _owned_stat(path: Path) -> Optional[os.stat_result]:
+    """``lstat`` de ``path`` (``None`` se não existir), exigindo dono = usuário atual.
+
+    Raises:
+        PermissionError: Se o caminho pertencer a outro usuário.
+    """
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if info.st_uid != _uid():
+        raise PermissionError(f"{path} pertence a outro usuário (uid {info.st_uid})")
+    return info
+
+
+def _check_socket(path: Path) -> bool:
+    """Indica se há um socket do usuário atual em ``path``.
+
+    Raises:
+        PermissionError: Se o caminho pertencer a outro usuário ou não for
+            um socket.
+    """
+    info = _owned_stat(path)
+    if info is None:
+        return False
+    if not stat.S_ISSOCK(info.st_mode):
+        raise PermissionError(f"{path} existe e não é um socket")
+    return True
+
+
+def _check_peer(client: socket.socket) -> None:
+    """Confere, onde há ``SO_PEERCRED``, que o daemon roda com o mesmo usuário."""
+    peercred = getattr(socket, "SO_PEERCRED", None)
+    if peercred is None:
+        return
+    credentials = client.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize("iII"))
+    _, uid, _ = struct.unpack("iII", credentials)
+    if uid != _uid():
+        raise PermissionError(f"daemon no socket pertence a outro usuário (uid {uid})")
+
+
+def _private_dir(path: Path) -> None:
+    """Cria ``path`` com modo 0700 e verifica que é um diretório privado nosso.
+
+    Raises:
+        AnalyzerExecutionError: Se for um link simbólico, de outro usuário
+            ou acessível a grupo/outros.
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    try:
+        info = _owned_stat(path)
+    except PermissionError as exc:
+        raise AnalyzerExecutionError(str(exc)) from exc
+    if info is None or not stat.S_ISDIR(info.st_mode):
+        raise AnalyzerExecutionError(f"{path} não é um diretório")
+    if info.st_mode & 0o077:
+        raise AnalyzerExecutionError(f"{path} é acessível a outros usuários")
+
+
+def supported() -> bool:
+    """Indica se a plataforma tem sockets Unix."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def _close(analyzer: Any) -> None:
+    """Encerra processos mantidos pelo analisador (ex.: ``ruff server``)."""
+    close = getattr(getattr(analyzer, "errors_analyzer", None), "close", None)
+    if callable(close):
+        close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:  # cliente desconectou sem enviar (ex.: recusou o daemon)
+            return
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("requisição deve ser um objeto JSON")
+            response = {"ok": True, "result": self.server.daemon.handle(request)}
+        except CodeHealthAnalyzerError as exc:
+            response = {"ok": False, "type": type(exc).__name__, "error": str(exc)}
+        except ValueError as exc:
+            response = {"ok": False, "type": "ConfigurationError", "error": str(exc)}
+        except Exception as exc:  # o daemon segue atendendo os demais clientes
+            logger.exception("Falha ao atender requisição do daemon")
+            response = {"ok": False, "type": type(exc).__name__, "error": str(exc)}
+        self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: "AnalysisDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(path, _Handler)
+
+
+class AnalysisDaemon:
+    """Servidor de análises com estado quente entre requisições.
+
+    Args:
+        socket_path: Caminho do socket (padrão: :func:`default_socket_path`).
+        max_projects: Projetos mantidos em memória.
+        idle_timeout: Encerra após tantos segundos sem requisições.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Union[str, Path]] = None,
+        max_projects: int = MAX_PROJECTS,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.max_projects = max(1, max_projects)
+        self.idle_timeout = idle_timeout
+        self._analyzers: "OrderedDict[Tuple, Tuple[Any, threading.Lock]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._last_request = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Comandos
+    # ------------------------------------------------------------------
+
+    def _entry(self, request: Dict[str, Any]) -> Tuple[Any, threading.Lock]:
+        """``CodeAnalyzer`` (e sua trava) do projeto/configuração pedidos."""
+        from . import CodeAnalyzer
+
+        project = request.get("project")
+        if not project or not os.path.isdir(project):
+            raise ConfigurationError(f"Diretório não encontrado: {project}")
+        config = normalize_config(request.get("config"))
+        analyzers, skip = request.get("analyzers"), request.get("skip")
+        key = (
+            os.path.realpath(project),
+            json.dumps(config, sort_keys=True, default=str),
+            tuple(analyzers or ()),
+            tuple(skip or ()),
+        )
+        with self._lock:
+            entry = self._analyzers.get(key)
+            if entry is not None:
+                self._analyzers.move_to_end(key)
+                return entry
+        analyzer = CodeAnalyzer(project, config, analyzers, skip)
+        evicted = []
+        with self._lock:
+            entry = self._analyzers.setdefault(key, (analyzer, threading.Lock()))
+            self._analyzers.move_to_end(key)
+            while len(self._analyzers) > self.max_projects:
+                evicted.append(self._analyzers.popitem(last=False)[1])
+        for old, lock in evicted:
+            with lock:
+                _close(old)
+        return entry
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """Executa ``request["command"]`` e devolve o resultado serializável."""
+        self._last_request = time.monotonic()
+        command = request.get("command")
+        if command == "ping":
+            return {
+                "pid": os.getpid(),
+                "version": __version__,
+                "projects": len(self._analyzers),
+            }
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return None
+        handlers: Dict[str, Callable[[Any], Any]] = {
+            "analyze": lambda analyzer: analyzer.generate_full_report(
+                time_budget=request.get("time_budget")
+            ),
+            "violations": lambda analyzer: analyzer.analyze_violations(),
+            "score": lambda analyzer: (
+                analyzer.get_quality_score()
+                if request.get("sample") is None
+                else analyzer.estimate_quality_score(
+                    request["sample"],
+                    request.get("seed"),
+                    request.get("confidence", 0.95),
+                )
+            ),
+        }
+        run = handlers.get(str(command))
+        if run is None:
+            raise ConfigurationError(f"Comando desconhecido: {command}")
+        analyzer, lock = self._entry(request)
+        # Um CodeAnalyzer atende uma requisição por vez
+        with lock:
+            return run(analyzer)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def bind(self) -> "_Server":
+        """Cria o socket (só o usuário atual pode acessá-lo).
+
+        Raises:
+            AnalyzerExecutionError: Se já houver um daemon atendendo, ou se o
+                caminho existir sem ser um socket do usuário atual.
+        """
+        if not supported():
+            raise AnalyzerExecutionError("Sockets Unix não são suportados aqui")
+        if DaemonClient(self.socket_path).running():
+            raise AnalyzerExecutionError(f"Daemon já em execução em {self.socket_path}")
+        parent = self.socket_path.parent
+        if parent == _fallback_dir():
+            _private_dir(parent)
+        else:
+            parent.mkdir(parents=True, exist_ok=True)
+        # Socket órfão de um daemon que morreu sem limpar; só removemos
+        # sockets do próprio usuário
+        try:
+            if _check_socket(self.socket_path):
+                self.socket_path.unlink()
+        except PermissionError as exc:
+            raise AnalyzerExecutionError(
+                f"Não é possível usar o socket: {exc}"
+            ) from exc
+        previous = os.umask(0o177)
+        try:
+            self._server = _Server(str(self.socket_path), self)
+        finally:
+            os.umask(previous)
+        return self._server
+
+    def serve_forever(self) -> None:
+        """Atende requisições até :meth:`shutdown` (ou ociosidade)."""
+        server = self._server or self.bind()
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            server.serve_forever(poll_interval=0.2)
+        finally:
+            server.server_close()
+            self._server = None
+            self._close_analyzers()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        server = self._server
+        if server is not None:
+            server.shutdown()
+
+    def _watch_idle(self) -> None:
+        while self._server is not None:
+            idle = time.monotonic() - self._last_request
+            if self.idle_timeout is not None and idle >= self.idle_timeout:
+                logger.info("Daemon ocioso por %.0fs; encerrando", idle)
+                self.shutdown()
+                return
+            time.sleep(min(1.0, self.idle_timeout or 1.0))
+
+    def _close_analyzers(self) -> None:
+        with self._lock:
+            entries = list(self._analyzers.values())
+            self._analyzers.clear()
+        for analyzer, _ in entries:
+            _close(analyzer)
+
+
+class DaemonClient:
+    """Cliente do :class:`AnalysisDaemon`.
+
+    Args:
+        socket_path: Caminho do socket (padrão: :func:`default_socket_path`).
+    """
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None) -> None:
+        self.socket_path = Path(socket_path or default_socket_path())
+
+    def running(self) -> bool:
+        """Indica se há um daemon respondendo no socket."""
+        if not supported():
+            return False
+        try:
+            if not _check_socket(self.socket_path):
+                return False
+            self.request("ping")
+        except (OSError, CodeHealthAnalyzerError):
+            return False
+        return True
+
+    def request(self, command: str, **params: Any) -> Any:
+        """Envia ``command`` ao daemon e devolve o resultado.
+
+        O socket precisa pertencer ao usuário atual (e, onde houver
+        ``SO_PEERCRED``, o processo do outro lado também): caso contrário a
+        resposta poderia vir de um daemon falso de outro usuário.
+
+        Raises:
+            OSError: Se o daemon não estiver acessível.
+            PermissionError: Se o socket ou o daemon pertencerem a outro
+                usuário, ou se o caminho não for um socket.
+            CodeHealthAnalyzerError: Erro do daemon ao executar o comando.
+        """
+        if not _check_socket(self.socket_path):
+            raise FileNotFoundError(f"Daemon não encontrado em {self.socket_path}")
+        payload = json.dumps({"command": command, **params}, default=str)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(self.socket_path))
+            _check_peer(client)
+            # A análise pode demorar: sem limite após a conexão
+            client.settimeout(None)
+            client.sendall(payload.encode("utf-8") + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+        if not line:
+            raise ConnectionError("daemon encerrou a conexão sem responder")
+        response = json.loads(line)
+        if not response.get("ok"):
+            error = _EXCEPTIONS.get(response.get("type", ""), AnalyzerExecutionError)
+            raise error(response.get("error", "erro desconhecido no daemon"))
+        return response.get("result")
+
+
+def request_if_running(command: str, **params: Any) -> Optional[Any]:
+    """Resultado de ``command`` via daemon, ou ``None`` se ele não estiver no ar.
+
+    ``CHA_NO_DAEMON`` desativa a consulta.
+    """
+    if os.environ.get(DISABLE_ENV) or not supported():
+        return None
+    client = DaemonClient()
+    if not client.socket_path.exists():
+        return None
+    try:
+        return client.request(command, **params)
+    except PermissionError as exc:
+        logger.warning(
+            "Ignorando daemon não confiável (%s); analisando localmente", exc
+        )
+        return None
+    except OSError as exc:
+        logger.info("Daemon indisponível (%s); analisando localmente", exc)
+        return None
+
+
+def project_request(
+    project_path: Union[str, Path],
+    config: Optional[Dict[str, Any]] = None,
+    analyzers: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Parâmetros comuns de uma requisição sobre um projeto."""
+    return {
+        "project": os.path.abspath(project_path),
+        "config": config,
+        "analyzers": list(analyzers) if analyzers else None,
+        "skip": list(skip) if skip else None,
+    }
+
+
+__all__ = [
+    "AnalysisDaemon",
+    "DaemonClient",
+    "default_socket_path",
+    "project_request",
+    "request_if_running",
+]
@@ -90,6 +90,18 @@ class ReportFormatter:
             md.write("| _Sem registros_ |  |  |  |  |\n")
         md.write("\n")
 
+        # Trechos inline duplicados entre templates
+        duplicates = report.get("templates", {}).get("duplicates", []) or []
+        if duplicates:
+            md.write("## Trechos Inline Duplicados\n\n")
+            md.write("| Tipo | Hash | Arquivos | Ocorrências | Bytes (total) |\n")
+            md.write("|---|---|---:|---:|---:|\n")
+            for dup in duplicates:
+                md.write(
+                    f"| {dup.get('kind','')} | {dup.get('hash','')} | {dup.get('files',0)} | {dup.get('occurrences',0)} | {dup.get('total_bytes',0)} |\n"
+                )
+            md.write("\n")
+
         Path(output_file).parent.mkdir(parents=True, exist_ok=True)
         Path(output_file).write_text(md.getvalue(), encoding="utf-8")
         return md.getvalue()
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Union, cast
 
 from ..schemas import (
     ActionPriority,
+    ErrorCountsReport,
     ErrorsReport,
     FullReport,
     SummaryReport,
@@ -15,6 +16,13 @@ from ..schemas import (
 from ..utils.helpers import FileHelper
 from ..version import __version__
 
+# Penalidade de cada ocorrência no score de qualidade (base 100)
+QUALITY_PENALTIES: Dict[str, int] = {
+    "violations_high": 10,
+    "total_errors": 2,
+    "templates_high": 5,
+}
+
 
 class ReportGenerator:
     """Gera relatórios consolidados e HTML básico."""
@@ -28,12 +36,20 @@ class ReportGenerator:
         templates: TemplatesReport,
         errors: ErrorsReport,
         output_dir: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+        analyzers: Optional[List[str]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+        completeness: Optional[Dict[str, Any]] = None,
     ) -> FullReport:
         # Calcula score uma única vez e constrói summary consistente
         score = self.calculate_quality_score(violations, templates, errors)
         summary = self._generate_summary(violations, templates, errors)
         summary["generated_at"] = datetime.now().isoformat()
         summary["quality_score"] = score
+        if completeness is not None:
+            # Análise limitada por prazo: o score vale só para o que foi visto
+            summary["completeness"] = completeness.get("completeness", 1.0)
+            summary["provisional"] = summary["completeness"] < 1
 
         # Prioridades de ação
         priorities: List[ActionPriority] = []
@@ -61,6 +77,23 @@ class ReportGenerator:
             "quality_score": score,
         }
 
+        if timings is not None:
+            # Tempo de relógio (segundos) de cada analisador e da análise completa
+            report["metadata"]["timings"] = dict(timings)
+        if analyzers is not None:
+            report["metadata"]["analyzers"] = list(analyzers)
+        if completeness is not None:
+            metadata = report["metadata"]
+            if completeness.get("time_budget") is not None:
+                metadata["time_budget"] = completeness["time_budget"]
+            metadata["completeness"] = summary["completeness"]
+            metadata["planned_files"] = completeness.get("planned_files", 0)
+            metadata["skipped_files"] = list(completeness.get("skipped_files", []))
+            metadata["provisional"] = summary["provisional"]
+        if extensions:
+            # Resultados de analisadores de terceiros, por nome
+            report["extensions"] = dict(extensions)
+
         if output_dir:
             out = Path(output_dir)
             out.mkdir(parents=True, exist_ok=True)
@@ -91,12 +124,14 @@ class ReportGenerator:
         self,
         violations: ViolationsReport,
         templates: TemplatesReport,
-        errors: ErrorsReport,
+        errors: Union[ErrorsReport, ErrorCountsReport],
     ) -> int:
-        score = 100
-        score -= 10 * violations.get("statistics", {}).get("high_priority", 0)
-        score -= 2 * errors.get("metadata", {}).get("total_errors", 0)
-        score -= 5 * templates.get("statistics", {}).get("high_priority", 0)
+        counters = {
+            "violations_high": violations.get("statistics", {}).get("high_priority", 0),
+            "total_errors": errors.get("metadata", {}).get("total_errors", 0),
+            "templates_high": templates.get("statistics", {}).get("high_priority", 0),
+        }
+        score = 100 - sum(QUALITY_PENALTIES[name] * counters[name] for name in counters)
         return max(0, min(100, score))
 
     def generate_html_report(self, report: FullReport, output_file: str) -> str:
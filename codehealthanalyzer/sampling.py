@@ -0,0 +1,247 @@
+"""Estimativa do score de qualidade por amostragem estratificada.
+
+Em monorepos muito grandes, analisar todos os arquivos só para acompanhar a
+tendência do score é caro demais. Aqui o inventário (Python e HTML) é
+dividido em estratos por diretório de primeiro nível e faixa de tamanho; de
+cada estrato sorteia-se, com semente reprodutível, uma fração dos arquivos.
+
+Os contadores usados por ``ReportGenerator.calculate_quality_score`` são
+extrapolados com o estimador de expansão estratificado, e o intervalo de
+confiança vem da aproximação normal com correção de população finita.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .analyzers.errors import ErrorsAnalyzer
+from .analyzers.sources import source_key
+from .analyzers.templates import TemplatesAnalyzer
+from .analyzers.violations import ViolationsAnalyzer
+from .exceptions import ConfigurationError
+from .reports.generator import QUALITY_PENALTIES
+from .schemas import CounterEstimate, SampledQualityScore
+
+DEFAULT_SAMPLE_FRACTION = 0.1
+# Limites superiores (bytes) das faixas de tamanho; a última faixa é aberta
+SIZE_BUCKETS = (4 * 1024, 32 * 1024, 256 * 1024)
+# Com dois arquivos por estrato a variância de cada estrato é estimável
+MIN_PER_STRATUM = 2
+
+StratumKey = Tuple[str, int]
+
+
+def size_bucket(size: int) -> int:
+    """Índice da faixa de tamanho de um arquivo com ``size`` bytes."""
+    for index, limit in enumerate(SIZE_BUCKETS):
+        if size < limit:
+            return index
+    return len(SIZE_BUCKETS)
+
+
+def stratify(files: Iterable[Path], root: Path) -> Dict[StratumKey, List[Path]]:
+    """Agrupa ``files`` por (diretório de primeiro nível, faixa de tamanho)."""
+    strata: Dict[StratumKey, List[Path]] = {}
+    resolved_root = root.resolve()
+    for path in files:
+        try:
+            parts = path.resolve().relative_to(resolved_root).parts
+        except (ValueError, OSError):
+            parts = ()
+        directory = parts[0] if len(parts) > 1 else "."
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        strata.setdefault((directory, size_bucket(size)), []).append(path)
+    return strata
+
+
+def draw_sample(
+    strata: Dict[StratumKey, List[Path]],
+    fraction: float,
+    seed: int,
+    min_per_stratum: int = MIN_PER_STRATUM,
+) -> Dict[StratumKey, List[Path]]:
+    """Sorteia ``fraction`` de cada estrato (ao menos ``min_per_stratum``).
+
+    O sorteio só depende de ``seed`` e do conteúdo dos estratos, não da
+    ordem em que o sistema de arquivos listou os arquivos.
+    """
+    # Amostragem estatística reprodutível, sem uso criptográfico
+    rng = random.Random(seed)  # nosec B311
+    sample: Dict[StratumKey, List[Path]] = {}
+    for key in sorted(strata):
+        population = sorted(strata[key], key=source_key)
+        size = min(
+            len(population),
+            max(min_per_stratum, math.ceil(fraction * len(population))),
+        )
+        sample[key] = rng.sample(population, size)
+    return sample
+
+
+def _stratified_total(
+    sizes: Dict[StratumKey, int], values: Dict[StratumKey, List[float]]
+) -> Tuple[float, float]:
+    """Total estimado e sua variância (estimador de expansão estratificado)."""
+    total = 0.0
+    variance = 0.0
+    for key, observed in values.items():
+        population, sampled = sizes[key], len(observed)
+        if not sampled:
+            continue
+        total += population * math.fsum(observed) / sampled
+        # Estrato recenseado (ou com um só arquivo) não contribui variância
+        if 1 < sampled < population:
+            variance += (
+                population**2
+                * (1 - sampled / population)
+                * statistics.variance(observed)
+                / sampled
+            )
+    return total, variance
+
+
+def _counter_estimate(total: float, variance: float, z: float) -> CounterEstimate:
+    error = math.sqrt(variance)
+    return {
+        "estimate": round(total, 2),
+        "standard_error": round(error, 2),
+        "low": round(max(0.0, total - z * error), 2),
+        "high": round(total + z * error, 2),
+    }
+
+
+def _clamp_score(value: float) -> int:
+    return max(0, min(100, int(round(value))))
+
+
+def sample_quality_score(
+    project_path: Path,
+    violations: Optional[ViolationsAnalyzer],
+    templates: Optional[TemplatesAnalyzer],
+    errors: Optional[ErrorsAnalyzer],
+    fraction: float = DEFAULT_SAMPLE_FRACTION,
+    seed: Optional[int] = None,
+    confidence: float = 0.95,
+) -> SampledQualityScore:
+    """Estima o score de qualidade a partir de uma amostra estratificada.
+
+    Analisadores ``None`` (não selecionados) não penalizam o score, como em
+    ``CodeAnalyzer.get_quality_score``.
+
+    Args:
+        project_path: Raiz do projeto (base dos estratos por diretório).
+        violations: Analisador de violações.
+        templates: Analisador de templates.
+        errors: Analisador de erros (Ruff roda só nos arquivos sorteados).
+        fraction: Fração de cada estrato a analisar, em ``(0, 1]``.
+        seed: Semente do sorteio; sem ela, uma é gerada e devolvida em
+            ``seed`` para que a amostra possa ser reproduzida.
+        confidence: Nível de confiança do intervalo, em ``(0, 1)``.
+
+    Raises:
+        ConfigurationError: Para ``fraction`` ou ``confidence`` inválidos.
+    """
+    if not 0 < fraction <= 1:
+        raise ConfigurationError("A fração da amostra deve estar em (0, 1]")
+    if not 0 < confidence < 1:
+        raise ConfigurationError("O nível de confiança deve estar em (0, 1)")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # População: união dos inventários dos analisadores selecionados
+    violation_files = (
+        violations.python_files() + violations.html_files() if violations else []
+    )
+    error_files = errors.discover_files() if errors else []
+    template_files = templates.template_files() if templates else []
+    population: Dict[str, Path] = {}
+    for path in [*violation_files, *error_files, *(p for _, p in template_files)]:
+        population.setdefault(source_key(path), path)
+
+    strata = stratify(population.values(), project_path)
+    sample = draw_sample(strata, fraction, seed)
+    sampled = {source_key(path) for paths in sample.values() for path in paths}
+
+    counts: Dict[str, Dict[str, int]] = {
+        key: dict.fromkeys(QUALITY_PENALTIES, 0) for key in sampled
+    }
+    for path in violation_files:
+        key = source_key(path)
+        if key in sampled and violations is not None:
+            result = violations.check_file(path)
+            if result["violations"] and result["priority"] == "high":
+                counts[key]["violations_high"] = 1
+    for base, path in template_files:
+        key = source_key(path)
+        if key in sampled and templates is not None:
+            analysis = templates.analyze_file(path, base)
+            has_inline = (
+                analysis["total_css_chars"] > 0 or analysis["total_js_chars"] > 0
+            )
+            if has_inline and analysis["priority"] == "high":
+                counts[key]["templates_high"] = 1
+    if errors is not None:
+        targets = [path for path in error_files if source_key(path) in sampled]
+        if targets:
+            report = errors.analyze(files=targets)
+            for entry in report["errors"]:
+                key = source_key(project_path / entry["file"])
+                if key in counts:
+                    counts[key]["total_errors"] += entry.get("error_count", 0)
+
+    sizes = {key: len(paths) for key, paths in strata.items()}
+    keys_by_stratum = {
+        stratum: [source_key(path) for path in paths]
+        for stratum, paths in sample.items()
+    }
+
+    def observed(weights: Dict[str, int]) -> Dict[StratumKey, List[float]]:
+        return {
+            stratum: [
+                float(
+                    sum(weight * counts[key][name] for name, weight in weights.items())
+                )
+                for key in keys
+            ]
+            for stratum, keys in keys_by_stratum.items()
+        }
+
+    counters = {
+        name: _counter_estimate(*_stratified_total(sizes, observed({name: 1})), z)
+        for name in QUALITY_PENALTIES
+    }
+    # O intervalo do score usa a penalidade por arquivo, que já carrega a
+    # covariância entre os contadores
+    penalty, variance = _stratified_total(sizes, observed(QUALITY_PENALTIES))
+    margin = z * math.sqrt(variance)
+    return {
+        "quality_score": _clamp_score(100 - penalty),
+        "interval": [
+            _clamp_score(100 - penalty - margin),
+            _clamp_score(100 - penalty + margin),
+        ],
+        "confidence": confidence,
+        "seed": seed,
+        "fraction": fraction,
+        "population_files": len(population),
+        "sampled_files": len(sampled),
+        "strata": len(strata),
+        "counters": counters,
+    }
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_FRACTION",
+    "draw_sample",
+    "sample_quality_score",
+    "size_bucket",
+    "stratify",
+]
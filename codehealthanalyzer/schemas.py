@@ -7,6 +7,15 @@ from typing import Any, Literal, TypedDict
 Priority = Literal["low", "medium", "high"]
 
 
+class ArtifactCacheStats(TypedDict):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    estimated_bytes: int
+    max_bytes: int
+
+
 class ReportMetadata(TypedDict, total=False):
     generated_at: str
     directory: str
@@ -15,7 +24,23 @@ class ReportMetadata(TypedDict, total=False):
     warning_files: int
     total_templates: int
     templates_paths: list[str]
+    compact: bool
     total_errors: int
+    fixed_errors: int
+    fixed_by_code: dict[str, int]
+    ruff_processes: int
+    ruff_cache_hits: int
+    ruff_backend: str
+    fixable_errors: int
+    counts_only: bool
+    timings: dict[str, float]
+    artifact_cache: ArtifactCacheStats
+    analyzers: list[str]
+    time_budget: float
+    completeness: float
+    planned_files: int
+    skipped_files: list[str]
+    provisional: bool
     version: str
     analyzer: str
 
@@ -51,16 +76,26 @@ class InlineAsset(TypedDict, total=False):
     content: str
     length: int
     event: str
+    offset: int
+    hash: str
+    render_blocking: bool
 
 
 class TemplateFileReport(TypedDict, total=False):
     file: str
+    path: str
     css_inline: list[InlineAsset]
     css_style_tags: list[InlineAsset]
     js_inline: list[InlineAsset]
     js_script_tags: list[InlineAsset]
     total_css_chars: int
     total_js_chars: int
+    css_bytes: int
+    js_bytes: int
+    css_gzip_bytes: int
+    js_gzip_bytes: int
+    wire_bytes: int
+    render_blocking_scripts: int
     recommendations: list[str]
     priority: Priority
     category: str
@@ -68,7 +103,7 @@ class TemplateFileReport(TypedDict, total=False):
     js: int
 
 
-class TemplateStatistics(TypedDict):
+class _TemplateStatisticsBase(TypedDict):
     total_templates: int
     total_css_chars: int
     total_js_chars: int
@@ -78,12 +113,37 @@ class TemplateStatistics(TypedDict):
     templates_with_js: int
 
 
-class TemplatesReport(TypedDict):
+class TemplateStatistics(_TemplateStatisticsBase, total=False):
+    total_css_gzip_bytes: int
+    total_js_gzip_bytes: int
+    render_blocking_scripts: int
+
+
+class DuplicateLocation(TypedDict):
+    path: str
+    line: int
+
+
+class DuplicateInlineAsset(TypedDict):
+    kind: str
+    hash: str
+    bytes: int
+    occurrences: int
+    files: int
+    total_bytes: int
+    locations: list[DuplicateLocation]
+
+
+class _TemplatesReportBase(TypedDict):
     metadata: ReportMetadata
     templates: list[TemplateFileReport]
     statistics: TemplateStatistics
 
 
+class TemplatesReport(_TemplatesReportBase, total=False):
+    duplicates: list[DuplicateInlineAsset]
+
+
 class ErrorDetail(TypedDict, total=False):
     line: int
     column: int
@@ -115,6 +175,11 @@ class ErrorsReport(TypedDict):
     statistics: ErrorStatistics
 
 
+class ErrorCountsReport(TypedDict):
+    metadata: ReportMetadata
+    counts: dict[str, int]
+
+
 class SummaryReport(TypedDict, total=False):
     total_files: int
     violation_files: int
@@ -124,6 +189,8 @@ class SummaryReport(TypedDict, total=False):
     high_priority_issues: int
     generated_at: str
     quality_score: int
+    completeness: float
+    provisional: bool
 
 
 class ActionPriority(TypedDict):
@@ -132,7 +199,7 @@ class ActionPriority(TypedDict):
     count: int
 
 
-class FullReport(TypedDict):
+class _FullReportBase(TypedDict):
     metadata: ReportMetadata
     summary: SummaryReport
     violations: ViolationsReport
@@ -142,6 +209,62 @@ class FullReport(TypedDict):
     quality_score: int
 
 
+class FullReport(_FullReportBase, total=False):
+    extensions: dict[str, Any]
+
+
+class CounterEstimate(TypedDict):
+    estimate: float
+    standard_error: float
+    low: float
+    high: float
+
+
+class SampledQualityScore(TypedDict):
+    quality_score: int
+    interval: list[int]
+    confidence: float
+    seed: int
+    fraction: float
+    population_files: int
+    sampled_files: int
+    strata: int
+    counters: dict[str, CounterEstimate]
+
+
+class BatchProjectEntry(TypedDict, total=False):
+    name: str
+    path: str
+    status: Literal["ok", "error"]
+    summary: SummaryReport
+    report_dir: str
+    elapsed: float
+    error: str
+
+
+class BatchIndex(TypedDict):
+    generated_at: str
+    version: str
+    jobs: int
+    elapsed: float
+    total_projects: int
+    failed_projects: int
+    average_quality_score: float | None
+    projects: list[BatchProjectEntry]
+
+
+class WatchDelta(TypedDict):
+    version: int
+    timestamp: str
+    changed: list[str]
+    removed: list[str]
+    analyzers: list[str]
+    quality_score: int
+    previous_score: int
+    # Só as estatísticas que mudaram, com o novo valor
+    statistics: dict[str, dict[str, int]]
+
+
 class DashboardMetrics(TypedDict, total=False):
     timestamp: str
     quality_score: int
@@ -156,4 +279,6 @@ class DashboardMetrics(TypedDict, total=False):
     files: list[ViolationFileReport]
     generated_at: str
     project: str
+    version: int
+    delta: WatchDelta | None
     error: str
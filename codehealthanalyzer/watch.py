@@ -0,0 +1,950 @@
+"""Reanálise incremental guiada por mudanças no sistema de arquivos.
+
+O :class:`WatchEngine` analisa o projeto uma vez (arquivo a arquivo) e depois
+só reanalisa o que mudou: ``check_file`` para violações, ``analyze_file``
+para templates e o Ruff restrito aos arquivos Python alterados. As
+estatísticas de cada analisador são corrigidas no lugar, subtraindo a
+contribuição antiga do arquivo e somando a nova, e cada rodada produz um
+:class:`~codehealthanalyzer.schemas.WatchDelta` consumido por ``cha watch`` e
+pelo dashboard.
+
+As mudanças vêm do inotify (Linux, via ``ctypes``) quando disponível; nas
+demais plataformas, ou se o limite de observadores do kernel se esgotar, uma
+varredura periódica compara mtimes e tamanhos do inventário dos analisadores.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import logging
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .analyzers.base import BaseAnalyzer
+from .analyzers.errors import RUFF_CONFIG_FILES, RUFF_FILE_PATTERNS
+from .analyzers.registry import BUILTIN_ANALYZERS, empty_report
+from .analyzers.sources import source_key
+from .analyzers.templates import _DuplicateIndex
+from .exceptions import AnalyzerExecutionError
+from .schemas import (
+    ErrorFileReport,
+    ErrorsReport,
+    FullReport,
+    TemplateFileReport,
+    TemplatesReport,
+    ViolationFileReport,
+    ViolationsReport,
+    WatchDelta,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1.0
+# Eventos que chegam juntos (ex.: editor que grava e renomeia) viram uma rodada
+COALESCE_DELAY = 0.05
+
+_VIOLATION_STATS = (
+    "total_files",
+    "violation_files",
+    "warning_files",
+    "high_priority",
+    "medium_priority",
+    "python_files",
+    "html_files",
+)
+_TEMPLATE_STATS = (
+    "total_templates",
+    "total_css_chars",
+    "total_js_chars",
+    "high_priority",
+    "medium_priority",
+    "templates_with_css",
+    "templates_with_js",
+    "total_css_gzip_bytes",
+    "total_js_gzip_bytes",
+    "render_blocking_scripts",
+)
+_ERROR_STATS = (
+    "high_priority",
+    "medium_priority",
+    "low_priority",
+    "syntax_errors",
+    "style_errors",
+    "critical_errors",
+)
+
+Snapshot = Dict[str, Optional[Tuple[int, int]]]
+
+
+# ----------------------------------------------------------------------------
+# Contribuição de um arquivo às estatísticas de cada analisador
+# ----------------------------------------------------------------------------
+
+
+def _violation_contribution(result: ViolationFileReport) -> Counter:
+    counts: Counter = Counter(total_files=1)
+    if result.get("type") == "Python":
+        counts["python_files"] += 1
+    elif result.get("type") == "HTML Template":
+        counts["html_files"] += 1
+    if result["violations"]:
+        if result["priority"] == "high":
+            counts["violation_files"] += 1
+            counts["high_priority"] += 1
+        else:
+            counts["warning_files"] += 1
+        if result["priority"] == "medium":
+            counts["medium_priority"] += 1
+    return counts
+
+
+def _has_inline(analysis: TemplateFileReport) -> bool:
+    return analysis["total_css_chars"] > 0 or analysis["total_js_chars"] > 0
+
+
+def _template_contribution(analysis: TemplateFileReport) -> Counter:
+    # Como em ``TemplatesAnalyzer.analyze``, só templates com CSS/JS inline
+    if not _has_inline(analysis):
+        return Counter()
+    counts: Counter = Counter(
+        total_templates=1,
+        total_css_chars=analysis["total_css_chars"],
+        total_js_chars=analysis["total_js_chars"],
+        templates_with_css=int(analysis["total_css_chars"] > 0),
+        templates_with_js=int(analysis["total_js_chars"] > 0),
+        total_css_gzip_bytes=analysis.get("css_gzip_bytes", 0),
+        total_js_gzip_bytes=analysis.get("js_gzip_bytes", 0),
+        render_blocking_scripts=analysis.get("render_blocking_scripts", 0),
+    )
+    if analysis["priority"] in ("high", "medium"):
+        counts[f"{analysis['priority']}_priority"] += 1
+    return counts
+
+
+def _error_contribution(entry: ErrorFileReport) -> Counter:
+    priority = entry.get("priority", "low")
+    counts: Counter = Counter(total_files=1, total_errors=entry.get("error_count", 0))
+    counts[f"{priority}_priority"] += 1
+    if priority == "high":
+        counts["critical_errors"] += 1
+    category = entry.get("category")
+    if category == "Erros de Sintaxe":
+        counts["syntax_errors"] += 1
+    elif category == "Erros de Estilo":
+        counts["style_errors"] += 1
+    return counts
+
+
+def _within(key: str, root: Path) -> bool:
+    base = source_key(root)
+    return key == base or key.startswith(base.rstrip(os.sep) + os.sep)
+
+
+def _matches_any(path: Path, patterns: Iterable[str]) -> bool:
+    return any(fnmatch.fnmatch(path.name, pattern) for pattern in patterns)
+
+
+# ----------------------------------------------------------------------------
+# Fontes de mudanças
+# ----------------------------------------------------------------------------
+
+
+class PollingWatcher:
+    """Detecta mudanças comparando mtime e tamanho do inventário.
+
+    Args:
+        inventory: Devolve os caminhos observados; ausentes também entram,
+            para que sua criação seja notada.
+        interval: Intervalo entre varreduras, em segundos.
+    """
+
+    backend = "polling"
+
+    def __init__(
+        self,
+        inventory: Callable[[], Iterable[Path]],
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        self.inventory = inventory
+        self.interval = interval
+        self._paths: Dict[str, Path] = {}
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        for path in self.inventory():
+            name = str(path)
+            self._paths.setdefault(name, Path(path))
+            try:
+                info = os.stat(name)
+            except OSError:
+                snapshot[name] = None
+                continue
+            # De um diretório só importa existir: os arquivos novos dentro
+            # dele já aparecem no próprio inventário
+            if stat.S_ISDIR(info.st_mode):
+                snapshot[name] = (0, 0)
+            else:
+                snapshot[name] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def changes(self, timeout: float = 0.0) -> Optional[Set[Path]]:
+        """Caminhos alterados, criados ou removidos desde a última chamada.
+
+        Espera até ``timeout`` segundos por alguma mudança.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            previous, self._snapshot = self._snapshot, snapshot
+            changed = {
+                self._paths[name]
+                for name in snapshot.keys() | previous.keys()
+                if snapshot.get(name) != previous.get(name)
+            }
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Observa a árvore do projeto com inotify (Linux).
+
+    Cada diretório não excluído recebe um observador; diretórios criados
+    depois passam a ser observados assim que o evento chega.
+
+    Args:
+        root: Raiz observada.
+        skip_dir: Indica diretórios que não precisam ser observados.
+
+    Raises:
+        OSError: Se o inotify não estiver disponível ou o limite de
+            observadores (``max_user_watches``) se esgotar.
+    """
+
+    backend = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(
+        self, root: Path, skip_dir: Callable[[Path], bool] = lambda path: False
+    ) -> None:
+        self.root = root
+        self.skip_dir = skip_dir
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_init1: {os.strerror(code)}")
+        self._watches: Dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    @staticmethod
+    def available() -> bool:
+        """Indica se a plataforma oferece inotify."""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            InotifyWatcher._load_libc()
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _load_libc() -> Any:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify indisponível")
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        return libc
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), self.MASK | self.IN_ONLYDIR
+        )
+        if wd < 0:
+            code = ctypes.get_errno()
+            # Diretório removido entre a listagem e o observador: nada a fazer
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(code, f"inotify_add_watch({directory}): {os.strerror(code)}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, top: Path) -> None:
+        for current, dirs, _ in os.walk(top):
+            directory = Path(current)
+            dirs[:] = [name for name in dirs if not self.skip_dir(directory / name)]
+            self._add_watch(directory)
+
+    def _read_events(self) -> Iterator[Tuple[int, int, Path]]:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + self._EVENT.size <= len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                directory = self._watches.get(wd)
+                if mask & self.IN_IGNORED:
+                    self._watches.pop(wd, None)
+                if directory is None and not mask & self.IN_Q_OVERFLOW:
+                    continue
+                path = directory / os.fsdecode(name) if directory and name else None
+                yield wd, mask, path or directory or self.root
+
+    def changes(self, timeout: float = 0.0) -> Optional[Set[Path]]:
+        """Caminhos tocados por eventos recebidos em até ``timeout`` segundos.
+
+        Devolve ``None`` se a fila do kernel transbordou: qualquer arquivo
+        pode ter mudado.
+        """
+        changed: Set[Path] = set()
+        wait = timeout
+        while select.select([self._fd], [], [], wait)[0]:
+            for _, mask, path in self._read_events():
+                if mask & self.IN_Q_OVERFLOW:
+                    logger.warning("Fila do inotify transbordou; revarrendo o projeto")
+                    return None
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    if not self.skip_dir(path):
+                        self._add_tree(path)
+                changed.add(path)
+            wait = COALESCE_DELAY
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches.clear()
+
+
+# ----------------------------------------------------------------------------
+# Motor de reanálise incremental
+# ----------------------------------------------------------------------------
+
+
+class WatchEngine:
+    """Mantém o resultado de um :class:`CodeAnalyzer` atualizado por arquivo.
+
+    Args:
+        analyzer: ``CodeAnalyzer`` do projeto (seus analisadores e
+            configuração são reaproveitados).
+        interval: Intervalo entre verificações, em segundos.
+        use_inotify: ``True`` exige inotify, ``False`` usa varredura
+            periódica; ``None`` (padrão) usa inotify quando disponível.
+
+    Analisadores de terceiros não têm API por arquivo: quando o inventário
+    deles muda, são reexecutados por inteiro (memorizados pelo
+    ``CodeAnalyzer``).
+    """
+
+    def __init__(
+        self,
+        analyzer: Any,
+        interval: float = DEFAULT_INTERVAL,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        self.analyzer = analyzer
+        self.project_path = Path(analyzer.project_path)
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.version = 0
+        self.watcher: Optional[Union[PollingWatcher, InotifyWatcher]] = None
+        self._lock = threading.RLock()
+        self._violations: Dict[str, ViolationFileReport] = {}
+        self._templates: Dict[str, TemplateFileReport] = {}
+        self._fingerprints: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        self._template_roots: List[Path] = []
+        self._errors: Dict[str, ErrorFileReport] = {}
+        self._extensions: Dict[str, Any] = {}
+        self.statistics: Dict[str, Counter] = {
+            name: Counter() for name in BUILTIN_ANALYZERS
+        }
+        self.quality_score = 100
+
+    @property
+    def backend(self) -> Optional[str]:
+        """``"inotify"`` ou ``"polling"`` (``None`` antes de :meth:`start`)."""
+        return self.watcher.backend if self.watcher is not None else None
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self) -> FullReport:
+        """Faz a análise de base e começa a observar o projeto.
+
+        Returns:
+            dict: Relatório completo da análise de base.
+
+        Raises:
+            AnalyzerExecutionError: Se ``use_inotify=True`` e o inotify não
+                puder ser usado.
+        """
+        with self._lock:
+            # O observador nasce antes da análise: nada escapa entre as duas
+            self.watcher = self._new_watcher()
+            self._rebaseline()
+            self.quality_score = self._score()
+            return self.report()
+
+    def close(self) -> None:
+        """Para de observar o projeto."""
+        with self._lock:
+            if self.watcher is not None:
+                self.watcher.close()
+                self.watcher = None
+
+    def __enter__(self) -> "WatchEngine":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _base_analyzers(self) -> List[BaseAnalyzer]:
+        return [
+            analyzer
+            for analyzer in self.analyzer.analyzers.values()
+            if isinstance(analyzer, BaseAnalyzer)
+        ]
+
+    def _skip_dir(self, path: Path) -> bool:
+        analyzers = self._base_analyzers()
+        return bool(analyzers) and all(a.should_skip(path) for a in analyzers)
+
+    def _inventory(self) -> List[Path]:
+        paths: List[Path] = []
+        for analyzer in self.analyzer.analyzers.values():
+            inventory = getattr(analyzer, "inventory", lambda: None)()
+            if inventory:
+                paths.extend(inventory)
+        return paths
+
+    def _new_watcher(self) -> Union[PollingWatcher, InotifyWatcher]:
+        if self.use_inotify is not False and InotifyWatcher.available():
+            try:
+                return InotifyWatcher(self.project_path, self._skip_dir)
+            except OSError as exc:
+                if self.use_inotify:
+                    raise AnalyzerExecutionError(
+                        f"Não foi possível usar o inotify: {exc}"
+                    ) from exc
+                logger.info("inotify indisponível (%s); usando varredura", exc)
+        elif self.use_inotify:
+            raise AnalyzerExecutionError("inotify não é suportado nesta plataforma")
+        return PollingWatcher(self._inventory, self.interval)
+
+    # ------------------------------------------------------------------
+    # Análise de base
+    # ------------------------------------------------------------------
+
+    def _rebaseline(self) -> None:
+        """Analisa todos os arquivos; os analisadores rodam em paralelo."""
+        tasks = {
+            "violations": self._baseline_violations,
+            "templates": self._baseline_templates,
+            "errors": self._baseline_errors,
+        }
+        selected = [name for name in tasks if name in self.analyzer.analyzers]
+        if selected:
+            with ThreadPoolExecutor(
+                max_workers=len(selected), thread_name_prefix="cha-watch"
+            ) as pool:
+                for future in [pool.submit(tasks[name]) for name in selected]:
+                    future.result()
+        self._refresh_extensions()
+
+    def _baseline_violations(self) -> None:
+        violations = self.analyzer.violations_analyzer
+        self.statistics["violations"].clear()
+        self._violations.clear()
+        for path in violations.inventory():
+            self._set_violation(source_key(path), violations.check_file(path))
+
+    def _baseline_templates(self) -> None:
+        templates = self.analyzer.templates_analyzer
+        self.statistics["templates"].clear()
+        self._templates.clear()
+        self._fingerprints.clear()
+        self._template_roots = templates.effective_roots()
+        for base, path in templates.template_files(self._template_roots):
+            self._analyze_template(path, base)
+
+    def _baseline_errors(self) -> None:
+        self.statistics["errors"].clear()
+        self._errors.clear()
+        for entry in self.analyzer.errors_analyzer.analyze()["errors"]:
+            self._set_error(source_key(self.project_path / entry["file"]), entry)
+
+    # ------------------------------------------------------------------
+    # Correção das estatísticas no lugar
+    # ------------------------------------------------------------------
+
+    def _set_violation(self, key: str, result: Optional[ViolationFileReport]) -> None:
+        stats = self.statistics["violations"]
+        old = self._violations.pop(key, None)
+        if old is not None:
+            stats.subtract(_violation_contribution(old))
+        if result is not None:
+            self._violations[key] = result
+            stats.update(_violation_contribution(result))
+
+    def _set_template(
+        self,
+        key: str,
+        analysis: Optional[TemplateFileReport],
+        fingerprints: Optional[List[Tuple[str, str, int, int]]] = None,
+    ) -> None:
+        stats = self.statistics["templates"]
+        old = self._templates.pop(key, None)
+        self._fingerprints.pop(key, None)
+        if old is not None:
+            stats.subtract(_template_contribution(old))
+        if analysis is not None:
+            self._templates[key] = analysis
+            self._fingerprints[key] = list(fingerprints or [])
+            stats.update(_template_contribution(analysis))
+
+    def _analyze_template(self, path: Path, base: Path) -> None:
+        analysis, collector = self.analyzer.templates_analyzer._analyze_template(
+            path, base
+        )
+        self._set_template(source_key(path), analysis, collector.fingerprints)
+
+    def _set_error(self, key: str, entry: Optional[ErrorFileReport]) -> None:
+        stats = self.statistics["errors"]
+        old = self._errors.pop(key, None)
+        if old is not None:
+            stats.subtract(_error_contribution(old))
+        if entry is not None:
+            self._errors[key] = entry
+            stats.update(_error_contribution(entry))
+
+    # ------------------------------------------------------------------
+    # Reanálise incremental
+    # ------------------------------------------------------------------
+
+    def _expand(self, paths: Iterable[Path]) -> Tuple[Dict[str, Path], Set[str]]:
+        """Separa arquivos existentes (com os de diretórios novos) e removidos.
+
+        Um caminho que já não existe remove também o que havia abaixo dele.
+        """
+        present: Dict[str, Path] = {}
+        gone: Set[str] = set()
+        for path in paths:
+            if path.is_file():
+                present[source_key(path)] = path
+            elif path.is_dir():
+                for current, dirs, files in os.walk(path):
+                    directory = Path(current)
+                    dirs[:] = [d for d in dirs if not self._skip_dir(directory / d)]
+                    for name in files:
+                        present[source_key(directory / name)] = directory / name
+            else:
+                gone.add(source_key(path))
+        return present, gone
+
+    def _tracked_under(self, gone: Set[str]) -> Set[str]:
+        tracked = self._violations.keys() | self._templates.keys() | self._errors.keys()
+        return {
+            key
+            for key in tracked
+            for root in gone
+            if key == root or key.startswith(root.rstrip(os.sep) + os.sep)
+        }
+
+    def _update_violations(self, present: Dict[str, Path], removed: Set[str]) -> bool:
+        violations = self.analyzer.violations_analyzer
+        patterns = tuple(violations.PYTHON_PATTERNS) + tuple(
+            violations.TEMPLATE_PATTERNS
+        )
+        touched = False
+        for key in removed & self._violations.keys():
+            self._set_violation(key, None)
+            touched = True
+        for key, path in present.items():
+            member = (
+                _matches_any(path, patterns)
+                and _within(key, violations.project_path)
+                and not violations.should_skip(path)
+            )
+            if member:
+                self._set_violation(key, violations.check_file(path))
+                touched = True
+            elif key in self._violations:
+                self._set_violation(key, None)
+                touched = True
+        return touched
+
+    def _template_root(self, key: str) -> Optional[Path]:
+        for root in self._template_roots:
+            if _within(key, root):
+                return root
+        return None
+
+    def _update_templates(self, present: Dict[str, Path], removed: Set[str]) -> bool:
+        templates = self.analyzer.templates_analyzer
+        # Um diretório de templates criado ou removido muda as raízes
+        if templates.effective_roots() != self._template_roots:
+            self._baseline_templates()
+            return True
+        touched = False
+        for key in removed & self._templates.keys():
+            self._set_template(key, None)
+            touched = True
+        for key, path in present.items():
+            base = self._template_root(key)
+            if base is not None and path.suffix == ".html":
+                if not templates.should_skip(path):
+                    self._analyze_template(path, base)
+                    touched = True
+                    continue
+            if key in self._templates:
+                self._set_template(key, None)
+                touched = True
+        return touched
+
+    def _update_errors(
+        self, present: Dict[str, Path], removed: Set[str], config_changed: bool
+    ) -> bool:
+        errors = self.analyzer.errors_analyzer
+        if config_changed:
+            # Outra configuração do Ruff muda o resultado de todos os arquivos
+            self._baseline_errors()
+            return True
+        root = errors.project_path / errors.target_dir
+        targets = {
+            key: path
+            for key, path in present.items()
+            if _matches_any(path, RUFF_FILE_PATTERNS)
+            and _within(key, root)
+            and not errors.should_skip(path)
+        }
+        stale = (removed | (present.keys() - targets.keys())) & self._errors.keys()
+        for key in stale:
+            self._set_error(key, None)
+        if not targets:
+            return bool(stale)
+        found = {
+            source_key(self.project_path / entry["file"]): entry
+            for entry in errors.analyze(files=list(targets.values()))["errors"]
+        }
+        for key in targets:
+            self._set_error(key, found.get(key))
+        return True
+
+    def _ruff_config_changed(self, paths: Iterable[Path]) -> bool:
+        errors = self.analyzer.errors_analyzer
+        directories = {
+            source_key(errors.project_path),
+            source_key(errors.project_path / errors.target_dir),
+        }
+        return any(
+            path.name in RUFF_CONFIG_FILES and source_key(path.parent) in directories
+            for path in paths
+        )
+
+    def _refresh_extensions(self) -> List[str]:
+        changed = []
+        for name in self.analyzer.analyzers:
+            if name in BUILTIN_ANALYZERS:
+                continue
+            result = self.analyzer.analyze(name)
+            if self._extensions.get(name) is not result:
+                self._extensions[name] = result
+                changed.append(name)
+        return changed
+
+    def _score(self) -> int:
+        return self.analyzer.report_generator.calculate_quality_score(
+            {"statistics": dict(self.statistics["violations"])},
+            {"statistics": dict(self.statistics["templates"])},
+            {"metadata": {"total_errors": self.statistics["errors"]["total_errors"]}},
+        )
+
+    def apply(
+        self, paths: Optional[Iterable[Union[str, Path]]]
+    ) -> Optional[WatchDelta]:
+        """Reanalisa os caminhos informados e corrige as estatísticas.
+
+        Args:
+            paths: Arquivos ou diretórios alterados, criados ou removidos;
+                ``None`` reanalisa o projeto inteiro.
+
+        Returns:
+            dict: O delta da rodada, ou ``None`` se nenhum resultado mudou.
+        """
+        with self._lock:
+            before = {name: Counter(s) for name, s in self.statistics.items()}
+            previous = self.quality_score
+            if paths is None:
+                self._rebaseline()
+                return self._delta(
+                    before, previous, [], [], list(self.analyzer.analyzers)
+                )
+            changed_paths = [Path(path) for path in paths]
+            present, gone = self._expand(changed_paths)
+            removed = self._tracked_under(gone)
+            touched = []
+            if self.analyzer.violations_analyzer is not None:
+                if self._update_violations(present, removed):
+                    touched.append("violations")
+            if self.analyzer.templates_analyzer is not None:
+                if self._update_templates(present, removed):
+                    touched.append("templates")
+            if self.analyzer.errors_analyzer is not None:
+                config_changed = self._ruff_config_changed(changed_paths)
+                if self._update_errors(present, removed, config_changed):
+                    touched.append("errors")
+            touched.extend(self._refresh_extensions())
+            if not touched:
+                return None
+            tracked = self._violations.keys() | self._templates.keys()
+            tracked |= self._errors.keys()
+            return self._delta(
+                before,
+                previous,
+                sorted(self._relpath(p) for k, p in present.items() if k in tracked),
+                sorted(self._relpath(Path(key)) for key in removed),
+                touched,
+            )
+
+    def _relpath(self, path: Path) -> str:
+        try:
+            return (
+                Path(source_key(path))
+                .relative_to(source_key(self.project_path))
+                .as_posix()
+            )
+        except ValueError:
+            return path.as_posix()
+
+    def _delta(
+        self,
+        before: Dict[str, Counter],
+        previous: int,
+        changed: List[str],
+        removed: List[str],
+        analyzers: List[str],
+    ) -> WatchDelta:
+        self.version += 1
+        self.quality_score = self._score()
+        statistics = {}
+        for name, stats in self.statistics.items():
+            diff = {
+                key: stats[key]
+                for key in stats.keys() | before[name].keys()
+                if stats[key] != before[name][key]
+            }
+            if diff:
+                statistics[name] = diff
+        return {
+            "version": self.version,
+            "timestamp": datetime.now().isoformat(),
+            "changed": changed,
+            "removed": removed,
+            "analyzers": analyzers,
+            "quality_score": self.quality_score,
+            "previous_score": previous,
+            "statistics": statistics,
+        }
+
+    def refresh(self, timeout: float = 0.0) -> Optional[WatchDelta]:
+        """Aplica as mudanças observadas (esperando até ``timeout`` segundos).
+
+        Returns:
+            dict: O delta da rodada, ou ``None`` se nada mudou.
+        """
+        if self.watcher is None:
+            raise AnalyzerExecutionError("WatchEngine.start() não foi chamado")
+        changes = self.watcher.changes(timeout)
+        if changes is not None and not changes:
+            return None
+        return self.apply(changes)
+
+    def watch(self) -> Iterator[WatchDelta]:
+        """Gera um delta a cada rodada com mudanças, indefinidamente."""
+        while self.watcher is not None:
+            delta = self.refresh(self.interval)
+            if delta is not None:
+                yield delta
+
+    # ------------------------------------------------------------------
+    # Relatórios
+    # ------------------------------------------------------------------
+
+    def _violations_report(self) -> ViolationsReport:
+        stats = {key: self.statistics["violations"][key] for key in _VIOLATION_STATS}
+        results = sorted(
+            self._violations.values(),
+            key=lambda r: (r.get("type") != "Python", r["file"]),
+        )
+        with_violations = [r for r in results if r["violations"]]
+        return cast(
+            ViolationsReport,
+            {
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "directory": str(self.project_path),
+                    "total_files": stats["total_files"],
+                    "violation_files": stats["violation_files"],
+                    "warning_files": stats["warning_files"],
+                },
+                "violations": [r for r in with_violations if r["priority"] == "high"],
+                "warnings": [r for r in with_violations if r["priority"] != "high"],
+                "statistics": stats,
+            },
+        )
+
+    def _templates_report(self) -> TemplatesReport:
+        templates = self.analyzer.templates_analyzer
+        if not self._template_roots:
+            return templates._empty_report()
+        results = [a for a in self._templates.values() if _has_inline(a)]
+        results.sort(
+            key=lambda x: (
+                x.get("wire_bytes", 0),
+                x["total_css_chars"] + x["total_js_chars"],
+            ),
+            reverse=True,
+        )
+        # Duplicatas: o índice é refeito das impressões digitais guardadas,
+        # sem reler nenhum template
+        duplicates = _DuplicateIndex()
+        for key in sorted(self._fingerprints):
+            duplicates.add(self._templates[key]["path"], self._fingerprints[key])
+        stats = {key: self.statistics["templates"][key] for key in _TEMPLATE_STATS}
+        return cast(
+            TemplatesReport,
+            {
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "templates_paths": [str(p) for p in self._template_roots],
+                    "total_templates": stats["total_templates"],
+                    "compact": templates.compact,
+                },
+                "templates": results,
+                "statistics": stats,
+                "duplicates": duplicates.report(templates.duplicate_min_files),
+            },
+        )
+
+    def _errors_report(self) -> ErrorsReport:
+        errors = self.analyzer.errors_analyzer
+        stats = self.statistics["errors"]
+        return cast(
+            ErrorsReport,
+            {
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "total_errors": stats["total_errors"],
+                    "total_files": stats["total_files"],
+                    "ruff_processes": errors.ruff_processes,
+                    "ruff_backend": errors.backend_used,
+                },
+                "errors": sorted(self._errors.values(), key=lambda e: e["file"]),
+                "statistics": {key: stats[key] for key in _ERROR_STATS},
+            },
+        )
+
+    def reports(self) -> Dict[str, Any]:
+        """Relatórios atuais de cada analisador, montados do estado incremental."""
+        with self._lock:
+            builders = {
+                "violations": self._violations_report,
+                "templates": self._templates_report,
+                "errors": self._errors_report,
+            }
+            reports = {
+                name: (
+                    builder() if name in self.analyzer.analyzers else empty_report(name)
+                )
+                for name, builder in builders.items()
+            }
+            reports.update(self._extensions)
+            return reports
+
+    def report(self, output_dir: Optional[str] = None) -> FullReport:
+        """Relatório completo atual, sem reexecutar nenhuma análise."""
+        reports = self.reports()
+        return self.analyzer.report_generator.generate_full_report(
+            violations=reports.pop("violations"),
+            templates=reports.pop("templates"),
+            errors=reports.pop("errors"),
+            output_dir=output_dir,
+            analyzers=list(self.analyzer.analyzers),
+            extensions=reports,
+        )
+
+
+__all__ = ["InotifyWatcher", "PollingWatcher", "WatchEngine"]
@@ -2,9 +2,11 @@
 
 import asyncio
 import json
+import threading
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import uvicorn
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
@@ -12,22 +14,33 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from ..analyzers.errors import ErrorsAnalyzer
-from ..analyzers.templates import TemplatesAnalyzer
-from ..analyzers.violations import ViolationsAnalyzer
-from ..reports.generator import ReportGenerator
-from ..schemas import DashboardMetrics
+from .. import CodeAnalyzer
+from ..schemas import DashboardMetrics, FullReport, WatchDelta
 from ..version import __version__
+from ..watch import WatchEngine
+
+# Intervalo entre verificações de mudanças enviadas pelo WebSocket
+UPDATE_INTERVAL = 1.0
 
 
 class DashboardServer:
     """Servidor do dashboard interativo."""
 
     def __init__(self, project_path: str = "."):
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            yield
+            # Encerra o observador e o ruff server persistente com o dashboard
+            if self.watch_engine is not None:
+                self.watch_engine.close()
+            if self.errors_analyzer is not None:
+                self.errors_analyzer.close()
+
         self.app = FastAPI(
             title="CodeHealthAnalyzer Dashboard",
             description="Dashboard interativo para análise de qualidade de código",
             version=__version__,
+            lifespan=lifespan,
         )
         self.project_path = Path(project_path)
         self.connected_clients: List[WebSocket] = []
@@ -42,11 +55,25 @@ class DashboardServer:
         # Configurar rotas
         self._setup_routes()
 
-        # Inicializar analisadores
-        self.violations_analyzer = ViolationsAnalyzer(str(self.project_path))
-        self.templates_analyzer = TemplatesAnalyzer(str(self.project_path))
-        self.errors_analyzer = ErrorsAnalyzer(str(self.project_path))
-        self.report_generator = ReportGenerator()
+        # Inicializar analisadores. O dashboard não exibe o corpo dos trechos
+        # inline (modo compacto); o ruff server persistente relinta só os
+        # arquivos alterados, e sem ele o cache por arquivo cumpre o papel
+        self.code_analyzer = CodeAnalyzer(
+            str(self.project_path),
+            {
+                "templates_compact": True,
+                "ruff_cache": True,
+                "ruff_backend": "server",
+            },
+        )
+        self.violations_analyzer = self.code_analyzer.violations_analyzer
+        self.templates_analyzer = self.code_analyzer.templates_analyzer
+        self.errors_analyzer = self.code_analyzer.errors_analyzer
+        self.report_generator = self.code_analyzer.report_generator
+        # Criado na primeira consulta: análise de base e depois só deltas
+        self.watch_engine: Optional[WatchEngine] = None
+        self._report: Optional[FullReport] = None
+        self._refresh_lock = threading.Lock()
 
     def _setup_routes(self):
         """Configura as rotas da aplicação."""
@@ -67,38 +94,52 @@ class DashboardServer:
         @self.app.get("/api/violations")
         async def get_violations():
             """Retorna violações detectadas."""
-            violations = self.violations_analyzer.analyze()
-            return violations
+            report, _ = await self._refresh()
+            return report["violations"]
 
         @self.app.get("/api/templates")
         async def get_templates():
             """Retorna análise de templates."""
-            templates = self.templates_analyzer.analyze()
-            return templates
+            report, _ = await self._refresh()
+            return report["templates"]
 
         @self.app.get("/api/errors")
         async def get_errors():
             """Retorna erros de linting."""
-            errors = self.errors_analyzer.analyze()
-            return errors
+            report, _ = await self._refresh()
+            return report["errors"]
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             """WebSocket para atualizações em tempo real."""
             await self._handle_websocket(websocket)
 
+    def _refresh_sync(self) -> Tuple[FullReport, Optional[WatchDelta]]:
+        with self._refresh_lock:
+            engine = self.watch_engine
+            if engine is None:
+                engine = WatchEngine(self.code_analyzer)
+                self._report = engine.start()
+                self.watch_engine = engine
+                return self._report, None
+            delta = engine.refresh()
+            if delta is not None or self._report is None:
+                self._report = engine.report()
+            return self._report, delta
+
+    async def _refresh(self) -> Tuple[FullReport, Optional[WatchDelta]]:
+        """Relatório atual: só os arquivos alterados desde a última consulta
+        são reanalisados."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._refresh_sync)
+
     async def _get_current_metrics(self) -> DashboardMetrics:
         """Obtém métricas atuais do projeto."""
         try:
-            # Executar análises
-            violations = self.violations_analyzer.analyze()
-            templates = self.templates_analyzer.analyze()
-            errors = self.errors_analyzer.analyze()
-
-            # Gerar relatório consolidado
-            report = self.report_generator.generate_full_report(
-                violations=violations, templates=templates, errors=errors
-            )
+            report, delta = await self._refresh()
+            violations = report["violations"]
+            templates = report["templates"]
+            errors = report["errors"]
 
             # Extrair métricas principais a partir dos esquemas atuais
             vio_stats = violations.get("statistics", {})
@@ -136,6 +177,8 @@ class DashboardServer:
                 "files": files_items,
                 "generated_at": report.get("metadata", {}).get("generated_at", ""),
                 "project": str(self.project_path),
+                "version": self.watch_engine.version if self.watch_engine else 0,
+                "delta": delta,
             }
 
             return metrics
@@ -165,11 +208,15 @@ class DashboardServer:
         self.connected_clients.append(websocket)
 
         try:
+            sent: Any = object()
             while True:
-                # Enviar métricas atualizadas a cada 5 segundos
+                # Só envia quando algum arquivo mudou (nova versão do estado)
                 metrics = await self._get_current_metrics()
-                await websocket.send_text(json.dumps(metrics))
-                await asyncio.sleep(5)
+                version = metrics.get("version", metrics.get("error"))
+                if version != sent:
+                    await websocket.send_text(json.dumps(metrics))
+                    sent = version
+                await asyncio.sleep(UPDATE_INTERVAL)
 
         except WebSocketDisconnect:
             self.connected_clients.remove(websocket)
@@ -180,6 +180,106 @@ def test_code_analyzer_generates_full_report(temp_project_dir, sample_html_file,
 
     assert report["summary"]["quality_score"] >= 0 # Score should be calculated
 
+def test_full_report_runs_analyzers_concurrently(temp_project_dir, mocker):
+    """Analyzers overlap: latency tracks the slowest one and timings are recorded."""
+    import time
+
+    def slow(result, delay):
+        def run(*args, **kwargs):
+            time.sleep(delay)
+            return result
+        return run
+
+    analyzer = CodeAnalyzer(str(temp_project_dir))
+    mocker.patch.object(analyzer, "analyze_violations", slow({"metadata": {}, "statistics": {}}, 0.3))
+    mocker.patch.object(analyzer, "analyze_templates", slow({"metadata": {}, "templates": []}, 0.3))
+    mocker.patch.object(analyzer, "analyze_errors", slow({"metadata": {}, "errors": []}, 0.3))
+
+    started = time.perf_counter()
+    report = analyzer.generate_full_report()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8  # sequencial levaria ~0.9s
+    timings = report["metadata"]["timings"]
+    assert set(timings) == {"violations", "templates", "errors", "total"}
+    assert all(timings[name] >= 0.29 for name in ("violations", "templates", "errors"))
+    assert timings["total"] < sum(timings[name] for name in ("violations", "templates", "errors"))
+
+def test_code_analyzer_memoizes_until_inventory_changes(temp_project_dir, mocker):
+    """Repeated calls reuse results; touching a file or invalidate() recomputes."""
+    import os
+
+    module = temp_project_dir / "python_files" / "mod.py"
+    module.write_text("x = 1\n")
+    analyzer = CodeAnalyzer(str(temp_project_dir))
+    spy = mocker.spy(analyzer.violations_analyzer, "analyze")
+
+    first = analyzer.analyze_violations()
+    assert analyzer.analyze_violations() is first
+    assert spy.call_count == 1
+
+    module.write_text("x = 1\ny = 2\n")
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    analyzer.analyze_violations()
+    assert spy.call_count == 2
+
+    (temp_project_dir / "python_files" / "new.py").write_text("z = 3\n")
+    analyzer.analyze_violations()
+    assert spy.call_count == 3
+
+    analyzer.invalidate()
+    analyzer.analyze_violations()
+    assert spy.call_count == 4
+
+
+def test_quality_score_after_full_report_is_free(temp_project_dir, mocker):
+    """get_quality_score reuses the analyses made by generate_full_report."""
+    (temp_project_dir / "python_files" / "mod.py").write_text("x = 1\n")
+    analyzer = CodeAnalyzer(str(temp_project_dir))
+    errors = {"metadata": {"total_errors": 0}, "errors": []}
+    run_errors = mocker.patch.object(analyzer.errors_analyzer, "analyze", return_value=errors)
+    count_errors = mocker.patch.object(analyzer.errors_analyzer, "count_errors")
+    run_violations = mocker.spy(analyzer.violations_analyzer, "analyze")
+    run_templates = mocker.spy(analyzer.templates_analyzer, "analyze")
+
+    report = analyzer.generate_full_report()
+    assert analyzer.get_quality_score() == report["quality_score"]
+
+    assert run_errors.call_count == 1
+    assert run_violations.call_count == 1
+    assert run_templates.call_count == 1
+    count_errors.assert_not_called()
+
+def test_full_report_with_exhausted_budget_is_partial(temp_project_dir):
+    """A zero budget yields a provisional report listing the skipped files."""
+    (temp_project_dir / "python_files" / "mod.py").write_text("x = 1\n")
+    (temp_project_dir / "templates" / "page.html").write_text("<p>oi</p>\n")
+    analyzer = CodeAnalyzer(str(temp_project_dir))
+
+    report = analyzer.generate_full_report(time_budget=0)
+
+    metadata = report["metadata"]
+    assert metadata["time_budget"] == 0
+    assert metadata["completeness"] < 1
+    assert metadata["provisional"] is True
+    assert any(path.endswith("mod.py") for path in metadata["skipped_files"])
+    assert report["summary"]["provisional"] is True
+    # Resultados parciais não são memoizados
+    assert analyzer._results == {}
+
+    full = analyzer.generate_full_report(time_budget=60)
+    assert full["metadata"]["completeness"] == 1.0
+    assert full["metadata"]["skipped_files"] == []
+    assert full["summary"]["provisional"] is False
+
+
+def test_full_report_without_budget_has_no_completeness(temp_project_dir):
+    report = CodeAnalyzer(str(temp_project_dir)).generate_full_report()
+    assert "completeness" not in report["summary"]
+    assert "time_budget" not in report["metadata"]
+
+
 def test_i18n_error_logging(temp_project_dir, caplog, mocker):
     """Test that i18n error handling logs exceptions."""
     from codehealthanalyzer.i18n import set_language, DEFAULT_LANGUAGE
@@ -108,6 +108,23 @@ def test_no_default_excludes_still_applies_user_excludes(tmp_path):
     assert analyzer.should_skip(target) is True
 
 
+def test_should_skip_user_glob_pattern(tmp_path):
+    analyzer = _make(
+        tmp_path, config={"no_default_excludes": True, "exclude_dirs": ["*_pb2.py"]}
+    )
+    assert analyzer.should_skip(tmp_path / "api" / "service_pb2.py") is True
+    assert analyzer.should_skip(tmp_path / "api" / "service.py") is False
+
+
+def test_exclusion_set_shared_and_immutable(tmp_path):
+    first = _make(tmp_path, config={"exclude_dirs": ["vendor"]})
+    second = _make(tmp_path, config={"exclude_dirs": ["vendor"]})
+    assert first.exclusions is second.exclusions
+    assert first.exclusions.patterns[-1] == "vendor"
+    with pytest.raises(AttributeError):
+        first.exclusions.patterns = ()
+
+
 # ---------------------------------------------------------------------------
 # relpath
 # ---------------------------------------------------------------------------
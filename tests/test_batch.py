@@ -0,0 +1,131 @@
+"""Testes da análise em lote (vários projetos em um processo)."""
+
+import json
+
+import pytest
+
+from codehealthanalyzer import CodeAnalyzer, analyze_many
+from codehealthanalyzer.batch import BatchProject, load_manifest
+from codehealthanalyzer.exceptions import ConfigurationError
+
+
+def _project(root, name, source="x = 1\n"):
+    package = root / name / "pkg"
+    package.mkdir(parents=True)
+    (package / "mod.py").write_text(source, encoding="utf-8")
+    return root / name
+
+
+def test_load_manifest_json_resolves_relative_paths(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "config": {"ruff_jobs": 1},
+                "projects": [
+                    "svc-a",
+                    {
+                        "path": "/abs/svc-b",
+                        "name": "b",
+                        "config": {"target_dir": "src"},
+                    },
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    projects, config = load_manifest(manifest)
+
+    assert config == {"ruff_jobs": 1}
+    assert projects == [
+        BatchProject(tmp_path / "svc-a"),
+        BatchProject(tmp_path.joinpath("/abs/svc-b"), "b", {"target_dir": "src"}),
+    ]
+
+
+def test_load_manifest_text_skips_comments(tmp_path):
+    manifest = tmp_path / "batch.txt"
+    manifest.write_text("# serviços\nsvc-a\n\nsvc-b  # legado\n", encoding="utf-8")
+
+    projects, config = load_manifest(manifest)
+
+    assert [project.path for project in projects] == [
+        tmp_path / "svc-a",
+        tmp_path / "svc-b",
+    ]
+    assert config == {}
+
+
+@pytest.mark.parametrize("content", ["{", '{"projects": "svc"}', '[{"name": "x"}]'])
+def test_load_manifest_rejects_invalid_json(tmp_path, content):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(content, encoding="utf-8")
+    with pytest.raises(ConfigurationError):
+        load_manifest(manifest)
+
+
+def test_analyze_many_writes_reports_and_index(tmp_path):
+    first = _project(tmp_path / "a", "svc")
+    second = _project(tmp_path / "b", "svc")
+    out = tmp_path / "out"
+
+    index = analyze_many(
+        [first, second, tmp_path / "missing"], output_dir=out, analyzers=["violations"]
+    )
+
+    names = [entry["name"] for entry in index["projects"]]
+    assert names == ["svc", "svc-2", "missing"]
+    assert [entry["status"] for entry in index["projects"]] == ["ok", "ok", "error"]
+    assert index["failed_projects"] == 1
+    assert index["average_quality_score"] == 100
+    assert (out / "svc" / "full_report.json").exists()
+    assert (out / "svc-2" / "full_report.json").exists()
+    assert json.loads((out / "index.json").read_text(encoding="utf-8")) == index
+
+
+def test_analyze_many_shares_pool_and_cache(tmp_path, mocker):
+    projects = [_project(tmp_path, f"svc{i}") for i in range(3)]
+    run = mocker.spy(CodeAnalyzer, "generate_full_report")
+    seen = []
+
+    index = analyze_many(
+        projects,
+        jobs=2,
+        analyzers=["violations", "templates"],
+        on_report=lambda entry, report: seen.append(entry["name"]),
+    )
+
+    assert sorted(seen) == ["svc0", "svc1", "svc2"]
+    assert index["jobs"] == 2
+    executors = {id(call.kwargs["executor"]) for call in run.call_args_list}
+    caches = {id(call.kwargs["artifacts"]) for call in run.call_args_list}
+    assert len(executors) == len(caches) == 1
+
+
+def test_analyze_many_divides_ruff_jobs_across_projects(tmp_path, mocker):
+    projects = [_project(tmp_path, f"svc{i}") for i in range(4)]
+    created = mocker.spy(CodeAnalyzer, "__init__")
+
+    analyze_many(
+        projects + [BatchProject(tmp_path / "svc0", "own", {"ruff_jobs": 3})],
+        config={"ruff_jobs": 8},
+        jobs=3,
+        analyzers=["violations"],
+    )
+
+    jobs = sorted(call.args[2]["ruff_jobs"] for call in created.call_args_list)
+    assert jobs == [2, 2, 2, 2, 3]
+
+
+def test_analyze_many_project_config_overrides_batch_config(tmp_path):
+    project = _project(tmp_path, "svc", "def f():\n" + "    x = 1\n" * 60)
+    limits = {"limits": {"python_function": {"yellow": 100, "red": 200}}}
+
+    index = analyze_many(
+        [BatchProject(project, config=limits)],
+        config={"limits": {"python_function": {"yellow": 5, "red": 10}}},
+        analyzers=["violations"],
+    )
+
+    assert index["projects"][0]["summary"]["high_priority_issues"] == 0
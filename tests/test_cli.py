@@ -230,6 +230,22 @@ def test_templates_runs(runner, project, tmp_path):
     assert (out / "templates_report.json").exists()
 
 
+def test_templates_compact_omits_snippet_bodies(runner, project, tmp_path):
+    tpl_dir = project / "templates"
+    tpl_dir.mkdir()
+    (tpl_dir / "a.html").write_text("<style>body{}</style>", encoding="utf-8")
+    out = tmp_path / "out"
+    result = runner.invoke(
+        cli,
+        ["templates", str(project), "--output", str(out), "--compact"],
+    )
+    assert result.exit_code == 0
+    data = json.loads((out / "templates_report.json").read_text(encoding="utf-8"))
+    asset = data["templates"]["templates"][0]["css_style_tags"][0]
+    assert "content" not in asset
+    assert "hash" in asset
+
+
 # ---------------------------------------------------------------------------
 # errors
 # ---------------------------------------------------------------------------
@@ -268,6 +284,15 @@ def test_score_outputs_number(runner, project):
     assert any(c.isdigit() for c in result.output)
 
 
+def test_score_uses_counts_only_errors(runner, project):
+    with patch("shutil.which", return_value=None), patch(
+        "codehealthanalyzer.analyzers.errors.ErrorsAnalyzer.analyze"
+    ) as full_analysis:
+        result = runner.invoke(cli, ["score", str(project)])
+    assert result.exit_code == 0
+    full_analysis.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # info
 # ---------------------------------------------------------------------------
@@ -320,3 +345,66 @@ def test_format_runs_without_tools(runner, project):
     with patch("shutil.which", return_value=None):
         result = runner.invoke(cli, ["format", str(project)])
     assert result.exit_code == 0
+
+
+def test_analyze_only_runs_selected_analyzers(runner, project, tmp_path):
+    out = tmp_path / "out"
+    with patch(
+        "codehealthanalyzer.analyzers.errors.ErrorsAnalyzer.analyze"
+    ) as errors, patch(
+        "codehealthanalyzer.analyzers.templates.TemplatesAnalyzer.analyze"
+    ) as templates:
+        result = runner.invoke(
+            cli, ["analyze", str(project), "--output", str(out), "--only", "violations"]
+        )
+    assert result.exit_code == 0
+    errors.assert_not_called()
+    templates.assert_not_called()
+    report = json.loads((out / "analysis_report.json").read_text(encoding="utf-8"))
+    assert report["summary"]["total_errors"] == 0
+
+
+def test_analyze_time_budget_marks_score_provisional(runner, project, tmp_path):
+    out = tmp_path / "out"
+    result = runner.invoke(
+        cli, ["analyze", str(project), "--output", str(out), "--time-budget", "0"]
+    )
+    assert result.exit_code == 0
+    assert "Score provisório" in result.output
+    report = json.loads((out / "analysis_report.json").read_text(encoding="utf-8"))
+    assert report["summary"]["provisional"] is True
+    assert report["metadata"]["skipped_files"]
+
+
+def test_score_sample_prints_interval(runner, project):
+    result = runner.invoke(cli, ["score", str(project), "--sample", "0.5", "--seed", "1"])
+    assert result.exit_code == 0
+    assert "Score de Qualidade" in result.output
+    assert "IC 95%" in result.output
+    assert "semente 1" in result.output
+
+
+def test_analyze_many_writes_one_report_per_project(runner, project, tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(
+        json.dumps({"projects": [str(project), {"path": str(project), "name": "again"}]}),
+        encoding="utf-8",
+    )
+    out = tmp_path / "out"
+    result = runner.invoke(
+        cli, ["analyze-many", str(manifest), "--output", str(out), "--only", "violations"]
+    )
+    assert result.exit_code == 0
+    assert "falhas: 0" in result.output
+    index = json.loads((out / "index.json").read_text(encoding="utf-8"))
+    assert [entry["status"] for entry in index["projects"]] == ["ok", "ok"]
+    for entry in index["projects"]:
+        assert (out / entry["report_dir"] / "summary_report.json").exists()
+
+
+def test_analyze_skip_unknown_analyzer_is_reported(runner, project, tmp_path):
+    result = runner.invoke(
+        cli, ["analyze", str(project), "--output", str(tmp_path / "o"), "--skip", "x"]
+    )
+    assert "Configuração inválida" in result.output
+    assert "desconhecido" in result.output
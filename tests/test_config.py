@@ -66,3 +66,28 @@ def test_no_default_excludes_coerced_to_bool():
 def test_ruff_fix_coerced_to_bool():
     assert normalize_config({"ruff_fix": "yes"})["ruff_fix"] is True
     assert normalize_config({"ruff_fix": ""})["ruff_fix"] is False
+
+
+def test_ruff_backend_validated():
+    assert normalize_config({})["ruff_backend"] == "cli"
+    assert normalize_config({"ruff_backend": "SERVER"})["ruff_backend"] == "server"
+    with pytest.raises(ConfigurationError):
+        normalize_config({"ruff_backend": "daemon"})
+
+
+def test_time_budget_validated():
+    assert normalize_config({}).get("time_budget") is None
+    assert normalize_config({"time_budget": "2.5"})["time_budget"] == 2.5
+    with pytest.raises(ConfigurationError):
+        normalize_config({"time_budget": -1})
+    with pytest.raises(ConfigurationError):
+        normalize_config({"time_budget": "soon"})
+
+
+def test_sampling_options_validated():
+    assert normalize_config({"sample_fraction": "0.25"})["sample_fraction"] == 0.25
+    assert normalize_config({"sample_seed": 3})["sample_seed"] == 3
+    with pytest.raises(ConfigurationError):
+        normalize_config({"sample_fraction": 0})
+    with pytest.raises(ConfigurationError):
+        normalize_config({"sample_seed": "abc"})
@@ -0,0 +1,220 @@
+"""Testes do daemon de análise residente."""
+
+import os
+import socket
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from codehealthanalyzer import CodeAnalyzer
+from codehealthanalyzer.analyzers.violations import ViolationsAnalyzer
+from codehealthanalyzer import daemon as daemon_module
+from codehealthanalyzer.cli.main import cli
+from codehealthanalyzer.daemon import (
+    AnalysisDaemon,
+    DaemonClient,
+    default_socket_path,
+    project_request,
+    request_if_running,
+    supported,
+)
+from codehealthanalyzer.exceptions import AnalyzerExecutionError, ConfigurationError
+
+pytestmark = pytest.mark.skipif(not supported(), reason="requer sockets Unix")
+
+
+@pytest.fixture
+def project(tmp_path):
+    package = tmp_path / "proj" / "pkg"
+    package.mkdir(parents=True)
+    (package / "mod.py").write_text("def f():\n" + "    x = 1\n" * 60, encoding="utf-8")
+    return tmp_path / "proj"
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    socket_path = tmp_path / "d.sock"
+    monkeypatch.setenv("CHA_DAEMON_SOCKET", str(socket_path))
+    monkeypatch.delenv("CHA_NO_DAEMON", raising=False)
+    daemon = AnalysisDaemon(socket_path, max_projects=2)
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+def test_ping_reports_daemon_state(running_daemon):
+    info = DaemonClient().request("ping")
+    assert info["projects"] == 0
+    assert DaemonClient().running()
+
+
+def test_analyze_matches_local_report_and_stays_warm(running_daemon, project, mocker):
+    spy = mocker.spy(ViolationsAnalyzer, "analyze")
+    client = DaemonClient()
+
+    first = client.request(
+        "analyze", **project_request(project, analyzers=["violations"])
+    )
+    second = client.request(
+        "analyze", **project_request(project, analyzers=["violations"])
+    )
+
+    local = CodeAnalyzer(str(project), analyzers=["violations"]).generate_full_report()
+    assert first["quality_score"] == second["quality_score"] == local["quality_score"]
+    # A segunda requisição reaproveita o resultado memorizado no daemon
+    assert spy.call_count == 2  # daemon (uma vez) + análise local
+    assert client.request("ping")["projects"] == 1
+
+
+def test_score_and_violations_share_the_warm_analyzer(running_daemon, project):
+    client = DaemonClient()
+    score = client.request("score", **project_request(project))
+    report = client.request("violations", **project_request(project))
+
+    assert score == CodeAnalyzer(str(project)).get_quality_score()
+    assert report["statistics"]["high_priority"] == 1
+    assert client.request("ping")["projects"] == 1
+
+
+def test_daemon_errors_are_raised_on_the_client(running_daemon, tmp_path):
+    client = DaemonClient()
+    with pytest.raises(ConfigurationError, match="não encontrado"):
+        client.request("score", **project_request(tmp_path / "missing"))
+    with pytest.raises(ConfigurationError, match="desconhecido"):
+        client.request("explode")
+
+
+def test_least_recently_used_project_is_evicted(running_daemon, tmp_path):
+    client = DaemonClient()
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        client.request(
+            "score", **project_request(tmp_path / name, analyzers=["violations"])
+        )
+    assert client.request("ping")["projects"] == 2
+
+
+def test_bind_replaces_stale_socket_and_refuses_duplicates(running_daemon, tmp_path):
+    with pytest.raises(AnalyzerExecutionError, match="já em execução"):
+        AnalysisDaemon(running_daemon.socket_path).bind()
+
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as orphan:
+        orphan.bind(str(stale))
+    daemon = AnalysisDaemon(stale)
+    server = daemon.bind()
+    server.server_close()
+    stale.unlink()
+
+
+def test_bind_refuses_to_replace_non_socket(tmp_path):
+    path = tmp_path / "file.sock"
+    path.write_text("dados", encoding="utf-8")
+
+    with pytest.raises(AnalyzerExecutionError, match="não é um socket"):
+        AnalysisDaemon(path).bind()
+    assert path.read_text(encoding="utf-8") == "dados"
+
+
+def test_bind_refuses_socket_of_another_user(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon_module, "_uid", lambda: os.getuid() + 1)
+
+    with pytest.raises(AnalyzerExecutionError, match="outro usuário"):
+        AnalysisDaemon(running_daemon.socket_path).bind()
+    assert running_daemon.socket_path.exists()
+
+
+def test_client_ignores_socket_of_another_user(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon_module, "_uid", lambda: os.getuid() + 1)
+
+    with pytest.raises(PermissionError, match="outro usuário"):
+        DaemonClient().request("ping")
+    assert not DaemonClient().running()
+    assert request_if_running("ping") is None
+
+
+def test_client_ignores_non_socket(tmp_path, monkeypatch):
+    path = tmp_path / "fake.sock"
+    path.write_text('{"ok": true, "result": {}}\n', encoding="utf-8")
+    monkeypatch.setenv("CHA_DAEMON_SOCKET", str(path))
+    monkeypatch.delenv("CHA_NO_DAEMON", raising=False)
+
+    with pytest.raises(PermissionError, match="não é um socket"):
+        DaemonClient().request("ping")
+    assert not DaemonClient().running()
+    assert request_if_running("ping") is None
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="requer SO_PEERCRED")
+def test_client_checks_daemon_peer_credentials(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon_module, "_check_socket", lambda path: True)
+    monkeypatch.setattr(daemon_module, "_uid", lambda: os.getuid() + 1)
+
+    with pytest.raises(PermissionError, match="daemon no socket"):
+        DaemonClient().request("ping")
+
+
+def test_fallback_socket_lives_in_private_directory(tmp_path, monkeypatch):
+    for name in ("CHA_DAEMON_SOCKET", "XDG_RUNTIME_DIR"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(daemon_module.tempfile, "gettempdir", lambda: str(tmp_path))
+    path = default_socket_path()
+    assert path.parent == tmp_path / f"codehealthanalyzer-{os.getuid()}"
+
+    server = AnalysisDaemon(path).bind()
+    server.server_close()
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+    path.unlink()
+
+    path.parent.rmdir()
+    (tmp_path / "other").mkdir(mode=0o700)
+    path.parent.symlink_to(tmp_path / "other")
+    with pytest.raises(AnalyzerExecutionError, match="não é um diretório"):
+        AnalysisDaemon(path).bind()
+
+    path.parent.unlink()
+    path.parent.mkdir(mode=0o755)
+    path.parent.chmod(0o755)
+    with pytest.raises(AnalyzerExecutionError, match="acessível a outros"):
+        AnalysisDaemon(path).bind()
+
+
+def test_request_if_running_falls_back_without_daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHA_DAEMON_SOCKET", str(tmp_path / "none.sock"))
+    assert request_if_running("ping") is None
+
+
+def test_request_if_running_can_be_disabled(running_daemon, monkeypatch):
+    assert request_if_running("ping") is not None
+    monkeypatch.setenv("CHA_NO_DAEMON", "1")
+    assert request_if_running("ping") is None
+
+
+def test_cli_score_is_served_by_daemon(running_daemon, project):
+    result = CliRunner().invoke(cli, ["score", str(project)])
+    assert result.exit_code == 0
+    assert "Score de Qualidade" in result.output
+    assert DaemonClient().request("ping")["projects"] == 1
+
+    CliRunner().invoke(cli, ["score", str(project), "--no-daemon"])
+    assert DaemonClient().request("ping")["projects"] == 1
+
+
+def test_stop_shuts_down_and_removes_socket(tmp_path, monkeypatch):
+    socket_path = tmp_path / "s.sock"
+    monkeypatch.setenv("CHA_DAEMON_SOCKET", str(socket_path))
+    daemon = AnalysisDaemon(socket_path)
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+
+    result = CliRunner().invoke(cli, ["daemon", "--stop"])
+
+    assert "encerrado" in result.output
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not socket_path.exists()
@@ -0,0 +1,95 @@
+"""Testes para o armazenamento colunar de diagnósticos."""
+
+import random
+
+from codehealthanalyzer.analyzers.error_store import ErrorStore
+from codehealthanalyzer.analyzers.errors import ErrorsAnalyzer
+
+
+def _diagnostic(filename, row, code, message="msg", rule=""):
+    return {
+        "filename": filename,
+        "location": {"row": row, "column": 1},
+        "code": code,
+        "message": message,
+        "rule": rule,
+    }
+
+
+def _reference_process(analyzer, raw_errors):
+    """Agrupamento por diagnóstico (comportamento anterior ao store colunar)."""
+    files = {}
+    for error in raw_errors:
+        filename = error["filename"]
+        if analyzer.exclusions.matches(filename):
+            continue
+        data = files.setdefault(
+            filename,
+            {
+                "file": filename,
+                "error_count": 0,
+                "errors": [],
+                "priority": "low",
+                "category": "Outros",
+            },
+        )
+        data["errors"].append(
+            {
+                "line": error["location"]["row"],
+                "column": error["location"]["column"],
+                "code": error["code"],
+                "message": error["message"],
+                "rule": error["rule"],
+            }
+        )
+        data["error_count"] += 1
+        priority = analyzer.determine_priority(error)
+        if priority == "high":
+            data["priority"] = "high"
+        elif priority == "medium" and data["priority"] == "low":
+            data["priority"] = "medium"
+        if data["category"] == "Outros":
+            data["category"] = analyzer.categorize_error(error)
+    return list(files.values())
+
+
+def test_store_interns_repeated_strings():
+    store = ErrorStore.from_diagnostics(
+        [
+            _diagnostic("/p/a.py", i, "F401", "unused", "unused-import")
+            for i in range(50)
+        ]
+    )
+    assert len(store) == 50
+    assert store.files.values == ["/p/a.py"]
+    assert store.codes.values == ["F401"]
+    assert store.messages.values == ["unused"]
+    assert store.code_rules == ["unused-import"]
+
+
+def test_store_skip_file_evaluated_once_per_file():
+    calls = []
+
+    def skip(filename):
+        calls.append(filename)
+        return filename.startswith("/p/vendor")
+
+    store = ErrorStore.from_diagnostics(
+        [_diagnostic("/p/vendor/x.py", i, "E501") for i in range(5)]
+        + [_diagnostic("/p/a.py", i, "E501") for i in range(5)],
+        skip,
+    )
+    assert calls == ["/p/vendor/x.py", "/p/a.py"]
+    assert store.files.values == ["/p/a.py"]
+
+
+def test_process_errors_matches_per_diagnostic_grouping(tmp_path):
+    rng = random.Random(7)
+    codes = ["F401", "F821", "E501", "E902", "W291", "C901", "N802", "X1", ""]
+    files = [f"/p/mod{i}.py" for i in range(12)] + ["/p/tests/t.py"]
+    raw = [
+        _diagnostic(rng.choice(files), rng.randint(1, 500), rng.choice(codes))
+        for _ in range(2000)
+    ]
+    analyzer = ErrorsAnalyzer(str(tmp_path))
+    assert analyzer.process_errors(raw) == _reference_process(analyzer, raw)
@@ -1,10 +1,17 @@
 """Testes para ErrorsAnalyzer."""
 
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from codehealthanalyzer.analyzers.errors import ErrorsAnalyzer
+from codehealthanalyzer.config import DEFAULT_EXCLUDE_DIRS
 from codehealthanalyzer.exceptions import AnalyzerExecutionError
 
 # ---------------------------------------------------------------------------
@@ -16,14 +23,30 @@ def _make_analyzer(tmp_path, config=None):
     return ErrorsAnalyzer(str(tmp_path), config=config)
 
 
+def _json_lines(stdout):
+    """Converte um array JSON de diagnósticos em saída ``json-lines``."""
+    return "".join(json.dumps(item) + "\n" for item in json.loads(stdout))
+
+
+def _fake_popen(stdout="", returncode=1, stderr=""):
+    """Fábrica para ``subprocess.Popen`` que simula um processo do ruff."""
+
+    def factory(cmd, **kwargs):
+        if stderr:
+            kwargs["stderr"].write(stderr.encode("utf-8"))
+        process = MagicMock()
+        process.stdout = io.StringIO(stdout)
+        process.wait.return_value = returncode
+        process.__enter__.return_value = process
+        return process
+
+    return factory
+
+
 def _run_with_stdout(analyzer, stdout, returncode=1):
     """Executa analyze() mockando subprocess para retornar stdout fornecido."""
-    result = MagicMock()
-    result.returncode = returncode
-    result.stdout = stdout
-    result.stderr = ""
     with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
-        "subprocess.run", return_value=result
+        "subprocess.Popen", side_effect=_fake_popen(_json_lines(stdout), returncode)
     ):
         return analyzer.analyze()
 
@@ -41,31 +64,322 @@ def test_run_ruff_check_raises_when_ruff_missing(minimal_project):
 
 
 def test_run_ruff_check_raises_on_bad_returncode(minimal_project):
-    result = MagicMock(returncode=2, stdout="", stderr="internal error")
     with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
-        "subprocess.run", return_value=result
+        "subprocess.Popen",
+        side_effect=_fake_popen(returncode=2, stderr="internal error"),
     ):
-        with pytest.raises(AnalyzerExecutionError):
+        with pytest.raises(AnalyzerExecutionError, match="internal error"):
             _make_analyzer(minimal_project).run_ruff_check()
 
 
+def test_run_ruff_check_projects_diagnostics_to_compact_form(minimal_project):
+    line = json.dumps(
+        {
+            "cell": None,
+            "code": "F401",
+            "end_location": {"column": 10, "row": 1},
+            "filename": "/proj/foo.py",
+            "fix": {"applicability": "safe", "edits": [], "message": "Remove"},
+            "location": {"column": 8, "row": 1},
+            "message": "`os` imported but unused",
+            "name": "unused-import",
+            "noqa_row": 1,
+            "url": "https://docs.astral.sh/ruff/rules/unused-import",
+        }
+    )
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen", side_effect=_fake_popen(stdout=line + "\n")
+    ) as popen:
+        errors = _make_analyzer(minimal_project).run_ruff_check()
+    assert "json-lines" in popen.call_args[0][0]
+    assert errors == [
+        {
+            "filename": "/proj/foo.py",
+            "location": {"row": 1, "column": 8},
+            "code": "F401",
+            "message": "`os` imported but unused",
+            "rule": "unused-import",
+            "fixable": True,
+        }
+    ]
+
+
 def test_run_ruff_check_raises_on_invalid_json(minimal_project):
-    result = MagicMock(returncode=1, stdout="not json", stderr="")
     with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
-        "subprocess.run", return_value=result
+        "subprocess.Popen", side_effect=_fake_popen(stdout="not json", returncode=1)
     ):
         with pytest.raises(AnalyzerExecutionError, match="JSON"):
             _make_analyzer(minimal_project).run_ruff_check()
 
 
 def test_run_ruff_check_returns_empty_on_no_stdout(minimal_project):
-    result = MagicMock(returncode=0, stdout="", stderr="")
     with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
-        "subprocess.run", return_value=result
+        "subprocess.Popen", side_effect=_fake_popen(returncode=0)
     ):
         assert _make_analyzer(minimal_project).run_ruff_check() == []
 
 
+def test_run_ruff_check_pushes_excludes_to_ruff(minimal_project):
+    analyzer = _make_analyzer(minimal_project, {"exclude_dirs": ["legacy", "tests"]})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen", side_effect=_fake_popen(returncode=0)
+    ) as run:
+        analyzer.run_ruff_check()
+    cmd = run.call_args[0][0]
+    excluded = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "--extend-exclude"]
+    assert "tests" in excluded
+    assert "scripts" in excluded
+    assert "legacy" in excluded
+    assert excluded.count("tests") == 1
+    assert "--force-exclude" in cmd
+
+
+def test_run_ruff_check_no_default_excludes_only_user_patterns(minimal_project):
+    analyzer = _make_analyzer(
+        minimal_project, {"no_default_excludes": True, "exclude_dirs": ["vendor"]}
+    )
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen", side_effect=_fake_popen(returncode=0)
+    ) as run:
+        analyzer.run_ruff_check()
+    cmd = run.call_args[0][0]
+    excluded = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "--extend-exclude"]
+    assert excluded == ["vendor"]
+
+
+_FIX_OUTPUT = """
+Fixed 3 errors:
+- app.py:
+    2 × F401 (unused-import)
+- pkg/mod.py:
+    1 × F401 (unused-import)
+
+Found 3 errors (3 fixed, 0 remaining).
+"""
+
+
+def test_ruff_fix_applies_fixes_then_streams_remaining(minimal_project):
+    remaining = json.dumps(
+        [
+            {
+                "filename": str(minimal_project / "app.py"),
+                "location": {"row": 3, "column": 7},
+                "code": "F821",
+                "name": "undefined-name",
+                "message": "Undefined name `x`",
+            },
+            {
+                "filename": str(minimal_project / "pkg" / "bad.py"),
+                "location": {"row": 1, "column": 7},
+                "code": None,
+                "message": "Expected a parameter",
+            },
+        ]
+    )
+    result = MagicMock(returncode=0, stdout=_FIX_OUTPUT, stderr="")
+    analyzer = _make_analyzer(minimal_project, {"ruff_fix": True})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.run", return_value=result
+    ) as run, patch(
+        "subprocess.Popen", side_effect=_fake_popen(_json_lines(remaining))
+    ) as popen:
+        report = analyzer.analyze()
+    assert "--fix-only" in run.call_args[0][0]
+    assert "json-lines" in popen.call_args[0][0]
+    assert report["metadata"]["total_errors"] == 2
+    assert report["metadata"]["fixed_errors"] == 3
+    assert report["metadata"]["fixed_by_code"] == {"F401": 3}
+    details = {e["code"]: e for f in report["errors"] for e in f["errors"]}
+    assert set(details) == {"F821", "invalid-syntax"}
+    assert details["F821"]["rule"] == "undefined-name"
+    assert (details["F821"]["line"], details["F821"]["column"]) == (3, 7)
+
+
+def test_ruff_fix_report_matches_normal_report_of_fixed_tree(tmp_path):
+    import asyncio
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "app.py").write_text("import os\nprint(x)\n", encoding="utf-8")
+    (tmp_path / "bad.py").write_text("import sys\ndef f(:\n", encoding="utf-8")
+    fixed = _make_analyzer(tmp_path, {"ruff_fix": True}).analyze()
+    normal = _make_analyzer(tmp_path).analyze()
+    assert fixed["errors"] == normal["errors"]
+    assert fixed["statistics"] == normal["statistics"]
+    assert fixed["metadata"]["fixed_by_code"] == {"F401": 1}
+
+    (tmp_path / "app.py").write_text("import os\nprint(x)\n", encoding="utf-8")
+    analyzer = _make_analyzer(tmp_path, {"ruff_fix": True})
+    fixed_async = asyncio.run(analyzer.analyze_async())
+    assert fixed_async["errors"] == normal["errors"]
+    assert fixed_async["metadata"]["fixed_by_code"] == {"F401": 1}
+
+
+def test_ruff_fix_real_run_counts_fixes(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "app.py").write_text("import os\nprint(x)\n", encoding="utf-8")
+    report = _make_analyzer(tmp_path, {"ruff_fix": True}).analyze()
+    assert report["metadata"]["fixed_by_code"] == {"F401": 1}
+    assert report["metadata"]["total_errors"] == 1
+    assert (tmp_path / "app.py").read_text(encoding="utf-8") == "print(x)\n"
+
+
+def test_ruff_small_tree_runs_single_process(minimal_project):
+    analyzer = _make_analyzer(minimal_project, {"ruff_jobs": 4})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen", side_effect=_fake_popen(returncode=0)
+    ) as run:
+        analyzer.run_ruff_check()
+    assert run.call_count == 1
+    assert run.call_args[0][0][2] == "."
+
+
+def test_ruff_shards_large_file_list(tmp_path):
+    files = []
+    for i in range(10):
+        path = tmp_path / "pkg" / f"m{i}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("x = 1\n", encoding="utf-8")
+        files.append(path)
+
+    def fake_popen(cmd, **kwargs):
+        targets = cmd[2 : cmd.index("--output-format")]
+        out = [{"filename": str(tmp_path / t), "code": "F401"} for t in targets]
+        return _fake_popen(_json_lines(json.dumps(out)))(cmd, **kwargs)
+
+    analyzer = _make_analyzer(tmp_path, {"ruff_jobs": 3, "ruff_shard_min_files": 5})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen", side_effect=fake_popen
+    ) as run:
+        report = analyzer.analyze(files=files)
+    assert run.call_count == 3
+    assert report["metadata"]["ruff_processes"] == 3
+    assert all("RAYON_NUM_THREADS" in c.kwargs["env"] for c in run.call_args_list)
+    assert sorted(f["file"] for f in report["errors"]) == sorted(map(str, files))
+
+
+def test_ruff_explicit_empty_file_list_skips_ruff(minimal_project):
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.Popen"
+    ) as popen:
+        assert _make_analyzer(minimal_project).run_ruff_check([]) == []
+    popen.assert_not_called()
+
+
+def test_ruff_sharded_matches_single_process(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    for i in range(6):
+        (tmp_path / f"m{i}.py").write_text(f"import os\ny{i} = x\n", encoding="utf-8")
+    files = _make_analyzer(tmp_path).discover_files()
+    single = _make_analyzer(tmp_path, {"ruff_jobs": 1}).run_ruff_check(files)
+    sharded_analyzer = _make_analyzer(
+        tmp_path, {"ruff_jobs": 3, "ruff_shard_min_files": 2}
+    )
+    sharded = sharded_analyzer.run_ruff_check(files)
+    assert sharded_analyzer.ruff_processes == 3
+
+    def key(e):
+        return (e["filename"], e["location"]["row"], e["code"])
+
+    assert sorted(map(key, sharded)) == sorted(map(key, single))
+    assert len(single) >= 12
+
+
+def test_ruff_small_tree_skips_full_listing(minimal_project):
+    analyzer = _make_analyzer(minimal_project, {"ruff_jobs": 4})
+    with patch.object(analyzer, "discover_files") as discover, patch.object(
+        analyzer, "_ruff_files"
+    ) as listing:
+        assert analyzer._plan_batches(None) == [["."]]
+    discover.assert_not_called()
+    listing.assert_not_called()
+
+
+def test_ruff_sharded_directory_honours_extend_include(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "ruff.toml").write_text('extend-include = ["*.pyw"]\n', "utf-8")
+    for i in range(5):
+        (tmp_path / f"m{i}.py").write_text(f"import os\ny{i} = x\n", encoding="utf-8")
+    (tmp_path / "gui.pyw").write_text("import sys\n", encoding="utf-8")
+    single = _make_analyzer(tmp_path, {"ruff_jobs": 1}).run_ruff_check()
+    sharded_analyzer = _make_analyzer(
+        tmp_path, {"ruff_jobs": 3, "ruff_shard_min_files": 2}
+    )
+    sharded = sharded_analyzer.run_ruff_check()
+    assert sharded_analyzer.ruff_processes == 3
+
+    def key(e):
+        return (Path(e["filename"]).name, e["location"]["row"], e["code"])
+
+    assert sorted(map(key, sharded)) == sorted(map(key, single))
+    assert ("gui.pyw", 1, "F401") in set(map(key, sharded))
+
+
+def test_ruff_cache_reuses_unchanged_files(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "a.py").write_text("import os\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("import sys\n", encoding="utf-8")
+    config = {"ruff_cache": True}
+
+    first = _make_analyzer(tmp_path, config).analyze()
+    assert first["metadata"]["ruff_cache_hits"] == 0
+    assert (tmp_path / ".cha_cache" / "ruff.json").exists()
+
+    second_analyzer = _make_analyzer(tmp_path, config)
+    second = second_analyzer.analyze()
+    assert second["metadata"]["ruff_cache_hits"] == 2
+    assert second_analyzer.ruff_processes == 0
+    assert second["errors"] == first["errors"]
+
+    (tmp_path / "b.py").write_text("import sys\nprint(undefined)\n", encoding="utf-8")
+    third_analyzer = _make_analyzer(tmp_path, config)
+    third = third_analyzer.analyze()
+    assert third["metadata"]["ruff_cache_hits"] == 1
+    assert third["metadata"]["total_errors"] > first["metadata"]["total_errors"]
+
+
+def test_ruff_cache_invalidated_by_ruff_config(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "a.py").write_text("import os\n", encoding="utf-8")
+    config = {"ruff_cache": True}
+    _make_analyzer(tmp_path, config).analyze()
+
+    (tmp_path / "ruff.toml").write_text('[lint]\nignore = ["F401"]\n', "utf-8")
+    report = _make_analyzer(tmp_path, config).analyze()
+    assert report["metadata"]["ruff_cache_hits"] == 0
+    assert report["metadata"]["total_errors"] == 0
+
+
+def test_ruff_skips_excluded_dirs(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "t.py").write_text("import os\n", encoding="utf-8")
+    (tmp_path / "app.py").write_text("import sys\n", encoding="utf-8")
+    raw = _make_analyzer(tmp_path).run_ruff_check()
+    assert {e["filename"].replace("\\", "/").rsplit("/", 1)[-1] for e in raw} == {
+        "app.py"
+    }
+
+
 # ---------------------------------------------------------------------------
 # categorize_error
 # ---------------------------------------------------------------------------
@@ -150,9 +464,8 @@ def test_analyze_medium_priority_file_detected(minimal_project, ruff_json_output
 
 
 def test_analyze_empty_project_returns_empty(minimal_project):
-    result = MagicMock(returncode=0, stdout="[]", stderr="")
     with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
-        "subprocess.run", return_value=result
+        "subprocess.Popen", side_effect=_fake_popen(returncode=0)
     ):
         report = _make_analyzer(minimal_project).analyze()
     assert report["errors"] == []
@@ -171,3 +484,302 @@ def test_analyze_statistics_reflect_priorities(minimal_project, ruff_json_output
     stats = report["statistics"]
     assert stats["high_priority"] >= 1
     assert stats["medium_priority"] >= 1
+
+
+def test_process_errors_soak_keeps_exclusions_flat(tmp_path):
+    """Chamadas repetidas não podem acumular padrões nem ficar mais lentas."""
+    analyzer = _make_analyzer(tmp_path, {"exclude_dirs": ["vendor", "*_pb2.py"]})
+    raw = [
+        {"filename": str(tmp_path / name), "code": "F401", "message": "x"}
+        for name in ("app.py", "vendor/lib.py", "api/svc_pb2.py", "tests/t.py")
+    ]
+    defaults_before = tuple(DEFAULT_EXCLUDE_DIRS)
+    patterns_before = analyzer.exclusions.patterns
+
+    timings = []
+    for _ in range(3000):
+        start = time.perf_counter()
+        processed = analyzer.process_errors(raw)
+        timings.append(time.perf_counter() - start)
+        assert [item["file"] for item in processed] == [str(tmp_path / "app.py")]
+
+    assert tuple(DEFAULT_EXCLUDE_DIRS) == defaults_before
+    assert analyzer.exclusions.patterns == patterns_before
+    assert analyzer._ruff_exclude_args().count("--extend-exclude") == len(
+        patterns_before
+    )
+    early = statistics.median(timings[:300])
+    late = statistics.median(timings[-300:])
+    assert late < early * 3
+
+
+# ---------------------------------------------------------------------------
+# count_errors
+# ---------------------------------------------------------------------------
+
+
+def test_count_errors_uses_ruff_statistics(minimal_project):
+    stats = json.dumps(
+        [
+            {"code": None, "name": "invalid-syntax", "count": 2, "fixable_count": 0},
+            {"code": "F401", "name": "unused-import", "count": 3, "fixable_count": 3},
+        ]
+    )
+    result = MagicMock(returncode=1, stdout=stats, stderr="")
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.run", return_value=result
+    ) as run, patch("subprocess.Popen") as popen:
+        report = _make_analyzer(minimal_project, {"ruff_jobs": 1}).count_errors()
+    # Configuração padrão: um único processo Ruff, com as exclusões em globs
+    assert run.call_count == 1
+    popen.assert_not_called()
+    cmd = run.call_args[0][0]
+    assert "--statistics" in cmd
+    excluded = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "--extend-exclude"]
+    assert "*build*" in excluded and "*tests*" in excluded
+    assert report["metadata"]["ruff_processes"] == 1
+    assert report["counts"] == {"F401": 3, "invalid-syntax": 2}
+    assert report["metadata"]["total_errors"] == 5
+    assert report["metadata"]["fixable_errors"] == 3
+    assert report["metadata"]["counts_only"] is True
+
+
+def test_count_errors_matches_full_analysis(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "a.py").write_text("import os\nprint(x)\n", "utf-8")
+    (tmp_path / "b.py").write_text("def f(:\n", "utf-8")
+    analyzer = _make_analyzer(tmp_path)
+    counts = analyzer.count_errors()
+    full = analyzer.analyze()
+    assert counts["metadata"]["total_errors"] == full["metadata"]["total_errors"]
+    assert counts["counts"]["invalid-syntax"] == 2
+    fixable = counts["metadata"]["fixable_errors"]
+
+    # "build" exclui por substring, o que --extend-exclude não reproduz
+    (tmp_path / "build_utils.py").write_text("import sys\n", "utf-8")
+    counts = analyzer.count_errors()
+    full = analyzer.analyze()
+    assert counts["metadata"]["total_errors"] == full["metadata"]["total_errors"]
+    assert counts["counts"]["F401"] == 1
+    assert counts["metadata"]["fixable_errors"] == fixable
+
+
+def test_count_errors_streams_when_exclusion_has_no_ruff_glob(minimal_project):
+    analyzer = _make_analyzer(minimal_project, {"exclude_dirs": ["pkg/legacy"]})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "subprocess.run"
+    ) as run, patch("subprocess.Popen", side_effect=_fake_popen(returncode=0)) as popen:
+        report = analyzer.count_errors()
+    run.assert_not_called()
+    assert popen.call_count == 1
+    assert "json-lines" in popen.call_args[0][0]
+    assert report["metadata"]["total_errors"] == 0
+
+
+def test_count_errors_without_ruff_returns_zero(minimal_project):
+    with patch("shutil.which", return_value=None):
+        report = _make_analyzer(minimal_project).count_errors()
+    assert report["metadata"]["total_errors"] == 0
+    assert report["counts"] == {}
+
+
+# ---------------------------------------------------------------------------
+# analyze_async
+# ---------------------------------------------------------------------------
+
+
+def _sleeping_ruff(tmp_path):
+    """Cria um executável falso de ruff que grava o PID e dorme."""
+    script = tmp_path / "fake-ruff"
+    script.write_text(
+        f"#!/bin/sh\necho $$ > {tmp_path / 'ruff.pid'}\nexec sleep 30\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    return script
+
+
+def _assert_process_gone(pid_file):
+    import os
+
+    pid = int(pid_file.read_text(encoding="utf-8"))
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_analyze_async_plans_shards_off_the_event_loop(tmp_path):
+    import asyncio
+
+    files = [tmp_path / f"m{i}.py" for i in range(4)]
+    analyzer = _make_analyzer(tmp_path, {"ruff_jobs": 2, "ruff_shard_min_files": 2})
+
+    def slow_listing(*args, **kwargs):
+        time.sleep(0.5)  # árvore grande
+        return files
+
+    async def scenario():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await analyzer.analyze_async()
+        done.set()
+        await task
+        return ticks
+
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch.object(
+        analyzer, "_has_at_least", return_value=True
+    ), patch.object(analyzer, "_ruff_files", side_effect=slow_listing), patch.object(
+        analyzer, "_invoke_ruff_async", return_value=([], {})
+    ):
+        ticks = asyncio.run(scenario())
+    assert analyzer.ruff_processes == 2
+    assert ticks >= 10
+
+
+def test_analyze_async_matches_sync(tmp_path):
+    import asyncio
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "app.py").write_text("import os\nprint(x)\n", encoding="utf-8")
+    analyzer = _make_analyzer(tmp_path)
+    sync_report = analyzer.analyze()
+    async_report = asyncio.run(analyzer.analyze_async())
+    assert async_report["errors"] == sync_report["errors"]
+    assert async_report["metadata"]["total_errors"] >= 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requer /bin/sh")
+def test_run_ruff_check_async_timeout_kills_ruff(tmp_path):
+    import asyncio
+
+    script = _sleeping_ruff(tmp_path)
+    analyzer = _make_analyzer(tmp_path, {"ruff_jobs": 1, "ruff_timeout": 0.5})
+    start = time.monotonic()
+    with patch("shutil.which", return_value=str(script)):
+        with pytest.raises(AnalyzerExecutionError, match="tempo limite"):
+            asyncio.run(analyzer.run_ruff_check_async())
+    assert time.monotonic() - start < 10
+    _assert_process_gone(tmp_path / "ruff.pid")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requer /bin/sh")
+def test_deadline_kills_ruff_and_reports_skipped_files(tmp_path):
+    from codehealthanalyzer.analyzers.base import Deadline
+
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    script = _sleeping_ruff(tmp_path)
+    analyzer = _make_analyzer(tmp_path, {"ruff_jobs": 1})
+    analyzer.deadline = Deadline(0.5)
+    start = time.monotonic()
+    with patch("shutil.which", return_value=str(script)):
+        report = analyzer.analyze()
+    assert time.monotonic() - start < 10
+    _assert_process_gone(tmp_path / "ruff.pid")
+    assert report["metadata"]["completeness"] == 0
+    assert report["metadata"]["skipped_files"] == ["app.py"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requer /bin/sh")
+def test_run_ruff_check_async_cancel_kills_ruff(tmp_path):
+    import asyncio
+
+    script = _sleeping_ruff(tmp_path)
+    analyzer = _make_analyzer(tmp_path, {"ruff_jobs": 1})
+
+    async def scenario():
+        task = asyncio.ensure_future(analyzer.run_ruff_check_async())
+        while not (tmp_path / "ruff.pid").exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch("shutil.which", return_value=str(script)):
+        asyncio.run(scenario())
+    _assert_process_gone(tmp_path / "ruff.pid")
+
+
+# ---------------------------------------------------------------------------
+# ruff_backend = "server"
+# ---------------------------------------------------------------------------
+
+
+def _key(error):
+    return (
+        error["filename"],
+        error["location"]["row"],
+        error["location"]["column"],
+        error["code"],
+    )
+
+
+def test_server_backend_matches_cli_and_relints_changes(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "a.py").write_text("import os\nx = 'é'; print(y)\n", "utf-8")
+    (tmp_path / "b.py").write_text("def f(:\n", "utf-8")
+    cli = _make_analyzer(tmp_path).run_ruff_check()
+
+    with _make_analyzer(tmp_path, {"ruff_backend": "server"}) as analyzer:
+        served = analyzer.run_ruff_check()
+        assert analyzer.backend_used == "server"
+        assert sorted(map(_key, served)) == sorted(map(_key, cli))
+        server_process = analyzer._server.process
+
+        (tmp_path / "b.py").write_text("import sys\n", "utf-8")
+        report = analyzer.analyze()
+        assert report["metadata"]["ruff_backend"] == "server"
+        assert analyzer._server.process is server_process
+        codes = {e["code"] for f in report["errors"] for e in f["errors"]}
+        assert "invalid-syntax" not in codes
+        assert "F401" in codes
+    assert server_process.poll() is not None
+
+
+def test_server_backend_sorts_and_restarts_on_nested_config(tmp_path):
+    import shutil
+
+    if not shutil.which("ruff"):
+        pytest.skip("Ruff não instalado")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "z.py").write_text("import os\n", "utf-8")
+    (tmp_path / "sub" / "a.py").write_text("import os\nimport sys\n", "utf-8")
+
+    with _make_analyzer(tmp_path, {"ruff_backend": "server"}) as analyzer:
+        served = analyzer.run_ruff_check()
+        assert list(map(_key, served)) == sorted(map(_key, served))
+        server_process = analyzer._server.process
+
+        (tmp_path / "sub" / "ruff.toml").write_text(
+            "[lint]\nignore = ['F401']\n", "utf-8"
+        )
+        served = analyzer.run_ruff_check()
+        assert analyzer._server.process is not server_process
+        assert {Path(e["filename"]).name for e in served} == {"z.py"}
+
+
+def test_server_backend_falls_back_to_cli(minimal_project):
+    analyzer = _make_analyzer(minimal_project, {"ruff_backend": "server"})
+    with patch("shutil.which", return_value="/usr/bin/ruff"), patch(
+        "codehealthanalyzer.analyzers.errors.RuffServerBackend.start",
+        side_effect=AnalyzerExecutionError("sem servidor"),
+    ), patch("subprocess.Popen", side_effect=_fake_popen(returncode=0)) as popen:
+        report = analyzer.analyze()
+    assert report["metadata"]["ruff_backend"] == "cli"
+    assert popen.call_args[0][0][1] == "check"
+    assert analyzer._server is None
@@ -0,0 +1,142 @@
+"""Testes do registro de analisadores e da execução seletiva."""
+
+import ast
+from types import SimpleNamespace
+
+import pytest
+
+from codehealthanalyzer import CodeAnalyzer
+from codehealthanalyzer.analyzers import registry
+from codehealthanalyzer.analyzers.base import BaseAnalyzer
+from codehealthanalyzer.analyzers.registry import (
+    available_analyzers,
+    register_analyzer,
+    select_analyzers,
+    unregister_analyzer,
+)
+from codehealthanalyzer.exceptions import ConfigurationError
+
+
+class LineCounter(BaseAnalyzer):
+    """Analisador de terceiros que reutiliza as ASTs da execução."""
+
+    def analyze(self):
+        files = sorted(self.project_path.rglob("*.py"))
+        nodes = sum(
+            sum(1 for _ in ast.walk(self.python_artifact(path).tree)) for path in files
+        )
+        return {
+            "files": len(files),
+            "nodes": nodes,
+            "shared": self.artifacts is not None,
+        }
+
+
+@pytest.fixture
+def plugin():
+    register_analyzer("lines", LineCounter)
+    yield "lines"
+    unregister_analyzer("lines")
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "mod.py").write_text("def f():\n    return 1\n")
+    return tmp_path
+
+
+def _no_ruff(analyzer, mocker):
+    if analyzer.errors_analyzer is not None:
+        mocker.patch.object(
+            analyzer.errors_analyzer,
+            "analyze",
+            return_value={"metadata": {"total_errors": 0}, "errors": []},
+        )
+
+
+def test_select_defaults_to_all_in_execution_order():
+    assert select_analyzers()[:3] == ["errors", "violations", "templates"]
+
+
+def test_select_only_and_skip_accept_comma_separated_names():
+    assert select_analyzers(only=["violations,errors"]) == ["errors", "violations"]
+    assert select_analyzers(skip=["Templates"])[:2] == ["errors", "violations"]
+    assert select_analyzers(only=["errors", "templates"], skip=["errors"]) == [
+        "templates"
+    ]
+
+
+def test_select_rejects_unknown_and_empty_selection():
+    with pytest.raises(ConfigurationError, match="desconhecido"):
+        select_analyzers(only=["nope"])
+    with pytest.raises(ConfigurationError):
+        select_analyzers(only=["errors"], skip=["errors"])
+
+
+def test_builtin_names_are_reserved():
+    with pytest.raises(ConfigurationError):
+        register_analyzer("errors", LineCounter)
+
+
+def test_skipped_analyzers_are_not_built(project, mocker):
+    mocker.patch.dict(
+        registry.BUILTIN_ANALYZERS,
+        {"templates": mocker.Mock(side_effect=AssertionError("built"))},
+    )
+    analyzer = CodeAnalyzer(str(project), skip=["templates", "errors"])
+    assert list(analyzer.analyzers) == ["violations"]
+    assert analyzer.templates_analyzer is None
+
+    report = analyzer.generate_full_report()
+    assert report["metadata"]["analyzers"] == ["violations"]
+    assert report["templates"]["templates"] == []
+    assert report["errors"]["metadata"]["total_errors"] == 0
+    assert set(report["metadata"]["timings"]) == {"violations", "total"}
+    with pytest.raises(ConfigurationError):
+        analyzer.analyze_templates()
+    assert 0 <= analyzer.get_quality_score() <= 100
+
+
+def test_third_party_analyzer_shares_run_pipeline(project, plugin, mocker):
+    analyzer = CodeAnalyzer(str(project))
+    _no_ruff(analyzer, mocker)
+    parse = mocker.spy(ast, "parse")
+
+    report = analyzer.generate_full_report()
+
+    assert report["extensions"]["lines"]["files"] == 1
+    assert report["extensions"]["lines"]["shared"] is True
+    assert "lines" in report["metadata"]["timings"]
+    # Violações e o plugin usam a mesma AST do módulo
+    assert parse.call_count == 1
+    assert analyzer.analyzers["lines"].artifacts is None
+
+
+def test_plugins_without_inventory_are_not_memoized(project, plugin, mocker):
+    analyzer = CodeAnalyzer(str(project), analyzers=["lines"])
+    run = mocker.spy(analyzer.analyzers["lines"], "analyze")
+    analyzer.analyze("lines")
+    analyzer.analyze("lines")
+    assert run.call_count == 2
+
+
+def test_entry_point_analyzers_are_discovered(mocker):
+    good = SimpleNamespace(name="ext", value="pkg:Ext", load=lambda: LineCounter)
+    broken = SimpleNamespace(
+        name="broken", value="pkg:Broken", load=mocker.Mock(side_effect=ImportError)
+    )
+    reserved = SimpleNamespace(
+        name="errors", value="pkg:Errors", load=lambda: LineCounter
+    )
+    found = mocker.Mock()
+    found.select.return_value = [good, broken, reserved]
+    mocker.patch("importlib.metadata.entry_points", return_value=found)
+    registry._entry_point_analyzers.cache_clear()
+    try:
+        available = available_analyzers()
+    finally:
+        registry._entry_point_analyzers.cache_clear()
+    assert available["ext"] is LineCounter
+    assert "broken" not in available
+    assert available["errors"] is registry.ErrorsAnalyzer
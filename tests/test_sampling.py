@@ -0,0 +1,114 @@
+"""Testes da estimativa do score por amostragem estratificada."""
+
+import pytest
+
+from codehealthanalyzer import CodeAnalyzer
+from codehealthanalyzer.exceptions import ConfigurationError
+from codehealthanalyzer.sampling import (
+    _stratified_total,
+    draw_sample,
+    size_bucket,
+    stratify,
+)
+
+
+def _long_function(name, lines=60):
+    body = "".join(f"    x{i} = {i}\n" for i in range(lines))
+    return f"def {name}():\n{body}"
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    """Dois pacotes: metade dos módulos de ``big`` com função longa."""
+    for package, count in (("big", 20), ("small", 10)):
+        directory = tmp_path / package
+        directory.mkdir()
+        for index in range(count):
+            source = "x = 1\n"
+            if package == "big" and index % 2 == 0:
+                source = _long_function(f"f{index}")
+            (directory / f"m{index}.py").write_text(source, encoding="utf-8")
+    return tmp_path
+
+
+def test_size_bucket_boundaries():
+    assert size_bucket(0) == 0
+    assert size_bucket(4 * 1024 - 1) == 0
+    assert size_bucket(4 * 1024) == 1
+    assert size_bucket(10**9) == 3
+
+
+def test_stratify_by_directory_and_size(tmp_path):
+    (tmp_path / "a").mkdir()
+    small = tmp_path / "a" / "small.py"
+    large = tmp_path / "a" / "large.py"
+    root = tmp_path / "root.py"
+    small.write_text("x = 1\n")
+    large.write_text("x = 1\n" * 2000)
+    root.write_text("x = 1\n")
+
+    strata = stratify([small, large, root], tmp_path)
+
+    assert strata == {("a", 0): [small], ("a", 1): [large], (".", 0): [root]}
+
+
+def test_draw_sample_is_reproducible_and_order_independent(tmp_path):
+    files = [tmp_path / f"m{i}.py" for i in range(50)]
+    strata = {("a", 0): files[:40], ("b", 0): files[40:]}
+    reversed_strata = {key: list(reversed(paths)) for key, paths in strata.items()}
+
+    first = draw_sample(strata, 0.1, seed=7)
+    assert first == draw_sample(reversed_strata, 0.1, seed=7)
+    assert first != draw_sample(strata, 0.1, seed=8)
+    assert len(first[("a", 0)]) == 4
+    # Estratos pequenos ainda recebem dois arquivos
+    assert len(first[("b", 0)]) == 2
+
+
+def test_stratified_total_uses_finite_population_correction():
+    total, variance = _stratified_total(
+        {"a": 10, "b": 3}, {"a": [1.0, 0.0], "b": [2.0] * 3}
+    )
+    assert total == 5 + 6
+    # 10² · (1 - 2/10) · s²(=0.5) / 2; o estrato "b" foi recenseado
+    assert variance == pytest.approx(20.0)
+
+
+def test_full_sample_matches_exact_score(monorepo):
+    analyzer = CodeAnalyzer(str(monorepo), analyzers=["violations", "templates"])
+
+    estimate = analyzer.estimate_quality_score(fraction=1, seed=1)
+
+    assert estimate["quality_score"] == analyzer.get_quality_score() == 0
+    assert estimate["counters"]["violations_high"]["estimate"] == 10
+    assert estimate["counters"]["violations_high"]["standard_error"] == 0
+    assert estimate["sampled_files"] == estimate["population_files"] == 30
+
+
+def test_sampled_estimate_extrapolates_with_interval(monorepo):
+    analyzer = CodeAnalyzer(str(monorepo), analyzers=["violations"])
+
+    estimate = analyzer.estimate_quality_score(fraction=0.3, seed=3)
+
+    assert estimate["sampled_files"] < estimate["population_files"]
+    counter = estimate["counters"]["violations_high"]
+    assert counter["low"] <= counter["estimate"] <= counter["high"]
+    assert counter["standard_error"] > 0
+    # Só "big" tem violações: nunca se extrapola além dos seus 20 módulos
+    assert counter["estimate"] <= 20
+    assert analyzer.estimate_quality_score(fraction=0.3, seed=3) == estimate
+
+
+def test_estimate_reports_generated_seed(monorepo):
+    analyzer = CodeAnalyzer(str(monorepo), {"sample_fraction": 0.5})
+
+    estimate = analyzer.estimate_quality_score()
+
+    assert estimate["fraction"] == 0.5
+    replay = analyzer.estimate_quality_score(seed=estimate["seed"])
+    assert replay["counters"] == estimate["counters"]
+
+
+def test_estimate_rejects_invalid_fraction(monorepo):
+    with pytest.raises(ConfigurationError):
+        CodeAnalyzer(str(monorepo)).estimate_quality_score(fraction=1.5)
@@ -0,0 +1,205 @@
+"""Testes da leitura compartilhada de arquivos (SharedSources)."""
+
+import threading
+
+import pytest
+
+from codehealthanalyzer import CodeAnalyzer
+from codehealthanalyzer.analyzers import sources
+from codehealthanalyzer.analyzers.sources import (
+    ArtifactCache,
+    SharedSources,
+    read_text_source,
+)
+
+
+def test_read_text_source_strips_bom_and_keeps_newlines(tmp_path):
+    f = tmp_path / "a.html"
+    f.write_bytes(b"\xef\xbb\xbf<p>\r\n\r\n  \r<b>\n")
+    source = read_text_source(f)
+    assert source.bom_bytes == 3
+    assert source.text == "<p>\r\n\r\n  \r<b>\n"
+    assert source.nonblank_lines() == 2
+
+
+def test_nonblank_lines_matches_universal_newline_read(tmp_path):
+    f = tmp_path / "a.html"
+    f.write_bytes("\ufeffa\r\nb\rc\n\n\x0cd e\n".encode("utf-8"))
+    with open(f, encoding="utf-8-sig") as fh:
+        expected = sum(1 for line in fh if line.strip())
+    assert read_text_source(f).nonblank_lines() == expected
+
+
+def test_shared_file_is_read_once_and_released(tmp_path, mocker):
+    f = tmp_path / "a.html"
+    f.write_text("<p>x</p>", encoding="utf-8")
+    spy = mocker.spy(sources, "read_text_source")
+    shared = SharedSources([f], consumers=2)
+
+    first = shared.get(f)
+    assert len(shared) == 1
+    assert shared.get(tmp_path / "." / "a.html") is first
+    assert len(shared) == 0
+    assert spy.call_count == 1
+    assert (shared.reads, shared.hits) == (1, 1)
+
+
+def test_unshared_file_is_not_retained(tmp_path):
+    f = tmp_path / "a.html"
+    f.write_text("<p>x</p>", encoding="utf-8")
+    shared = SharedSources([], consumers=2)
+    assert shared.get(f).text == "<p>x</p>"
+    assert len(shared) == 0
+
+
+def test_read_errors_are_shared(tmp_path, mocker):
+    f = tmp_path / "bad.html"
+    f.write_bytes(b"\xff\xfe<p>")
+    spy = mocker.spy(sources, "read_text_source")
+    shared = SharedSources([f])
+    for _ in range(2):
+        with pytest.raises(UnicodeDecodeError):
+            shared.get(f)
+    assert spy.call_count == 1
+
+
+def test_concurrent_consumers_share_one_read(tmp_path, mocker):
+    f = tmp_path / "a.html"
+    f.write_text("<p>x</p>", encoding="utf-8")
+    spy = mocker.spy(sources, "read_text_source")
+    shared = SharedSources([f], consumers=8)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(shared.get(f))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert spy.call_count == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_retained_buffers_stay_within_budget(tmp_path, mocker):
+    files = []
+    for name in "abcd":
+        f = tmp_path / f"{name}.html"
+        f.write_text(name * 100, encoding="utf-8")
+        files.append(f)
+    spy = mocker.spy(sources, "read_text_source")
+    shared = SharedSources(files, consumers=2, max_bytes=250)
+
+    # O primeiro consumidor lê tudo antes do segundo começar
+    first = [shared.get(f).text for f in files]
+    second = [shared.get(f).text for f in files]
+
+    assert first == second == [name * 100 for name in "abcd"]
+    assert shared.peak_bytes <= 250
+    assert shared.evictions == 2
+    assert spy.call_count == 6
+    assert len(shared) == 0 and shared.retained_bytes == 0
+
+
+def test_full_report_reads_each_template_once(tmp_path, mocker):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for name in ("a.html", "b.html"):
+        (templates / name).write_bytes(
+            b"\xef\xbb\xbf<html>\n<style>p{color:red}</style>\n</html>\n"
+        )
+    analyzer = CodeAnalyzer(str(tmp_path), {"templates_dir": ["templates"]})
+    mocker.patch.object(
+        analyzer.errors_analyzer,
+        "analyze",
+        return_value={"metadata": {"total_errors": 0}, "errors": []},
+    )
+    spy = mocker.spy(sources, "read_text_source")
+
+    report = analyzer.generate_full_report()
+
+    assert spy.call_count == 2
+    assert report["summary"]["total_templates"] == 2
+    assert report["violations"]["statistics"]["html_files"] == 2
+
+
+# ---------------------------------------------------------------------------
+# ArtifactCache
+# ---------------------------------------------------------------------------
+
+
+def _module(tmp_path, name, body="x = 1\n"):
+    f = tmp_path / name
+    f.write_text(body, encoding="utf-8")
+    return f
+
+
+def test_artifact_cache_shares_parse_between_analyzers(tmp_path, mocker):
+    from codehealthanalyzer.analyzers.base import BaseAnalyzer
+    from codehealthanalyzer.analyzers.violations import ViolationsAnalyzer
+
+    class TreeReader(BaseAnalyzer):
+        def analyze(self):
+            return {}
+
+    f = _module(tmp_path, "m.py", "\ufeffdef f():\n    return 1\n")
+    cache = ArtifactCache()
+    violations = ViolationsAnalyzer(str(tmp_path), {"no_default_excludes": True})
+    reader = TreeReader(str(tmp_path))
+    violations.artifacts = reader.artifacts = cache
+    parse = mocker.spy(sources.ast, "parse")
+
+    violations.check_file(f)
+    artifact = reader.python_artifact(f)
+
+    assert artifact.source.startswith("def f")
+    assert artifact.tree.body[0].name == "f"
+    assert parse.call_count == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 0)
+
+
+def test_artifact_cache_evicts_least_recently_used(tmp_path):
+    a, b, c = (_module(tmp_path, f"{n}.py", "x = 1\n" * 10) for n in "abc")
+    cache = ArtifactCache(max_bytes=150)  # cabem dois fontes de 60 caracteres
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)  # a passa a ser o mais recente
+    cache.get(c)
+    assert a in cache and c in cache and b not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_artifact_cache_counts_parsed_ast_in_budget(tmp_path):
+    a, b = (_module(tmp_path, f"{n}.py", "x = 1\n" * 10) for n in "ab")
+    cache = ArtifactCache(max_bytes=1000)
+    cache.get(a)
+    cache.get(b).tree
+    assert len(cache) == 2
+    cache.touch(b)  # AST de b: 60 * 33 bytes estimados, acima do orçamento
+    assert b in cache and a not in cache
+    assert cache.stats()["estimated_bytes"] == 60 * 33
+
+
+def test_violations_report_exposes_artifact_stats(tmp_path, mocker):
+    from codehealthanalyzer.analyzers.violations import ViolationsAnalyzer
+
+    _module(tmp_path, "m.py", '"""Doc."""\n\n# c\nx = 1\n')
+    analyzer = ViolationsAnalyzer(str(tmp_path), {"no_default_excludes": True})
+    opened = mocker.spy(sources.PythonArtifact, "read")
+    report = analyzer.analyze()
+
+    stats = report["metadata"]["artifact_cache"]
+    assert (stats["misses"], stats["hits"]) == (1, 0)
+    assert opened.call_count == 1
+    assert analyzer.artifacts is None
+
+
+def test_shared_artifact_cache_is_reused_across_runs(tmp_path):
+    from codehealthanalyzer.analyzers.violations import ViolationsAnalyzer
+
+    _module(tmp_path, "m.py")
+    analyzer = ViolationsAnalyzer(str(tmp_path), {"no_default_excludes": True})
+    analyzer.artifacts = analyzer.new_artifact_cache()
+    analyzer.analyze()
+    stats = analyzer.analyze()["metadata"]["artifact_cache"]
+    assert (stats["misses"], stats["hits"]) == (1, 1)
@@ -1,6 +1,5 @@
 """Testes unitários para TemplatesAnalyzer."""
 
-
 from codehealthanalyzer.analyzers.templates import TemplatesAnalyzer
 
 
@@ -34,6 +33,29 @@ def test_analyze_empty_report_when_no_templates_dir(tmp_path):
     assert report["metadata"]["total_templates"] == 0
 
 
+def test_empty_report_has_full_shape(tmp_path):
+    from codehealthanalyzer.analyzers.registry import empty_report
+
+    _write_html(tmp_path, "<style>p{color:red}</style>")
+    full = _make(tmp_path).analyze()
+    empty = _make(tmp_path, templates_subdir="nonexistent").analyze()
+
+    for report in (empty, empty_report("templates")):
+        assert set(report["statistics"]) == set(full["statistics"])
+        assert set(report) == set(full)
+        assert report["statistics"]["render_blocking_scripts"] == 0
+        assert report["duplicates"] == []
+
+
+def test_analyze_starts_run_once_with_file_count(tmp_path, mocker):
+    _write_html(tmp_path, "<p>a</p>", name="a.html")
+    _write_html(tmp_path, "<p>b</p>", name="b.html")
+    analyzer = _make(tmp_path)
+    start = mocker.spy(analyzer, "start_run")
+    analyzer.analyze()
+    start.assert_called_once_with(2)
+
+
 # ---------------------------------------------------------------------------
 # analyze — detecção de conteúdo inline
 # ---------------------------------------------------------------------------
@@ -154,3 +176,268 @@ def test_analyze_multiple_templates_dirs(tmp_path):
     )
     report = analyzer.analyze()
     assert report["statistics"]["total_templates"] == 2
+
+
+def test_analyze_nested_roots_analyzed_once(tmp_path):
+    _write_html(tmp_path, "<style>a{}</style>", subdir="templates", name="a.html")
+    _write_html(tmp_path, "<style>b{}</style>", subdir="templates/admin", name="b.html")
+    analyzer = TemplatesAnalyzer(
+        str(tmp_path),
+        config={
+            "templates_dir": ["templates/admin", "templates", "templates/"],
+            "no_default_excludes": True,
+        },
+    )
+    report = analyzer.analyze()
+    files = sorted(t["file"] for t in report["templates"])
+    assert files == ["a.html", "admin/b.html"]
+    assert report["metadata"]["templates_paths"] == [
+        str((tmp_path / "templates").resolve())
+    ]
+
+
+def test_effective_roots_keeps_disjoint_roots(tmp_path):
+    (tmp_path / "tpl1").mkdir()
+    (tmp_path / "tpl2").mkdir()
+    analyzer = TemplatesAnalyzer(
+        str(tmp_path), config={"templates_dir": ["tpl2", "missing", "tpl1"]}
+    )
+    assert analyzer.effective_roots() == [
+        (tmp_path / "tpl2").resolve(),
+        (tmp_path / "tpl1").resolve(),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# modo compacto
+# ---------------------------------------------------------------------------
+
+
+def test_compact_mode_omits_content(tmp_path):
+    _write_html(tmp_path, "<html>\n<style>body{color:red;}</style></html>")
+    report = _make(tmp_path, extra_config={"templates_compact": True}).analyze()
+    asset = report["templates"][0]["css_style_tags"][0]
+    assert "content" not in asset
+    assert asset["line"] == 2
+    assert asset["length"] == len("body{color:red;}")
+    assert len(asset["hash"]) == 16
+    assert report["metadata"]["compact"] is True
+
+
+def test_compact_mode_keeps_totals(tmp_path):
+    html = '<html><p style="color:red;">x</p><script>go();</script></html>'
+    _write_html(tmp_path, html)
+    full = _make(tmp_path).analyze()["templates"][0]
+    compact = _make(tmp_path, extra_config={"templates_compact": True}).analyze()
+    tpl = compact["templates"][0]
+    assert tpl["total_css_chars"] == full["total_css_chars"]
+    assert tpl["total_js_chars"] == full["total_js_chars"]
+
+
+def test_load_snippet_reads_body_from_disk(tmp_path):
+    html = (
+        "<!-- cabeçalho\r\n multi-linha -->\r\n"
+        '<p style="font-family: Açaí">x</p>\r\n'
+        "<script>\r\n  alert('ç');\r\n</script>"
+    )
+    f = tmp_path / "templates" / "tpl.html"
+    f.parent.mkdir()
+    f.write_bytes(html.encode("utf-8"))
+    analyzer = _make(tmp_path, extra_config={"templates_compact": True})
+    tpl = analyzer.analyze()["templates"][0]
+
+    css = tpl["css_inline"][0]
+    script = tpl["js_script_tags"][0]
+    assert css["line"] == 3
+    assert script["line"] == 4
+    assert analyzer.load_snippet(tpl["path"], css) == "font-family: Açaí"
+    assert analyzer.load_snippet(tpl["path"], script) == "alert('ç');"
+
+
+def test_load_snippet_with_comment_inside_body(tmp_path):
+    body = "var a = 1; <!-- antigo --> var b = 2;"
+    _write_html(tmp_path, f"<html><script>{body}</script></html>")
+    analyzer = _make(tmp_path, extra_config={"templates_compact": True})
+    tpl = analyzer.analyze()["templates"][0]
+
+    assert analyzer.load_snippet(tpl["path"], tpl["js_script_tags"][0]) == body
+
+
+def test_bom_template_offsets_match_disk_in_both_scan_modes(tmp_path):
+    f = tmp_path / "templates" / "tpl.html"
+    f.parent.mkdir()
+    f.write_bytes(b"\xef\xbb\xbf<style>a{color:red}</style>\n<p style='x: 1'>a</p>")
+    for threshold in (None, 0):
+        extra = {"templates_compact": True}
+        if threshold is not None:
+            extra["templates_stream_threshold"] = threshold
+        analyzer = _make(tmp_path, extra_config=extra)
+        tpl = analyzer.analyze()["templates"][0]
+        style = tpl["css_style_tags"][0]
+        assert style["offset"] == 3 + len("<style>")
+        assert analyzer.load_snippet(tpl["path"], style) == "a{color:red}"
+        assert analyzer.load_snippet(tpl["path"], tpl["css_inline"][0]) == "x: 1"
+
+
+def test_load_snippet_returns_none_when_file_changed(tmp_path):
+    f = _write_html(tmp_path, "<html><style>a{color:red}</style></html>")
+    analyzer = _make(tmp_path, extra_config={"templates_compact": True})
+    tpl = analyzer.analyze()["templates"][0]
+    f.write_text("<html><style>b{color:blue}</style></html>", encoding="utf-8")
+    assert analyzer.load_snippet(tpl["path"], tpl["css_style_tags"][0]) is None
+
+
+# ---------------------------------------------------------------------------
+# índice de trechos duplicados
+# ---------------------------------------------------------------------------
+
+
+def test_duplicates_grouped_across_files(tmp_path):
+    block = "<style>\n  .btn { color: red; }\n</style>"
+    _write_html(tmp_path, block, name="a.html")
+    _write_html(tmp_path, "<style>.btn {  color: red; }</style>", name="b.html")
+    _write_html(tmp_path, block + block, name="c.html")
+    _write_html(tmp_path, "<style>.other{}</style>", name="d.html")
+    report = _make(tmp_path).analyze()
+
+    assert len(report["duplicates"]) == 1
+    dup = report["duplicates"][0]
+    assert dup["kind"] == "css_style_tags"
+    assert dup["files"] == 3
+    assert dup["occurrences"] == 4
+    assert dup["total_bytes"] == 3 * len(".btn { color: red; }") + len(
+        ".btn {  color: red; }"
+    )
+    assert {loc["path"] for loc in dup["locations"]} == {
+        "templates/a.html",
+        "templates/b.html",
+        "templates/c.html",
+    }
+
+
+def test_duplicates_respect_min_files(tmp_path):
+    _write_html(tmp_path, '<p style="margin:0">a</p>', name="a.html")
+    _write_html(tmp_path, '<p style="margin:0">b</p>', name="b.html")
+    report = _make(
+        tmp_path, extra_config={"templates_duplicate_min_files": 3}
+    ).analyze()
+    assert report["duplicates"] == []
+    assert len(_make(tmp_path).analyze()["duplicates"]) == 1
+
+
+def test_duplicates_ignore_repeats_within_single_file(tmp_path):
+    _write_html(tmp_path, "<script>init();</script>" * 3)
+    report = _make(tmp_path, extra_config={"templates_compact": True}).analyze()
+    assert report["duplicates"] == []
+
+
+# ---------------------------------------------------------------------------
+# peso na rede (gzip) e scripts bloqueantes
+# ---------------------------------------------------------------------------
+
+
+def test_gzip_estimate_smaller_than_raw_bytes(tmp_path):
+    css = ".row { margin: 0 auto; padding: 4px; } " * 200
+    _write_html(tmp_path, f"<style>{css}</style><script>var x = 1;</script>")
+    tpl = _make(tmp_path).analyze()["templates"][0]
+    assert tpl["css_bytes"] == len(css.strip())
+    assert 0 < tpl["css_gzip_bytes"] < tpl["css_bytes"]
+    assert tpl["js_gzip_bytes"] > 0
+    assert tpl["wire_bytes"] == tpl["css_gzip_bytes"] + tpl["js_gzip_bytes"]
+
+
+def test_gzip_estimate_bounded_by_sample_budget(tmp_path):
+    css = ".row { margin: 0 auto; padding: 4px; } " * 2000
+    _write_html(tmp_path, f"<style>{css}</style>")
+    full = _make(tmp_path).analyze()["templates"][0]
+    sampled = _make(
+        tmp_path, extra_config={"templates_gzip_sample_bytes": 4096}
+    ).analyze()["templates"][0]
+    assert sampled["css_bytes"] == full["css_bytes"]
+    # Extrapolação a partir da amostra: mesma ordem de grandeza, nunca zero
+    assert 0 < sampled["css_gzip_bytes"] < full["css_bytes"]
+
+
+def test_render_blocking_scripts_in_head(tmp_path):
+    html = (
+        "<html><head>"
+        "<script>var blocking = 1;</script>"
+        "<script defer>var a = 1;</script>"
+        "<script async>var b = 1;</script>"
+        '<script type="module">import x from "./x.js";</script>'
+        "</head><body><header></header>"
+        "<script>var late = 1;</script>"
+        "</body></html>"
+    )
+    _write_html(tmp_path, html)
+    report = _make(tmp_path).analyze()
+    tpl = report["templates"][0]
+    flags = [s["render_blocking"] for s in tpl["js_script_tags"]]
+    assert flags == [True, False, False, False, False]
+    assert tpl["render_blocking_scripts"] == 1
+    assert tpl["priority"] == "medium"
+    assert report["statistics"]["render_blocking_scripts"] == 1
+
+
+def test_templates_sorted_by_wire_bytes(tmp_path):
+    # Muitos caracteres repetitivos comprimem melhor que poucos aleatórios
+    _write_html(tmp_path, f"<style>{'a{}' * 3000}</style>", name="repetitive.html")
+    noisy = "".join(f".c{i * 7919 % 100003}{{top:{i}px}}" for i in range(400))
+    _write_html(tmp_path, f"<style>{noisy}</style>", name="noisy.html")
+    report = _make(tmp_path).analyze()
+    assert [t["file"] for t in report["templates"]] == [
+        "noisy.html",
+        "repetitive.html",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# modo streaming (templates gigantes)
+# ---------------------------------------------------------------------------
+
+_BIG_HTML = (
+    "<html>\r\n<head><!-- <style>ignored{}</style>\n -->\n"
+    "<style media='all'>\n  body { font-family: 'Açaí'; }\n</style>\n"
+    "<script>\nvar a = '<b>';\nconsole.log(a);\n</script>\n"
+    '<script src="/x.js"></script>\n</head>\n<body>\n'
+    + "".join(
+        f'<p style="color: #{i:03d};" onclick="go({i})">é {i}</p>\n' for i in range(40)
+    )
+    + '<div onmouseover="hover()" style="margin: 0">x</div>\n'
+    "</body></html>\n"
+)
+
+
+def test_streaming_scan_matches_full_scan(tmp_path):
+    _write_html(tmp_path, _BIG_HTML)
+    full = _make(tmp_path, extra_config={"templates_compact": True}).analyze()
+    for chunk_size in (1, 7, 64, 1000):
+        streamed = _make(
+            tmp_path,
+            extra_config={
+                "templates_compact": True,
+                "templates_stream_threshold": 0,
+                "templates_chunk_size": chunk_size,
+            },
+        ).analyze()
+        expected = dict(full["templates"][0])
+        got = dict(streamed["templates"][0])
+        # A estimativa gzip depende da ordem em que os trechos são comprimidos
+        for key in ("css_gzip_bytes", "js_gzip_bytes", "wire_bytes"):
+            assert abs(got.pop(key) - expected.pop(key)) <= 0.1 * expected["js_bytes"]
+        got.pop("recommendations")
+        expected.pop("recommendations")
+        assert got == expected, chunk_size
+
+
+def test_streaming_scan_keeps_content_in_full_mode(tmp_path):
+    _write_html(tmp_path, _BIG_HTML)
+    full = _make(tmp_path).analyze()["templates"][0]
+    streamed = _make(
+        tmp_path,
+        extra_config={"templates_stream_threshold": 0, "templates_chunk_size": 16},
+    ).analyze()["templates"][0]
+    assert streamed["css_style_tags"] == full["css_style_tags"]
+    assert streamed["js_script_tags"][0]["content"] == (
+        "var a = '<b>';\nconsole.log(a);"
+    )
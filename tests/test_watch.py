@@ -0,0 +1,196 @@
+"""Testes da reanálise incremental guiada por mudanças de arquivos."""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+from fastapi.testclient import TestClient
+
+from codehealthanalyzer import CodeAnalyzer
+from codehealthanalyzer.analyzers.errors import ErrorsAnalyzer
+from codehealthanalyzer.analyzers.violations import ViolationsAnalyzer
+from codehealthanalyzer.cli.main import cli
+from codehealthanalyzer.exceptions import AnalyzerExecutionError
+from codehealthanalyzer.watch import InotifyWatcher, PollingWatcher, WatchEngine
+from codehealthanalyzer.web.server import DashboardServer
+
+LONG_FUNCTION = "def f():\n" + "    x = 1\n" * 60
+INLINE = '<div style="color: red">x</div><script>var a = 1;</script>\n'
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "templates").mkdir()
+    (root / "pkg" / "clean.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "pkg" / "long.py").write_text(LONG_FUNCTION, encoding="utf-8")
+    (root / "templates" / "a.html").write_text(INLINE, encoding="utf-8")
+    (root / "templates" / "b.html").write_text(INLINE, encoding="utf-8")
+    return root
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    # Garante mtime diferente mesmo em sistemas de arquivos de baixa resolução
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _duplicates(report):
+    # A ordem das ocorrências segue a listagem do sistema de arquivos
+    return [
+        {**entry, "locations": sorted(entry["locations"], key=lambda loc: loc["path"])}
+        for entry in report["templates"]["duplicates"]
+    ]
+
+
+def _assert_matches_full_analysis(engine, project):
+    report = engine.report()
+    full = CodeAnalyzer(str(project)).generate_full_report()
+    for name in ("violations", "templates", "errors"):
+        assert report[name]["statistics"] == full[name]["statistics"], name
+    assert _duplicates(report) == _duplicates(full)
+    assert report["errors"]["metadata"]["total_errors"] == (
+        full["errors"]["metadata"]["total_errors"]
+    )
+    assert report["quality_score"] == full["quality_score"] == engine.quality_score
+
+
+def test_polling_watcher_detects_modify_add_and_delete(tmp_path):
+    existing = tmp_path / "a.py"
+    added = tmp_path / "b.py"
+    existing.write_text("x = 1\n", encoding="utf-8")
+    watcher = PollingWatcher(lambda: sorted(tmp_path.glob("*.py")) + [added])
+
+    assert watcher.changes() == set()
+    _write(existing, "x = 2\n")
+    added.write_text("y = 1\n", encoding="utf-8")
+    assert watcher.changes() == {existing, added}
+    existing.unlink()
+    assert watcher.changes() == {existing}
+
+
+def test_baseline_matches_full_analysis(project):
+    engine = WatchEngine(CodeAnalyzer(str(project)), use_inotify=False)
+
+    report = engine.start()
+
+    assert engine.backend == "polling"
+    assert report["summary"]["quality_score"] == engine.quality_score
+    assert report["templates"]["duplicates"]
+    _assert_matches_full_analysis(engine, project)
+
+
+def test_incremental_updates_patch_statistics(project):
+    engine = WatchEngine(CodeAnalyzer(str(project)), use_inotify=False)
+    engine.start()
+    previous = engine.quality_score
+
+    _write(project / "pkg" / "long.py", "x = 1\n")
+    (project / "pkg" / "new.py").write_text("import os\n", encoding="utf-8")
+    (project / "templates" / "b.html").unlink()
+    delta = engine.refresh()
+
+    assert delta["version"] == engine.version == 1
+    assert delta["changed"] == ["pkg/long.py", "pkg/new.py"]
+    assert delta["removed"] == ["templates/b.html"]
+    assert delta["previous_score"] == previous
+    assert delta["statistics"]["violations"]["high_priority"] == 0
+    assert set(delta["analyzers"]) == {"violations", "templates", "errors"}
+    _assert_matches_full_analysis(engine, project)
+    assert engine.refresh() is None
+
+
+def test_only_changed_files_are_reanalyzed(project, mocker):
+    engine = WatchEngine(CodeAnalyzer(str(project)), use_inotify=False)
+    engine.start()
+    check = mocker.spy(ViolationsAnalyzer, "check_file")
+    ruff = mocker.spy(ErrorsAnalyzer, "analyze")
+
+    _write(project / "pkg" / "clean.py", "import os\n")
+    engine.refresh()
+
+    assert [call.args[1].name for call in check.call_args_list] == ["clean.py"]
+    assert ruff.call_count == 1
+    assert [path.name for path in ruff.call_args.kwargs["files"]] == ["clean.py"]
+
+
+def test_ruff_config_change_reruns_errors_for_all_files(project, mocker):
+    engine = WatchEngine(CodeAnalyzer(str(project)), use_inotify=False)
+    engine.start()
+    ruff = mocker.spy(ErrorsAnalyzer, "analyze")
+
+    (project / "ruff.toml").write_text("[lint]\nselect = ['E']\n", encoding="utf-8")
+    delta = engine.refresh()
+
+    assert delta["analyzers"] == ["errors"]
+    assert ruff.call_args.kwargs == {}
+    _assert_matches_full_analysis(engine, project)
+
+
+def test_new_template_directory_is_picked_up(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    engine = WatchEngine(
+        CodeAnalyzer(str(tmp_path), analyzers=["templates"]), use_inotify=False
+    )
+    engine.start()
+
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "a.html").write_text(INLINE, encoding="utf-8")
+    delta = engine.refresh()
+
+    assert delta["statistics"]["templates"]["total_templates"] == 1
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="requer inotify")
+def test_inotify_engine_follows_new_directories(project):
+    engine = WatchEngine(CodeAnalyzer(str(project)), interval=0.1, use_inotify=True)
+    engine.start()
+    assert engine.backend == "inotify"
+
+    (project / "pkg" / "sub").mkdir()
+    (project / "pkg" / "sub" / "deep.py").write_text(LONG_FUNCTION, encoding="utf-8")
+    delta = engine.refresh(timeout=2)
+
+    assert "pkg/sub/deep.py" in delta["changed"]
+    (project / "pkg" / "sub" / "deep.py").unlink()
+    engine.refresh(timeout=2)
+    _assert_matches_full_analysis(engine, project)
+    engine.close()
+
+
+def test_refresh_requires_start(project):
+    with pytest.raises(AnalyzerExecutionError):
+        WatchEngine(CodeAnalyzer(str(project))).refresh()
+
+
+def test_cli_watch_prints_baseline_and_deltas(project, mocker):
+    def one_round(engine):
+        _write(project / "pkg" / "long.py", "x = 1\n")
+        delta = engine.refresh()
+        yield delta
+
+    mocker.patch.object(WatchEngine, "watch", one_round)
+
+    result = CliRunner().invoke(cli, ["watch", str(project), "--polling"])
+
+    assert result.exit_code == 0
+    assert "via polling" in result.output
+    assert "pkg/long.py" in result.output
+
+
+def test_dashboard_serves_deltas_between_requests(project):
+    server = DashboardServer(str(project))
+    client = TestClient(server.app)
+
+    first = client.get("/api/metrics").json()
+    _write(project / "pkg" / "long.py", "x = 1\n")
+    second = client.get("/api/metrics").json()
+
+    assert first["delta"] is None
+    assert second["version"] == first["version"] + 1
+    assert second["delta"]["changed"] == ["pkg/long.py"]
+    assert second["high_priority_issues"] == 0
+    assert client.get("/api/violations").json()["statistics"]["high_priority"] == 0